@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark search result page parsing.
+
+Compares a full-page parse (what the scrapers used to do) against the
+strained parse in src/backend/search/result_parser.py on the synthetic
+result pages in tests/fixtures (generated, not live captures), for each
+available tree builder.
+
+Usage:
+    python scripts/bench_result_parsing.py [--rounds 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.backend.search.result_parser import HAS_LXML, parse_duckduckgo, parse_google  # noqa: E402
+
+FIXTURES = {
+    "duckduckgo": ("synthetic_duckduckgo_results.html", parse_duckduckgo),
+    "google": ("synthetic_google_results.html", parse_google),
+}
+
+
+def bench(fn, html, rounds, **kwargs):
+    fn(html, 10, **kwargs)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(html, 10, **kwargs)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    backends = ["html.parser"] + (["lxml"] if HAS_LXML else [])
+    print(f"{'page':<12}{'backend':<13}{'full (ms)':>11}{'strained (ms)':>15}{'speedup':>9}")
+    for name, (filename, fn) in FIXTURES.items():
+        with open(os.path.join(ROOT, "tests", "fixtures", filename), encoding="utf-8") as fh:
+            html = fh.read()
+        for backend in backends:
+            full = bench(fn, html, args.rounds, backend=backend, strain=False)
+            strained = bench(fn, html, args.rounds, backend=backend, strain=True)
+            print(f"{name:<12}{backend:<13}{full:>11.2f}{strained:>15.2f}{full / strained:>8.1f}x")
+    if not HAS_LXML:
+        print("\n(lxml not installed; pip install lxml to benchmark the lxml backend)")
+
+
+if __name__ == "__main__":
+    main()
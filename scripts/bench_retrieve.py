@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark RAGPipeline.retrieve throughput against the offline "local" provider.
+
+The search backend is the local corpus with seeded latency injection, so runs
+are reproducible and need no network access. Query coalescing is disabled so
+that every request does its own work.
+
+Usage:
+    python scripts/bench_retrieve.py [--corpus tests/fixtures/local_corpus.jsonl]
+        [--latency-ms 300] [--threads 8] [--requests 200]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.backend.config import settings  # noqa: E402
+
+QUERIES = [
+    "what is the python global interpreter lock",
+    "how does photosynthesis work",
+    "how do solar panels generate electricity",
+    "explain crispr gene editing",
+    "evidence for climate change",
+    "rust ownership and borrowing",
+    "bm25 ranking function",
+    "what is a graph database",
+]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "tests", "fixtures", "local_corpus.jsonl"))
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="median injected search latency")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings.search_provider = "local"
+    settings.local_search_path = args.corpus
+    settings.local_search_latency_ms = args.latency_ms
+    settings.local_search_seed = args.seed
+    settings.singleflight_enabled = False
+
+    from src.backend.graph.client import GraphClient
+    from src.backend.rag.llm import LLM
+    from src.backend.rag.pipeline import RAGPipeline
+
+    rag = RAGPipeline(GraphClient(), LLM())
+    rag.retrieve(QUERIES[0])  # warm up (loads the corpus and models)
+
+    def one(i):
+        start = time.perf_counter()
+        rag.retrieve(QUERIES[i % len(QUERIES)])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        latencies = list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{args.requests} retrievals, {args.threads} threads, {args.latency_ms:.0f} ms median search latency")
+    print(f"throughput: {args.requests / elapsed:.1f} req/s")
+    print(f"latency p50: {percentile(latencies, 50) * 1000:.0f} ms  "
+          f"p95: {percentile(latencies, 95) * 1000:.0f} ms  p99: {percentile(latencies, 99) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -46,14 +46,22 @@ def check_neo4j(graph: GraphClient) -> Dict[str, Any]:
         }
 
 def check_embeddings() -> Dict[str, Any]:
-    """Check if embeddings model is loaded."""
+    """Check load state of the shared embedding/reranking models."""
     try:
-        from ..rag.pipeline import RAGPipeline
-        # Try to check if model exists
+        from ..rag.models import model_registry, LOADED, LOADING
+        models = model_registry.status()
+        embedder = models.get("embedder", {})
+        if embedder.get("state") == LOADED:
+            status = "healthy"
+        elif embedder.get("state") == LOADING:
+            status = "loading"  # not ready until warmup finishes
+        else:
+            status = "degraded"  # lazy/unavailable: retrieval falls back to lexical scoring
         return {
-            "status": "healthy",
-            "model": "all-MiniLM-L6-v2",
-            "loaded": True
+            "status": status,
+            "model": embedder.get("model"),
+            "loaded": embedder.get("state") == LOADED,
+            "models": models,
         }
     except Exception as e:
         return {
@@ -62,6 +70,24 @@ def check_embeddings() -> Dict[str, Any]:
             "loaded": False
         }
 
+def check_search_providers() -> Dict[str, Any]:
+    """Circuit breaker state of the search providers used so far, plus host rate-limit queues."""
+    try:
+        from ..search.circuit_breaker import breaker_status, OPEN
+        from ..search.scheduler import get_scheduler
+        providers = breaker_status()
+        any_open = any(p["state"] == OPEN for p in providers.values())
+        return {
+            "status": "degraded" if any_open else "healthy",
+            "providers": providers,
+            "rate_limits": get_scheduler().status(),
+        }
+    except Exception as e:
+        return {
+            "status": "degraded",
+            "error": str(e),
+        }
+
 @router.get("")
 @router.get("/")
 async def health_check():
@@ -109,6 +135,9 @@ async def readiness_check():
     if embeddings_check["status"] not in ["healthy", "degraded"]:
         all_ready = False
     
+    # Search providers (an open breaker degrades answers but does not block readiness)
+    checks["search"] = check_search_providers()
+    
     # Check configuration
     config_check = {
         "status": "healthy",
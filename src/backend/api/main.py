@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from .schemas import AskRequest, AskResponse, Fact
 from ..graph.client import GraphClient
+from ..graph.async_client import get_async_graph
 from ..ingest.ingestor import Ingestor
 from ..rag.llm import LLM
 from ..rag.pipeline import RAGPipeline
@@ -25,6 +26,13 @@ graph.ensure_indexes()
 llm = LLM()
 rag = RAGPipeline(graph, llm)
 from ..config import settings
+from ..rag.models import model_registry
+
+# Models load in the background; requests that arrive first degrade to lexical scoring
+if settings.model_warmup:
+    model_registry.warmup()
+if settings.model_idle_unload_seconds > 0:
+    model_registry.start_idle_reaper(settings.model_idle_unload_seconds, settings.model_memory_limit_mb)
 
 # Simple rate limit per-IP (very naive, in-memory)
 _rl_cache = {}
@@ -66,13 +74,13 @@ def to_fact_model(d: dict) -> Fact:
 
 @app.post("/ask", response_model=AskResponse)
 def ask(req: AskRequest):
-    answer, raw_facts = rag.answer(req.query, k=req.max_facts)
+    answer, raw_facts = rag.answer(req.query, k=req.max_facts, fusion=req.fusion)
     return AskResponse(answer=answer, facts=[to_fact_model(f) for f in raw_facts])
 
 @app.post("/ask/stream")
 def ask_stream(req: AskRequest):
     def gen():
-        answer, raw_facts = rag.answer(req.query, k=req.max_facts)
+        answer, raw_facts = rag.answer(req.query, k=req.max_facts, fusion=req.fusion)
         import json
         yield json.dumps({
             "type": "header",
@@ -101,12 +109,12 @@ def geo_submit(payload: dict):
         aliases = e.get("aliases") or []
         if eid and isinstance(aliases, list):
             graph.add_aliases(eid, [str(a) for a in aliases if a])
-    # Upsert facts
-    count = 0
+    # Upsert facts (written in batches)
+    batch = []
     for f in facts:
         if not (f.get("subject") and f.get("predicate") and f.get("object") and f.get("source_url")):
             continue
-        graph.upsert_fact({
+        batch.append({
             "id": f.get("id") or f"{f.get('subject')}#{f.get('predicate')}",
             "subject": f.get("subject"),
             "predicate": f.get("predicate"),
@@ -116,9 +124,25 @@ def geo_submit(payload: dict):
             "ts": f.get("ts"),
             "truth_weight": float(f.get("truth_weight", 0.5)),
         })
-        count += 1
+    count = graph.upsert_facts(batch)
     return {"status": "ok", "facts": count}
 
+@app.get("/facts/search")
+async def facts_search(q: str, limit: int = 8):
+    agraph = await get_async_graph(graph)
+    facts = await agraph.search_facts([t for t in q.split() if t], limit=limit)
+    return {"facts": [to_fact_model(f).model_dump() for f in facts]}
+
+@app.get("/facts/export")
+async def facts_export():
+    import json
+    agraph = await get_async_graph(graph)
+
+    async def gen():
+        async for f in agraph.export_facts():
+            yield json.dumps(f, default=str) + "\n"
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
+
 @app.get("/config")
 def get_config():
     from ..config import settings
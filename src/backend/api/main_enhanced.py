@@ -21,6 +21,7 @@ import time
 # Import our modules
 from .schemas import AskRequest, AskResponse, Fact
 from ..graph.client import GraphClient
+from ..graph.async_client import close_async_graph, get_async_graph
 from ..ingest.ingestor import Ingestor
 from ..rag.llm import LLM
 from ..rag.pipeline import RAGPipeline
@@ -102,6 +103,13 @@ async def lifespan(app: FastAPI):
     graph.ensure_indexes()
     llm = LLM()
     rag = RAGPipeline(graph, llm)
+    await get_async_graph(graph)
+    
+    from ..rag.models import model_registry
+    if settings.model_warmup:
+        model_registry.warmup()
+    if settings.model_idle_unload_seconds > 0:
+        model_registry.start_idle_reaper(settings.model_idle_unload_seconds, settings.model_memory_limit_mb)
     
     logger.info("Service initialized successfully")
     
@@ -113,13 +121,20 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down gracefully...")
     
     # Close database connections
+    await close_async_graph()
     if hasattr(graph, '_driver') and graph._driver:
         try:
             graph._driver.close()
             logger.info("Neo4j connection closed")
         except Exception as e:
             logger.error(f"Error closing Neo4j: {e}")
-    
+
+    # Compact the memory-mode WAL so the next start loads one snapshot
+    try:
+        graph.snapshot()
+    except Exception as e:
+        logger.error(f"Error writing graph snapshot: {e}")
+
     logger.info("Shutdown complete")
 
 # Create FastAPI app
@@ -269,7 +284,7 @@ def ask(req: AskRequest):
     start = time.time()
     
     try:
-        answer, raw_facts = rag.answer(req.query, k=req.max_facts)
+        answer, raw_facts = rag.answer(req.query, k=req.max_facts, fusion=req.fusion)
         
         if _HAS_PROD_FEATURES:
             if track_rag_query:
@@ -294,7 +309,7 @@ def ask_stream(req: AskRequest):
         start = time.time()
         try:
             # Stream facts and answer
-            for chunk in rag.answer_stream(req.query, k=req.max_facts):
+            for chunk in rag.answer_stream(req.query, k=req.max_facts, fusion=req.fusion):
                 if chunk["type"] == "facts":
                     # Send facts header first
                     facts = chunk["facts"]
@@ -348,12 +363,12 @@ def geo_submit(payload: dict):
             if eid and isinstance(aliases, list):
                 graph.add_aliases(eid, [str(a) for a in aliases if a])
         
-        # Upsert facts
-        count = 0
+        # Upsert facts (written in batches)
+        batch = []
         for f in facts:
             if not (f.get("subject") and f.get("predicate") and f.get("object") and f.get("source_url")):
                 continue
-            graph.upsert_fact({
+            batch.append({
                 "id": f.get("id") or f"{f.get('subject')}#{f.get('predicate')}",
                 "subject": f.get("subject"),
                 "predicate": f.get("predicate"),
@@ -363,7 +378,7 @@ def geo_submit(payload: dict):
                 "ts": f.get("ts"),
                 "truth_weight": float(f.get("truth_weight", 0.5)),
             })
-            count += 1
+        count = graph.upsert_facts(batch)
         
         logger.info(f"GEO submit: {len(ents)} entities, {count} facts")
         return {"status": "ok", "facts": count}
@@ -372,6 +387,25 @@ def geo_submit(payload: dict):
         logger.error(f"GEO submit error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/facts/search")
+async def facts_search(q: str, limit: int = 8):
+    """Search stored facts (async driver; no threadpool slot held)."""
+    terms = [t for t in q.split() if t]
+    agraph = await get_async_graph(graph)
+    facts = await agraph.search_facts(terms, limit=limit)
+    return {"facts": [to_fact_model(f).model_dump() for f in facts]}
+
+@app.get("/facts/export")
+async def facts_export():
+    """Stream every stored fact as NDJSON."""
+    agraph = await get_async_graph(graph)
+
+    async def gen():
+        async for f in agraph.export_facts():
+            yield json.dumps(f, default=str) + "\n"
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
+
 @app.get("/config")
 def get_config():
     """Get service configuration."""
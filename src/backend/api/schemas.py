@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 class Fact(BaseModel):
     id: str
@@ -22,6 +22,7 @@ class Fact(BaseModel):
 class AskRequest(BaseModel):
     query: str
     max_facts: Optional[int] = None  # If None, dynamically determined based on query complexity
+    fusion: Optional[Literal["weighted", "rrf"]] = None  # Score fusion (server default if None); anything else is a 422
 
 class AskResponse(BaseModel):
     answer: str
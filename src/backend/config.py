@@ -9,6 +9,13 @@ class Settings:
     neo4j_uri: str = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     neo4j_user: str = os.getenv("NEO4J_USER", "neo4j")
     neo4j_password: str = os.getenv("NEO4J_PASSWORD", "neo4j")
+    neo4j_write_batch_size: int = int(os.getenv("NEO4J_WRITE_BATCH_SIZE", "500"))  # facts per UNWIND transaction
+    neo4j_write_retries: int = int(os.getenv("NEO4J_WRITE_RETRIES", "3"))  # retries on transient errors
+    neo4j_database: str = os.getenv("NEO4J_DATABASE", "")  # empty = server default
+    neo4j_max_pool_size: int = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))  # connections per driver
+    neo4j_acquisition_timeout: float = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))  # seconds to wait for a pooled connection
+    neo4j_max_connection_lifetime: float = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))  # seconds
+    neo4j_fetch_size: int = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))  # records per fetch when streaming results
 
     llm_provider: str = os.getenv("LLM_PROVIDER", "mock")
     ollama_model: str = os.getenv("OLLAMA_MODEL", "llama3")
@@ -21,11 +28,117 @@ class Settings:
     api_key: str = os.getenv("GEO_API_KEY", "")
     
     # Real-time web search settings
-    search_provider: str = os.getenv("SEARCH_PROVIDER", "duckduckgo")  # duckduckgo, tavily, serpapi, google
+    search_provider: str = os.getenv("SEARCH_PROVIDER", "duckduckgo")  # duckduckgo, tavily, serpapi, google, local; "a,b" hedges a with b
     tavily_api_key: str = os.getenv("TAVILY_API_KEY", "")
     serpapi_key: str = os.getenv("SERPAPI_KEY", "")
     google_api_key: str = os.getenv("GOOGLE_API_KEY", "")
     google_cse_id: str = os.getenv("GOOGLE_CSE_ID", "")
+
+    # Offline "local" provider: BM25 (+ optional vectors) over docs dirs / JSONL dumps (comma-separated)
+    local_search_path: str = os.getenv("LOCAL_SEARCH_PATH", "")
+    local_search_vectors: bool = os.getenv("LOCAL_SEARCH_VECTORS", "false").lower() == "true"
+    local_search_index_dir: str = os.getenv("LOCAL_SEARCH_INDEX_DIR", "")  # saved vector index; empty re-embeds on start
+    local_search_latency_ms: float = float(os.getenv("LOCAL_SEARCH_LATENCY_MS", "0"))  # median injected latency
+    local_search_latency_sigma: float = float(os.getenv("LOCAL_SEARCH_LATENCY_SIGMA", "0.5"))  # log-normal tail
+    local_search_seed: int = int(os.getenv("LOCAL_SEARCH_SEED", "0"))
+
+    # Keep-alive HTTP pools for search providers (per host)
+    http_pool_connections: int = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # hosts kept per adapter
+    http_pool_maxsize: int = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))  # connections kept per host
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # seconds (async client)
+
+    # Outbound politeness: per-host token buckets ("host=rate[:burst]", overrides the scraped-host defaults)
+    search_rate_limit_enabled: bool = os.getenv("SEARCH_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    search_host_rates: str = os.getenv("SEARCH_HOST_RATES", "")
+    search_queue_timeout: float = float(os.getenv("SEARCH_QUEUE_TIMEOUT", "5.0"))  # seconds before a queued request is dropped
+
+    # Search result cache: memory LRU + SQLite tier, per-provider TTLs, stale-while-revalidate
+    search_cache_enabled: bool = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    search_cache_size: int = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+    search_cache_path: str = os.getenv("SEARCH_CACHE_PATH", "")  # SQLite file for the second tier; empty keeps it in memory
+    search_cache_ttls: str = os.getenv("SEARCH_CACHE_TTLS", "")  # e.g. "duckduckgo=900,tavily=3600"
+    search_cache_default_ttl: float = float(os.getenv("SEARCH_CACHE_DEFAULT_TTL", "900"))  # seconds
+    search_cache_stale_seconds: float = float(os.getenv("SEARCH_CACHE_STALE_SECONDS", "600"))  # 0 disables stale-while-revalidate
+    search_cache_purge_every: int = int(os.getenv("SEARCH_CACHE_PURGE_EVERY", "500"))  # delete expired SQLite rows every N writes; 0 only at startup
+
+    # Hedged search (comma-separated SEARCH_PROVIDER): ask the next provider after the primary's p95 latency
+    search_hedge_delay: float = float(os.getenv("SEARCH_HEDGE_DELAY", "1.0"))  # seconds, until enough latency samples exist
+    search_hedge_percentile: float = float(os.getenv("SEARCH_HEDGE_PERCENTILE", "95"))
+    search_hedge_min_results: int = int(os.getenv("SEARCH_HEDGE_MIN_RESULTS", "3"))  # fewer results count as a miss
+
+    # Per-provider circuit breakers and adaptive (p99-based) request timeouts
+    search_breaker_failure_rate: float = float(os.getenv("SEARCH_BREAKER_FAILURE_RATE", "0.5"))
+    search_breaker_window: int = int(os.getenv("SEARCH_BREAKER_WINDOW", "20"))  # recent calls considered
+    search_breaker_min_calls: int = int(os.getenv("SEARCH_BREAKER_MIN_CALLS", "5"))
+    search_breaker_open_seconds: float = float(os.getenv("SEARCH_BREAKER_OPEN_SECONDS", "30"))
+    search_timeout_min: float = float(os.getenv("SEARCH_TIMEOUT_MIN", "1.0"))  # seconds
+    search_timeout_max: float = float(os.getenv("SEARCH_TIMEOUT_MAX", "10.0"))  # seconds
+    search_timeout_p99_multiplier: float = float(os.getenv("SEARCH_TIMEOUT_P99_MULTIPLIER", "1.5"))
+
+    # Deep retrieval: fetch the top result pages and rank their passages alongside snippets
+    deep_retrieval: bool = os.getenv("DEEP_RETRIEVAL", "false").lower() == "true"
+    deep_retrieval_top_n: int = int(os.getenv("DEEP_RETRIEVAL_TOP_N", "3"))  # pages fetched per query
+    deep_retrieval_max_passages: int = int(os.getenv("DEEP_RETRIEVAL_MAX_PASSAGES", "4"))  # per page
+    deep_retrieval_max_bytes: int = int(os.getenv("DEEP_RETRIEVAL_MAX_BYTES", "524288"))
+    deep_retrieval_timeout: float = float(os.getenv("DEEP_RETRIEVAL_TIMEOUT", "3.0"))  # seconds per page
+    deep_retrieval_per_host: int = int(os.getenv("DEEP_RETRIEVAL_PER_HOST", "2"))  # concurrent fetches per host
+    deep_retrieval_cache_size: int = int(os.getenv("DEEP_RETRIEVAL_CACHE_SIZE", "256"))  # pages
+    deep_retrieval_cache_ttl: float = float(os.getenv("DEEP_RETRIEVAL_CACHE_TTL", "3600"))  # seconds
+    deep_retrieval_max_redirects: int = int(os.getenv("DEEP_RETRIEVAL_MAX_REDIRECTS", "5"))
+    deep_retrieval_allow_private: bool = os.getenv("DEEP_RETRIEVAL_ALLOW_PRIVATE", "false").lower() == "true"  # loopback/private/link-local targets
+
+    # Retrieval fan-out: query variants are searched concurrently on a shared pool
+    concurrent_retrieval: bool = os.getenv("CONCURRENT_RETRIEVAL", "true").lower() == "true"
+    retrieval_max_workers: int = int(os.getenv("RETRIEVAL_MAX_WORKERS", "8"))
+    retrieval_variant_timeout: float = float(os.getenv("RETRIEVAL_VARIANT_TIMEOUT", "4.0"))  # seconds per variant from when it starts; also the max queue wait
+    # Speculative retrieval: start retrieval while the LLM is still classifying the query
+    speculative_retrieval: bool = os.getenv("SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+    # Request coalescing: concurrent identical queries share one search / answer / token stream
+    singleflight_enabled: bool = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+
+    # Local conversational/search classifier; the LLM is only asked below this confidence
+    intent_classifier_enabled: bool = os.getenv("INTENT_CLASSIFIER_ENABLED", "true").lower() == "true"
+    intent_classifier_threshold: float = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", "0.8"))  # confidence for a local SEARCH decision
+    intent_conversational_threshold: float = float(os.getenv("INTENT_CONVERSATIONAL_THRESHOLD", "0.95"))  # probability for a local CONVERSATIONAL decision
+    intent_memo_size: int = int(os.getenv("INTENT_MEMO_SIZE", "4096"))
+
+    # Embedding cache: in-process LRU + optional mmap disk tier (empty dir disables disk)
+    embedding_cache_size: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "20000"))
+    embedding_cache_dir: str = os.getenv("EMBEDDING_CACHE_DIR", "")
+
+    # ANN (IVF-flat) index over stored fact embeddings, queried next to web results
+    vector_index_enabled: bool = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+    vector_index_path: str = os.getenv("VECTOR_INDEX_PATH", "")  # directory; empty keeps it in memory
+    vector_index_nprobe: int = int(os.getenv("VECTOR_INDEX_NPROBE", "8"))
+    vector_index_train_threshold: int = int(os.getenv("VECTOR_INDEX_TRAIN_THRESHOLD", "4096"))
+
+    # Memory-mode graph persistence: WAL + periodic snapshots (empty dir keeps facts in memory only)
+    memory_graph_dir: str = os.getenv("MEMORY_GRAPH_DIR", "")
+    memory_graph_snapshot_mb: float = float(os.getenv("MEMORY_GRAPH_SNAPSHOT_MB", "64"))  # compact once the WAL reaches this size
+    memory_graph_fsync: bool = os.getenv("MEMORY_GRAPH_FSYNC", "false").lower() == "true"  # fsync every WAL append
+
+    # Hybrid score fusion in retrieve(): "weighted" (normalized weighted sum) or "rrf"
+    fusion_strategy: str = os.getenv("FUSION_STRATEGY", "weighted")
+
+    # Model registry: background warmup at startup, idle unloading under memory pressure
+    model_warmup: bool = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+    model_idle_unload_seconds: float = float(os.getenv("MODEL_IDLE_UNLOAD_SECONDS", "0"))  # 0 disables unloading
+    model_memory_limit_mb: float = float(os.getenv("MODEL_MEMORY_LIMIT_MB", "0"))  # unload idle models only above this RSS
+    model_retry_seconds: float = float(os.getenv("MODEL_RETRY_SECONDS", "30"))  # first retry after a failed load; doubles per failure
+    model_max_retry_seconds: float = float(os.getenv("MODEL_MAX_RETRY_SECONDS", "900"))
+
+    # Cross-request micro-batching for embedder/reranker inference
+    inference_batching: bool = os.getenv("INFERENCE_BATCHING", "true").lower() == "true"
+    inference_batch_max_size: int = int(os.getenv("INFERENCE_BATCH_MAX_SIZE", "64"))
+    inference_batch_max_wait_ms: float = float(os.getenv("INFERENCE_BATCH_MAX_WAIT_MS", "3"))
+
+    # Semantic answer cache (keyed by query embedding)
+    answer_cache_enabled: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    answer_cache_max_distance: float = float(os.getenv("ANSWER_CACHE_MAX_DISTANCE", "0.08"))  # cosine distance
+    answer_cache_ttl_recent: float = float(os.getenv("ANSWER_CACHE_TTL_RECENT", "600"))  # "latest/recent" queries
+    answer_cache_ttl_evergreen: float = float(os.getenv("ANSWER_CACHE_TTL_EVERGREEN", "86400"))
+    answer_cache_max_entries: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2048"))
+    answer_cache_stale_seconds: float = float(os.getenv("ANSWER_CACHE_STALE_SECONDS", "300"))  # 0 disables stale-while-revalidate
     
     # Production settings
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,196 @@
+"""
+Async graph client for async FastAPI endpoints.
+
+It is built on the neo4j async driver, so a request waiting on Bolt round
+trips yields the event loop instead of holding a threadpool worker. The
+driver's connection pool is sized from settings (see driver_config).
+
+- read()/write() run managed transactions (execute_read / execute_write).
+  These route to readers or the leader on a cluster and retry transient
+  errors.
+- stream() yields records as the server sends them, fetch_size at a time,
+  for reads too large to materialize.
+- facts_by_ids/facts_by_subject/search_facts/upsert_facts return the same
+  shapes as GraphClient.
+
+When Neo4j is unreachable, the client runs in memory mode and delegates to a
+GraphClient (the app's shared one), whose in-memory operations do no I/O.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from ..config import settings
+from .client import (
+    FULLTEXT_INDEX, GraphClient, _CONTAINS_SEARCH, _FULLTEXT_SEARCH, _UPSERT_FACTS,
+    _fact_from_search_row, _fulltext_query, _is_transient, driver_config,
+)
+
+try:
+    from neo4j import AsyncGraphDatabase, READ_ACCESS  # type: ignore
+except Exception:
+    AsyncGraphDatabase = None  # type: ignore
+    READ_ACCESS = "READ"  # type: ignore
+
+
+async def _collect(tx, cypher: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = await tx.run(cypher, params)
+    return [record.data() async for record in result]
+
+
+class AsyncGraphClient:
+    """Neo4j access for async code, with a memory-mode GraphClient fallback."""
+
+    def __init__(self, fallback: Optional[GraphClient] = None):
+        self._fallback = fallback
+        self._driver: Any = None
+        self._use_memory = True
+        self._fulltext_available = True
+
+    @property
+    def fallback(self) -> GraphClient:
+        if self._fallback is None:
+            self._fallback = GraphClient()
+        return self._fallback
+
+    async def connect(self) -> bool:
+        """Open the async driver; returns False (memory mode) if Neo4j is unreachable."""
+        if AsyncGraphDatabase is None:
+            return False
+        driver = None
+        try:
+            driver = AsyncGraphDatabase.driver(
+                settings.neo4j_uri,
+                auth=(settings.neo4j_user, settings.neo4j_password),
+                **driver_config(),
+            )
+            await driver.verify_connectivity()
+        except Exception as e:
+            print(f"[AsyncGraphClient] Neo4j unavailable, using memory mode: {e}")
+            if driver is not None:
+                await driver.close()
+            return False
+        self._driver = driver
+        self._use_memory = False
+        return True
+
+    async def close(self):
+        if self._driver is not None:
+            await self._driver.close()
+            self._driver = None
+            self._use_memory = True
+
+    def _session(self, read: bool = False):
+        kwargs: Dict[str, Any] = {"fetch_size": settings.neo4j_fetch_size}
+        if settings.neo4j_database:
+            kwargs["database"] = settings.neo4j_database
+        if read:
+            kwargs["default_access_mode"] = READ_ACCESS
+        return self._driver.session(**kwargs)
+
+    async def read(self, cypher: str, **params) -> List[Dict[str, Any]]:
+        """Run a read query in a managed read transaction; rows as dicts."""
+        if self._use_memory:
+            return []
+        async with self._session(read=True) as session:
+            return await session.execute_read(_collect, cypher, params)
+
+    async def write(self, cypher: str, **params) -> List[Dict[str, Any]]:
+        """Run a write query in a managed write transaction; rows as dicts."""
+        if self._use_memory:
+            return []
+        async with self._session() as session:
+            return await session.execute_write(_collect, cypher, params)
+
+    async def stream(self, cypher: str, **params) -> AsyncIterator[Dict[str, Any]]:
+        """Yield rows of a read query as they arrive (auto-commit, routed to readers)."""
+        if self._use_memory:
+            return
+        async with self._session(read=True) as session:
+            result = await session.run(cypher, params)
+            async for record in result:
+                yield record.data()
+
+    # -- fact operations (same shapes as GraphClient) ----------------------
+
+    async def facts_by_ids(self, ids: List[str]) -> List[Dict[str, Any]]:
+        if self._use_memory:
+            return self.fallback.facts_by_ids(ids)
+        rows = await self.read("MATCH (f:Fact) WHERE f.id IN $ids RETURN f", ids=list(ids))
+        by_id = {str(row["f"].get("id")): row["f"] for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    async def facts_by_subject(self, subject: str, limit: int = 20) -> List[Dict[str, Any]]:
+        if self._use_memory:
+            return self.fallback.facts_by_subject(subject, limit)
+        subj = self.fallback._canonicalize_id(subject)
+        rows = await self.read("MATCH (f:Fact) WHERE f.subject = $subject RETURN f LIMIT $limit", subject=subj, limit=limit)
+        return [row["f"] for row in rows]
+
+    async def search_facts(self, terms: List[str], limit: int = 8) -> List[Dict[str, Any]]:
+        if self._use_memory:
+            return self.fallback.search_facts(terms, limit)
+        rows = None
+        if self._fulltext_available:
+            query = _fulltext_query(terms)
+            if not query:
+                return []
+            try:
+                rows = await self.read(_FULLTEXT_SEARCH, index=FULLTEXT_INDEX, query=query, candidates=max(limit * 4, 50), limit=limit)
+            except Exception as e:
+                print(f"[AsyncGraphClient] Full-text search failed, using CONTAINS scan: {e}")
+                if not _is_transient(e):
+                    self._fulltext_available = False
+        if rows is None:
+            rows = await self.read(_CONTAINS_SEARCH, terms=terms, limit=limit)
+        return [_fact_from_search_row(row) for row in rows]
+
+    async def upsert_facts(self, facts: Iterable[Dict[str, Any]], batch_size: Optional[int] = None) -> int:
+        """Batched UNWIND upserts (see GraphClient.upsert_facts); memory mode writes to the fallback."""
+        if self._use_memory:
+            return await asyncio.to_thread(self.fallback.upsert_facts, list(facts), batch_size)
+        rows = [self.fallback._prepare_fact(f) for f in facts]
+        size = max(1, batch_size or settings.neo4j_write_batch_size)
+        for i in range(0, len(rows), size):
+            batch = rows[i:i + size]
+            params = [{k: f.get(k) for k in ("id", "subject", "predicate", "object", "source_url", "truth_weight")} for f in batch]
+            await self.write(_UPSERT_FACTS, rows=params)
+            # Encoding runs model inference; keep it off the event loop
+            await asyncio.to_thread(self.fallback._update_vector_index, batch)
+        return len(rows)
+
+    async def export_facts(self) -> AsyncIterator[Dict[str, Any]]:
+        """Every stored fact, streamed."""
+        if self._use_memory:
+            for f in self.fallback._store:
+                yield dict(f)
+                await asyncio.sleep(0)
+            return
+        async for row in self.stream("MATCH (f:Fact) RETURN f"):
+            yield row["f"]
+
+
+_async_graph: Optional[AsyncGraphClient] = None
+_async_graph_lock: Optional[asyncio.Lock] = None
+
+
+async def get_async_graph(fallback: Optional[GraphClient] = None) -> AsyncGraphClient:
+    """Shared AsyncGraphClient, connected on first use (call from the server's event loop)."""
+    global _async_graph, _async_graph_lock
+    if _async_graph is None:
+        if _async_graph_lock is None:
+            _async_graph_lock = asyncio.Lock()
+        async with _async_graph_lock:
+            if _async_graph is None:
+                client = AsyncGraphClient(fallback)
+                if fallback is None or not fallback._use_memory:
+                    await client.connect()
+                _async_graph = client
+    return _async_graph
+
+
+async def close_async_graph():
+    global _async_graph
+    if _async_graph is not None:
+        await _async_graph.close()
+        _async_graph = None
@@ -1,6 +1,123 @@
-from typing import Any, Dict, List
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from dataclasses import dataclass
 from ..config import settings
+from .fact_store import FactStore
+from .persistence import GraphPersistence
+
+# Batched fact upsert: one round trip per batch. Afterwards, unique sources are
+# recounted for every (subject, predicate) claim the batch touched, old and new.
+# Claim nodes carry the aggregate so searches read it with one indexed lookup.
+# Each Claim is write-locked (SET c._lock) before its facts are counted, so
+# concurrent batches touching the same claim recount one after the other and
+# the later one sees the earlier one's facts. Claims are locked in sorted
+# order to keep overlapping batches from deadlocking.
+_UPSERT_FACTS = (
+    "UNWIND $rows AS row\n"
+    "MERGE (s:Entity {id: row.subject})\n"
+    "MERGE (o:Entity {id: row.object})\n"
+    "MERGE (s)-[r:REL {predicate: row.predicate}]->(o)\n"
+    "ON CREATE SET r.source_url=row.source_url, r.truth_weight=row.truth_weight, r.id=row.id\n"
+    "ON MATCH SET r.source_url=row.source_url, r.truth_weight=row.truth_weight\n"
+    "MERGE (f:Fact {id: row.id})\n"
+    "WITH f, row, f.subject AS old_subject, f.predicate AS old_predicate\n"
+    "SET f.subject=row.subject, f.predicate=row.predicate, f.object=row.object, f.source_url=row.source_url, f.truth_weight=row.truth_weight\n"
+    "WITH collect(DISTINCT [old_subject, old_predicate]) + collect(DISTINCT [row.subject, row.predicate]) AS claims\n"
+    "UNWIND claims AS claim\n"
+    "WITH DISTINCT claim WHERE claim[0] IS NOT NULL AND claim[1] IS NOT NULL\n"
+    "WITH claim ORDER BY claim[0], claim[1]\n"
+    "MERGE (c:Claim {subject: claim[0], predicate: claim[1]})\n"
+    "SET c._lock = true\n"
+    "WITH c, claim\n"
+    "OPTIONAL MATCH (g:Fact {subject: claim[0], predicate: claim[1]})\n"
+    "WITH c, count(DISTINCT g.source_url) AS n\n"
+    "SET c.source_count = n\n"
+    "REMOVE c._lock\n"
+)
+
+FULLTEXT_INDEX = "fact_text"
+
+_INDEX_STATEMENTS = [
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE",
+    "CREATE INDEX IF NOT EXISTS FOR (f:Fact) ON (f.id)",
+    "CREATE INDEX IF NOT EXISTS FOR (f:Fact) ON (f.subject, f.predicate)",
+    "CREATE INDEX IF NOT EXISTS FOR (c:Claim) ON (c.subject, c.predicate)",
+    f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} IF NOT EXISTS FOR (f:Fact) ON EACH [f.subject, f.predicate, f.object]",
+]
+
+# Claims for facts written before Claim nodes existed. Only (subject, predicate)
+# pairs without a Claim are counted, so after the first run this is a no-op.
+_BACKFILL_CLAIMS = (
+    "MATCH (f:Fact)\n"
+    "WHERE f.subject IS NOT NULL AND f.predicate IS NOT NULL\n"
+    "  AND NOT EXISTS { MATCH (:Claim {subject: f.subject, predicate: f.predicate}) }\n"
+    "WITH f.subject AS subject, f.predicate AS predicate, count(DISTINCT f.source_url) AS n\n"
+    "MERGE (c:Claim {subject: subject, predicate: predicate})\n"
+    "SET c.source_count = n"
+)
+
+# Lucene does the matching and relevance scoring; the database keeps only the
+# top candidates, blends in trust/recency and applies the limit.
+_FULLTEXT_SEARCH = (
+    "CALL db.index.fulltext.queryNodes($index, $query, {limit: $candidates}) YIELD node AS f, score AS text_score\n"
+    "OPTIONAL MATCH (c:Claim {subject: f.subject, predicate: f.predicate})\n"
+    "RETURN f, c.source_count AS corroboration, text_score + 0.3*coalesce(f.truth_weight,0.5) + CASE WHEN coalesce(f.ts,'') <> '' THEN 0.1 ELSE 0 END AS score\n"
+    "ORDER BY score DESC\n"
+    "LIMIT $limit"
+)
+
+# Fallback when the full-text index is unavailable (scans every :Fact)
+_CONTAINS_SEARCH = (
+    "MATCH (f:Fact)\n"
+    "WITH f, size([t IN $terms WHERE f.subject CONTAINS t OR f.predicate CONTAINS t OR f.object CONTAINS t]) AS hits\n"
+    "WHERE hits > 0\n"
+    "OPTIONAL MATCH (c:Claim {subject: f.subject, predicate: f.predicate})\n"
+    "RETURN f, c.source_count AS corroboration, 0.6*hits + 0.3*coalesce(f.truth_weight,0.5) + CASE WHEN coalesce(f.ts,'') <> '' THEN 0.1 ELSE 0 END AS score\n"
+    "ORDER BY score DESC\n"
+    "LIMIT $limit"
+)
+
+
+def _fact_from_search_row(row: Any) -> Dict[str, Any]:
+    """Fact dict with score details from a _FULLTEXT_SEARCH/_CONTAINS_SEARCH row."""
+    d = dict(row["f"])  # type: ignore
+    d["score"] = row.get("score", 0.0)
+    d["trust_score"] = 0.3 * float(d.get("truth_weight", 0.5) or 0.5)
+    d["recency_weight"] = 0.1 if (d.get("ts") or "") else 0.0
+    d["corroboration_count"] = max(1, int(row.get("corroboration") or 0))
+    d["trust_explain"] = None
+    return d
+
+
+def driver_config() -> Dict[str, Any]:
+    """Connection pool settings shared by the sync and async drivers."""
+    return {
+        "max_connection_pool_size": settings.neo4j_max_pool_size,
+        "connection_acquisition_timeout": settings.neo4j_acquisition_timeout,
+        "max_connection_lifetime": settings.neo4j_max_connection_lifetime,
+    }
+
+
+def _fulltext_query(terms: List[str]) -> str:
+    """Lucene query matching any term; each term is a quoted phrase so its syntax characters are literal."""
+    phrases = []
+    for t in terms:
+        t = str(t or "").strip()
+        if t:
+            phrases.append('"' + t.replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return " OR ".join(phrases)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a Neo4j error is worth retrying (deadlocks, leader switches, lost connections)."""
+    is_retryable = getattr(error, "is_retryable", None)
+    if callable(is_retryable):
+        try:
+            return bool(is_retryable())
+        except Exception:
+            return False
+    return type(error).__name__ in ("TransientError", "ServiceUnavailable", "SessionExpired")
 
 @dataclass
 class Node:
@@ -19,19 +136,43 @@ class Relation:
 class GraphClient:
     def __init__(self):
         self._use_memory = False
-        self._mem_facts: List[Dict[str, Any]] = []
+        self._store = FactStore()  # memory mode: facts by id + secondary and full-text indexes
         self._aliases: Dict[str, str] = {}
+        self._vector_index: Any = None  # optional FactVectorIndex, see attach_vector_index
+        self._fulltext_available = True  # cleared if the full-text search query fails
+        self._persistence: Optional[GraphPersistence] = None  # memory mode: WAL + snapshots, see enable_persistence
         try:
             from neo4j import GraphDatabase  # type: ignore
             self._driver = GraphDatabase.driver(
                 settings.neo4j_uri,
                 auth=(settings.neo4j_user, settings.neo4j_password),
+                **driver_config(),
             )
             with self._driver.session() as s:
                 s.run("RETURN 1")
         except Exception:
             self._use_memory = True
             self._driver = None  # type: ignore
+        if self._use_memory and settings.memory_graph_dir:
+            self.enable_persistence(settings.memory_graph_dir)
+
+    def enable_persistence(self, directory: str) -> int:
+        """Restore memory-mode facts and aliases from directory and log every later write there."""
+        self._persistence = GraphPersistence(
+            directory,
+            snapshot_bytes=int(settings.memory_graph_snapshot_mb * 1024 * 1024),
+            fsync=settings.memory_graph_fsync,
+        )
+        loaded = self._persistence.load(self._store, self._aliases)
+        # Restored facts must also be findable by vector search. An index attached
+        # later backfills itself; one that is already attached is brought up to date here
+        self.backfill_vector_index()
+        return loaded
+
+    def snapshot(self):
+        """Compact the memory-mode WAL into a fresh snapshot."""
+        if self._persistence is not None:
+            self._persistence.snapshot(self._store, self._aliases)
 
     def _canonicalize_id(self, val: Any) -> Any:
         if not isinstance(val, str):
@@ -57,13 +198,96 @@ class GraphClient:
 
     def add_aliases(self, canonical: str, aliases: List[str]):
         can = str(self._canonicalize_id(canonical))
+        pairs = []
         for a in aliases:
             aa = str(self._canonicalize_id(a))
             self._aliases[aa.lower()] = can
+            pairs.append((aa.lower(), can))
+        if self._persistence is not None:
+            self._persistence.log_aliases(pairs, self._store, self._aliases)
+
+    def attach_vector_index(self, index: Any, backfill: bool = True):
+        """
+        Keep an ANN index (FactVectorIndex) in sync with upsert_fact.
+
+        Facts already in the graph (Neo4j, or restored memory facts) that the
+        index lacks are added by a background backfill, since encoding them
+        can take a while.
+        """
+        self._vector_index = index
+        if backfill:
+            threading.Thread(target=self.backfill_vector_index, daemon=True, name="geo-vector-backfill").start()
+
+    def iter_facts(self, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Every stored fact; Neo4j is read in id-ordered pages."""
+        if self._use_memory:
+            yield from (dict(f) for f in self._store)
+            return
+        after = ""
+        while True:
+            rows = self.run("MATCH (f:Fact) WHERE f.id > $after RETURN f ORDER BY f.id LIMIT $limit", after=after, limit=page_size)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row["f"])
+            after = str(dict(rows[-1]["f"]).get("id"))
+
+    def backfill_vector_index(self) -> int:
+        """Encode stored facts the attached vector index is missing; returns how many were added."""
+        index = self._vector_index
+        if index is None:
+            return 0
+        try:
+            added = index.backfill(self.iter_facts())
+        except Exception as e:
+            print(f"[GraphClient] Vector index backfill failed: {e}")
+            return 0
+        if added:
+            print(f"[GraphClient] Backfilled {added} facts into the vector index")
+        return added
+
+    @property
+    def vector_index(self) -> Any:
+        return self._vector_index
+
+    def save_vector_index(self):
+        if self._vector_index is not None:
+            try:
+                self._vector_index.save()
+            except Exception as e:
+                print(f"[GraphClient] Could not save vector index: {e}")
+
+    def facts_by_ids(self, ids: List[str]) -> List[Dict[str, Any]]:
+        if self._use_memory:
+            return [dict(f) for f in (self._store.get(i) for i in ids) if f is not None]
+        rows = self.run("MATCH (f:Fact) WHERE f.id IN $ids RETURN f", ids=list(ids))
+        by_id = {str(dict(row["f"]).get("id")): dict(row["f"]) for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def vector_search(self, query_vec: Any, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Stored facts nearest to a query embedding, best first.
+
+        Each fact carries its cosine similarity as "vector_score".
+        """
+        if self._vector_index is None:
+            return []
+        hits = self._vector_index.search(query_vec, k)
+        facts = {str(f.get("id")): f for f in self.facts_by_ids([fid for fid, _ in hits])}
+        out = []
+        for fid, sim in hits:
+            f = facts.get(fid)
+            if f is not None:
+                f["vector_score"] = sim
+                out.append(f)
+        return out
 
     def close(self):
         if not self._use_memory and self._driver:
             self._driver.close()
+        if self._persistence is not None:
+            self.snapshot()
+            self._persistence.close()
 
     def run(self, cypher: str, **params):
         if self._use_memory or not getattr(self, "_driver", None):
@@ -72,47 +296,135 @@ class GraphClient:
             return list(session.run(cypher, **params))  # type: ignore[arg-type]
 
     def ensure_indexes(self):
+        """
+        Create constraints and indexes, one statement per query (Bolt runs one statement at a time).
+
+        Also creates the Claim nodes (corroboration counts) missing for facts
+        stored before claims were maintained.
+        """
         if self._use_memory:
             return
-        cypher = (
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE;\n"
-            "CREATE INDEX IF NOT EXISTS FOR (f:Fact) ON (f.id);"
-        )
-        self.run(cypher)
+        for statement in _INDEX_STATEMENTS:
+            try:
+                self.run(statement)
+            except Exception as e:
+                print(f"[GraphClient] Index statement failed ({statement.split(' FOR ')[0]}): {e}")
+        try:
+            self.run(_BACKFILL_CLAIMS)
+        except Exception as e:
+            print(f"[GraphClient] Claim backfill failed: {e}")
 
     def facts_by_subject(self, subject: str, limit: int = 20) -> List[Dict[str, Any]]:
         subj = self._canonicalize_id(subject)
         if self._use_memory:
-            out = [dict(f) for f in self._mem_facts if f.get("subject") == subj]
-            return out[:limit]
+            return [dict(f) for f in self._store.by_subject(subj, limit)]
         cypher = "MATCH (f:Fact) WHERE f.subject = $subject RETURN f LIMIT $limit"
         rows = self.run(cypher, subject=subj, limit=limit)
         return [dict(row["f"]) for row in rows]
 
-    def upsert_fact(self, fact: Dict[str, Any]):
+    def facts_by_object(self, obj: str, limit: int = 20) -> List[Dict[str, Any]]:
+        o = self._canonicalize_id(obj)
+        if self._use_memory:
+            return [dict(f) for f in self._store.by_object(o, limit)]
+        rows = self.run("MATCH (f:Fact) WHERE f.object = $object RETURN f LIMIT $limit", object=o, limit=limit)
+        return [dict(row["f"]) for row in rows]
+
+    def facts_by_source(self, source_url: str, limit: int = 100) -> List[Dict[str, Any]]:
+        if self._use_memory:
+            return [dict(f) for f in self._store.by_source(source_url, limit)]
+        rows = self.run("MATCH (f:Fact) WHERE f.source_url = $source_url RETURN f LIMIT $limit", source_url=source_url, limit=limit)
+        return [dict(row["f"]) for row in rows]
+
+    def _prepare_fact(self, fact: Dict[str, Any]) -> Dict[str, Any]:
         f = dict(fact)
         f["subject"] = self._canonicalize_id(f.get("subject"))
         f["object"] = self._canonicalize_id(f.get("object"))
+        return f
+
+    def upsert_fact(self, fact: Dict[str, Any]):
+        f = self._prepare_fact(fact)
         if self._use_memory:
-            self._mem_facts = [x for x in self._mem_facts if x.get("id") != f.get("id")]
-            self._mem_facts.append(f)
+            self._store.upsert(f)
+            self._log_facts([f])
+            self._update_vector_index([f])
             return None
-        cypher = (
-            "MERGE (s:Entity {id: $subject})\n"
-            "MERGE (o:Entity {id: $object})\n"
-            "MERGE (s)-[r:REL {predicate: $predicate}]->(o)\n"
-            "ON CREATE SET r.source_url=$source_url, r.truth_weight=$truth_weight, r.id=$id\n"
-            "ON MATCH SET r.source_url=$source_url, r.truth_weight=$truth_weight\n"
-            "MERGE (f:Fact {id: $id})\n"
-            "SET f.subject=$subject, f.predicate=$predicate, f.object=$object, f.source_url=$source_url, f.truth_weight=$truth_weight\n"
-        )
-        self.run(cypher, **f)
+        self._write_batch([f])
+        self._update_vector_index([f])
         return None
 
+    def upsert_facts(self, facts: Iterable[Dict[str, Any]], batch_size: Optional[int] = None) -> int:
+        """
+        Write many facts, batch_size per transaction (default: settings.neo4j_write_batch_size).
+
+        In Neo4j mode each batch is a single UNWIND query. Transient errors
+        are retried. Returns the number of facts written.
+        """
+        rows = [self._prepare_fact(f) for f in facts]
+        if not rows:
+            return 0
+        if self._use_memory:
+            for f in rows:
+                self._store.upsert(f)
+            self._log_facts(rows)
+            self._update_vector_index(rows)
+            return len(rows)
+        size = max(1, batch_size or settings.neo4j_write_batch_size)
+        for i in range(0, len(rows), size):
+            batch = rows[i:i + size]
+            self._write_batch(batch)
+            self._update_vector_index(batch)
+        return len(rows)
+
+    def _write_batch(self, rows: List[Dict[str, Any]]):
+        """One UNWIND upsert transaction, retried with backoff on transient errors."""
+        params = [{
+            "id": f.get("id"),
+            "subject": f.get("subject"),
+            "predicate": f.get("predicate"),
+            "object": f.get("object"),
+            "source_url": f.get("source_url"),
+            "truth_weight": f.get("truth_weight"),
+        } for f in rows]
+        attempts = max(1, settings.neo4j_write_retries + 1)
+        for attempt in range(attempts):
+            try:
+                with self._driver.session() as session:  # type: ignore[attr-defined]
+                    session.execute_write(lambda tx: tx.run(_UPSERT_FACTS, rows=params).consume())
+                return
+            except Exception as e:
+                if attempt + 1 >= attempts or not _is_transient(e):
+                    raise
+                delay = 0.2 * (2 ** attempt)
+                print(f"[GraphClient] Transient write error ({e}), retrying {len(rows)} facts in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _log_facts(self, facts: List[Dict[str, Any]]):
+        if self._persistence is not None:
+            self._persistence.log_facts(facts, self._store, self._aliases)
+
+    def _update_vector_index(self, facts: List[Dict[str, Any]]):
+        if self._vector_index is None:
+            return
+        try:
+            self._vector_index.upsert(facts)
+        except Exception as e:
+            print(f"[GraphClient] Vector index update failed for {len(facts)} fact(s) (first: {facts[0].get('id')}): {e}")
+
+    def bm25_scores(self, query: str, fact_ids: List[str]) -> Optional[List[float]]:
+        """
+        BM25 scores for stored facts, computed from the incremental index.
+
+        Returns None when the index does not cover the store (Neo4j mode), so
+        callers can fall back to scoring the texts themselves.
+        """
+        if not self._use_memory:
+            return None
+        ids = [str(i) for i in fact_ids]
+        scores = self._store.text.bm25(query, ids)
+        return [scores.get(i, 0.0) for i in ids]
+
     def search_facts(self, terms: List[str], limit: int = 8) -> List[Dict[str, Any]]:
-        def score_fact(f: Dict[str, Any]) -> Dict[str, Any]:
-            s = (str(f.get("subject", "")) + " " + str(f.get("predicate", "")) + " " + str(f.get("object", ""))).lower()
-            hits = sum(1 for t in terms if t in s)
+        def score_fact(f: Dict[str, Any], hits: int) -> Dict[str, Any]:
             if hits == 0:
                 return {"score": 0.0, "corroboration_count": 0, "recency_weight": 0.0, "trust_score": float(f.get("truth_weight", 0.5) or 0.5), "trust_explain": "no term hits", "domain_score": 0.5}
             
@@ -147,9 +459,7 @@ class GraphClient:
             corroboration = 0.0
             corroboration_count = 1
             if self._use_memory:
-                sp = (f.get("subject"), f.get("predicate"))
-                unique_sources = {g.get("source_url") for g in self._mem_facts if (g.get("subject"), g.get("predicate")) == sp}
-                corroboration_count = max(1, len(unique_sources))
+                corroboration_count = max(1, self._store.corroboration_count(f.get("subject"), f.get("predicate")))
                 corroboration = max(0.0, min(0.25, 0.06 * max(0, corroboration_count - 1)))
             
             # Trust score: combines truth_weight, domain reputation, and corroboration
@@ -185,29 +495,30 @@ class GraphClient:
 
         if self._use_memory:
             cand = []
-            for f in self._mem_facts:
-                detail = score_fact(f)
+            # Only facts that share a term with the query are scored
+            for fact_id, hits in self._store.text.match_terms(terms).items():
+                f = self._store.get(fact_id)
+                if f is None:
+                    continue  # removed concurrently
+                detail = score_fact(f, hits)
                 if detail["score"] > 0:
                     g = dict(f)
                     g.update(detail)
                     cand.append(g)
             cand.sort(key=lambda x: x.get("score", 0.0), reverse=True)
             return cand[:limit]
-        cypher = (
-            "MATCH (f:Fact)\n"
-            "WHERE any(t IN $terms WHERE f.subject CONTAINS t OR f.predicate CONTAINS t OR f.object CONTAINS t)\n"
-            "RETURN f, (0.6*reduce(i IN $terms | CASE WHEN (f.subject CONTAINS i OR f.predicate CONTAINS i OR f.object CONTAINS i) THEN 1 ELSE 0 END, 0, (a,b) -> a+b) + 0.3*coalesce(f.truth_weight,0.5) + CASE WHEN coalesce(f.ts,'') <> '' THEN 0.1 ELSE 0 END) AS score\n"
-            "ORDER BY score DESC\n"
-            "LIMIT $limit"
-        )
-        rows = self.run(cypher, terms=terms, limit=limit)
-        out: List[Dict[str, Any]] = []
-        for row in rows:
-            d = dict(row["f"])  # type: ignore
-            d["score"] = row.get("score", 0.0)
-            d["trust_score"] = 0.3 * float(d.get("truth_weight", 0.5) or 0.5)
-            d["recency_weight"] = 0.1 if (d.get("ts") or "") else 0.0
-            d["corroboration_count"] = None
-            d["trust_explain"] = None
-            out.append(d)
-        return out
+        rows = None
+        if self._fulltext_available:
+            query = _fulltext_query(terms)
+            if not query:
+                return []
+            try:
+                rows = self.run(_FULLTEXT_SEARCH, index=FULLTEXT_INDEX, query=query, candidates=max(limit * 4, 50), limit=limit)
+            except Exception as e:
+                print(f"[GraphClient] Full-text search failed, using CONTAINS scan: {e}")
+                if not _is_transient(e):
+                    # Index missing (ensure_indexes not run) or server without full-text options
+                    self._fulltext_available = False
+        if rows is None:
+            rows = self.run(_CONTAINS_SEARCH, terms=terms, limit=limit)
+        return [_fact_from_search_row(row) for row in rows]
@@ -0,0 +1,128 @@
+"""
+Indexed in-memory fact store (GraphClient memory mode).
+
+Facts live in a primary dict by id. Secondary indexes map subject, object,
+(subject, predicate) and source_url to the ids that have them, and an
+InvertedIndex holds postings over subject/predicate/object text. Writes and
+lookups touch only the entries for one fact or one key, so they stay cheap
+no matter how many facts are stored.
+
+Secondary indexes are dicts used as ordered sets, so results come back in
+write order, and a replaced fact moves to the end, as if it had just been
+appended.
+
+Corroboration statistics are kept up to date on every write. For each
+(subject, predicate) claim, the store counts facts per source_url, so the
+number of unique sources backing a claim is a dict lookup.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .inverted_index import InvertedIndex
+
+Fact = Dict[str, Any]
+
+
+def fact_text(f: Fact) -> str:
+    return str(f.get("subject", "")) + " " + str(f.get("predicate", "")) + " " + str(f.get("object", ""))
+
+
+class FactStore:
+    """Facts by id with secondary indexes and full-text postings."""
+
+    def __init__(self):
+        self._facts: Dict[str, Fact] = {}
+        self._by_subject: Dict[Any, Dict[str, None]] = {}
+        self._by_object: Dict[Any, Dict[str, None]] = {}
+        self._by_subject_predicate: Dict[Tuple[Any, Any], Dict[str, None]] = {}
+        self._by_source: Dict[Any, Dict[str, None]] = {}
+        self._claim_sources: Dict[Tuple[Any, Any], Counter] = {}  # (subject, predicate) -> facts per source_url
+        self.text = InvertedIndex()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._facts)
+
+    def __contains__(self, fact_id: str) -> bool:
+        return fact_id in self._facts
+
+    def __iter__(self) -> Iterator[Fact]:
+        return iter(list(self._facts.values()))
+
+    def get(self, fact_id: str) -> Optional[Fact]:
+        return self._facts.get(fact_id)
+
+    @staticmethod
+    def _link(index: Dict[Any, Dict[str, None]], key: Hashable, fact_id: str):
+        index.setdefault(key, {})[fact_id] = None
+
+    @staticmethod
+    def _unlink(index: Dict[Any, Dict[str, None]], key: Hashable, fact_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.pop(fact_id, None)
+            if not ids:
+                del index[key]
+
+    def _keys(self, f: Fact):
+        subject, predicate = f.get("subject"), f.get("predicate")
+        return (
+            (self._by_subject, subject),
+            (self._by_object, f.get("object")),
+            (self._by_subject_predicate, (subject, predicate)),
+            (self._by_source, f.get("source_url")),
+        )
+
+    def upsert(self, f: Fact) -> Optional[Fact]:
+        """Store a fact, replacing any fact with the same id; returns the replaced fact."""
+        fact_id = str(f.get("id"))
+        with self._lock:
+            old = self.remove(fact_id)
+            self._facts[fact_id] = f
+            for index, key in self._keys(f):
+                self._link(index, key, fact_id)
+            self._claim_sources.setdefault((f.get("subject"), f.get("predicate")), Counter())[f.get("source_url")] += 1
+            self.text.add(fact_id, fact_text(f))
+            return old
+
+    def remove(self, fact_id: str) -> Optional[Fact]:
+        with self._lock:
+            f = self._facts.pop(fact_id, None)
+            if f is None:
+                return None
+            for index, key in self._keys(f):
+                self._unlink(index, key, fact_id)
+            claim = (f.get("subject"), f.get("predicate"))
+            sources = self._claim_sources[claim]
+            sources[f.get("source_url")] -= 1
+            if sources[f.get("source_url")] <= 0:
+                del sources[f.get("source_url")]
+                if not sources:
+                    del self._claim_sources[claim]
+            self.text.remove(fact_id)
+            return f
+
+    def corroboration_count(self, subject: Any, predicate: Any) -> int:
+        """Number of unique source_urls with a fact for (subject, predicate)."""
+        return len(self._claim_sources.get((subject, predicate), ()))
+
+    def _lookup(self, index: Dict[Any, Dict[str, None]], key: Hashable, limit: Optional[int]) -> List[Fact]:
+        with self._lock:
+            ids = list(index.get(key, ()))
+            if limit is not None:
+                ids = ids[:limit]
+            return [self._facts[i] for i in ids]
+
+    def by_subject(self, subject: Any, limit: Optional[int] = None) -> List[Fact]:
+        return self._lookup(self._by_subject, subject, limit)
+
+    def by_object(self, obj: Any, limit: Optional[int] = None) -> List[Fact]:
+        return self._lookup(self._by_object, obj, limit)
+
+    def by_subject_predicate(self, subject: Any, predicate: Any, limit: Optional[int] = None) -> List[Fact]:
+        return self._lookup(self._by_subject_predicate, (subject, predicate), limit)
+
+    def by_source(self, source_url: Any, limit: Optional[int] = None) -> List[Fact]:
+        return self._lookup(self._by_source, source_url, limit)
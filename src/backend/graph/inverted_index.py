@@ -0,0 +1,160 @@
+"""
+Incremental inverted index with BM25 scoring straight from postings.
+
+Documents are added/replaced/removed one at a time (GraphClient.upsert_fact
+calls add), and a query only touches the postings of its own terms, so its
+cost scales with the number of matching postings rather than the number of
+stored facts.
+
+Term matching (match_terms/docs_with) is by word prefix: "learn" finds
+"learning" and "neural net" finds "neural networks", close to the substring
+matching of the Neo4j CONTAINS fallback. A sorted vocabulary turns each
+query token into the range of indexed terms that start with it. BM25
+scoring stays on exact tokens.
+"""
+
+import bisect
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens."""
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+class InvertedIndex:
+    """
+    Term -> {doc_id: term frequency} postings plus per-document lengths.
+
+    BM25 uses the Okapi term-frequency saturation with k1/b like rank_bm25's
+    BM25Okapi, and the always-positive log(1 + ...) idf so that very common
+    terms never contribute negative scores.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_len: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._vocab: List[str] = []  # sorted postings keys, for prefix lookups
+        self._total_len = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_len
+
+    @property
+    def avgdl(self) -> float:
+        return self._total_len / len(self.doc_len) if self.doc_len else 0.0
+
+    def add(self, doc_id: str, text: str):
+        """Index a document, replacing any previous version with the same id."""
+        tf = Counter(tokenize(text))
+        with self._lock:
+            self.remove(doc_id)
+            for term, n in tf.items():
+                plist = self.postings.get(term)
+                if plist is None:
+                    plist = self.postings[term] = {}
+                    bisect.insort(self._vocab, term)
+                plist[doc_id] = n
+            self._doc_terms[doc_id] = tf
+            length = sum(tf.values())
+            self.doc_len[doc_id] = length
+            self._total_len += length
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            tf = self._doc_terms.pop(doc_id, None)
+            if tf is None:
+                return
+            for term in tf:
+                plist = self.postings.get(term)
+                if plist is not None:
+                    plist.pop(doc_id, None)
+                    if not plist:
+                        del self.postings[term]
+                        del self._vocab[bisect.bisect_left(self._vocab, term)]
+            self._total_len -= self.doc_len.pop(doc_id, 0)
+
+    def terms_with_prefix(self, prefix: str) -> List[str]:
+        """Indexed terms starting with prefix."""
+        with self._lock:
+            start = bisect.bisect_left(self._vocab, prefix)
+            end = start
+            while end < len(self._vocab) and self._vocab[end].startswith(prefix):
+                end += 1
+            return self._vocab[start:end]
+
+    def _docs_with_prefix(self, token: str) -> Set[str]:
+        out: Set[str] = set()
+        for term in self.terms_with_prefix(token):
+            out.update(self.postings[term])
+        return out
+
+    def docs_with(self, term: str) -> Set[str]:
+        """Documents with a word starting with each token of a (possibly multi-token) term."""
+        tokens = tokenize(term)
+        if not tokens:
+            return set()
+        with self._lock:
+            out: Optional[Set[str]] = None
+            for token in tokens:
+                docs = self._docs_with_prefix(token)
+                out = docs if out is None else out & docs
+                if not out:
+                    return set()
+            return out or set()
+
+    def match_terms(self, terms: Iterable[str]) -> Dict[str, int]:
+        """Map doc_id -> number of query terms it contains (docs with zero hits are omitted)."""
+        hits: Dict[str, int] = {}
+        for term in terms:
+            for doc_id in self.docs_with(term):
+                hits[doc_id] = hits.get(doc_id, 0) + 1
+        return hits
+
+    def idf(self, term: str) -> float:
+        n = len(self.postings.get(term, ()))
+        N = len(self.doc_len)
+        return math.log(1.0 + (N - n + 0.5) / (n + 0.5))
+
+    def bm25(self, query: str, doc_ids: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        BM25 scores for documents matching the query.
+
+        Args:
+            query: Free-text query (tokenized like the documents)
+            doc_ids: Optional restriction; scores are only computed for these
+
+        Returns:
+            doc_id -> score for documents with at least one matching term
+        """
+        restrict = set(doc_ids) if doc_ids is not None else None
+        scores: Dict[str, float] = {}
+        with self._lock:
+            avgdl = self.avgdl or 1.0
+            for term in set(tokenize(query)):
+                plist = self.postings.get(term)
+                if not plist:
+                    continue
+                idf = self.idf(term)
+                if restrict is not None and len(restrict) < len(plist):
+                    items = ((d, plist[d]) for d in restrict if d in plist)
+                else:
+                    items = ((d, n) for d, n in plist.items() if restrict is None or d in restrict)
+                for doc_id, tf in items:
+                    dl = self.doc_len[doc_id]
+                    denom = tf + self.k1 * (1.0 - self.b + self.b * dl / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / denom
+        return scores
@@ -0,0 +1,202 @@
+"""
+Durable storage for the memory-mode graph (GraphClient without Neo4j).
+
+Two files live in the configured directory:
+- wal.log        append-only write-ahead log of fact upserts and alias registrations
+- snapshot.bin   compacted state: every alias and every stored fact
+
+Both files share one record framing:
+
+    tag (1 byte) | payload length (uint32) | crc32 of payload (uint32) | payload
+
+The tag is b"F" for a list of facts or b"A" for a list of [alias_key,
+canonical] pairs. The payload is compact UTF-8 JSON. The snapshot starts
+with an 8-byte magic.
+
+Loading reads the snapshot, then replays the WAL. Both files are read
+through mmap, and records are decoded in place. A torn or corrupt record
+at the end of the WAL (a crash mid-append) ends the replay, and the file
+is truncated back to the last good record.
+
+Once the WAL grows past snapshot_bytes, the full state is written to
+snapshot.tmp, fsynced and renamed over snapshot.bin, and then the WAL is
+truncated. If a crash hits between the rename and the truncate, the old
+WAL is replayed over the new snapshot. That is harmless, because upserts
+and alias registrations are idempotent.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .fact_store import FactStore
+
+SNAPSHOT_MAGIC = b"GEOSNAP1"
+FACTS = b"F"
+ALIASES = b"A"
+_HEADER = struct.Struct("<cII")
+_SNAPSHOT_CHUNK = 1000  # facts per snapshot record
+
+
+def encode_record(tag: bytes, items: List[Any]) -> bytes:
+    payload = json.dumps(items, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    return _HEADER.pack(tag, len(payload), zlib.crc32(payload)) + payload
+
+
+def iter_records(buf: Any, offset: int = 0) -> Iterator[Tuple[bytes, List[Any], int]]:
+    """(tag, items, end_offset) for each intact record; stops at the first torn or corrupt one."""
+    size = len(buf)
+    while offset + _HEADER.size <= size:
+        tag, length, crc = _HEADER.unpack_from(buf, offset)
+        start = offset + _HEADER.size
+        end = start + length
+        if tag not in (FACTS, ALIASES) or end > size:
+            return
+        payload = buf[start:end]
+        if zlib.crc32(payload) != crc:
+            return
+        try:
+            items = json.loads(bytes(payload).decode("utf-8"))
+        except ValueError:
+            return
+        yield tag, items, end
+        offset = end
+
+
+def _apply(tag: bytes, items: List[Any], store: FactStore, aliases: Dict[str, str]):
+    if tag == FACTS:
+        for f in items:
+            store.upsert(f)
+    else:
+        for key, canonical in items:
+            aliases[key] = canonical
+
+
+def _replay(path: str, store: FactStore, aliases: Dict[str, str], offset: int = 0) -> Tuple[int, int]:
+    """Apply the records in a file; returns (records applied, offset after the last good record)."""
+    if not os.path.exists(path) or os.path.getsize(path) <= offset:
+        return 0, offset
+    count, end = 0, offset
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        for tag, items, end in iter_records(buf, offset):
+            _apply(tag, items, store, aliases)
+            count += 1
+    return count, end
+
+
+class GraphPersistence:
+    """
+    WAL + snapshot for one FactStore and its alias map.
+
+    One writer per directory. The owner applies each change to the store
+    first, then logs it here. snapshot_bytes=0 disables automatic compaction.
+    """
+
+    def __init__(self, directory: str, snapshot_bytes: int = 64 * 1024 * 1024, fsync: bool = False):
+        self.directory = directory
+        self.snapshot_bytes = snapshot_bytes
+        self.fsync = fsync
+        self._wal: Optional[Any] = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def wal_path(self) -> str:
+        return os.path.join(self.directory, "wal.log")
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, "snapshot.bin")
+
+    def load(self, store: FactStore, aliases: Dict[str, str]) -> int:
+        """Restore the snapshot and replay the WAL into store/aliases; returns the fact count."""
+        with self._lock:
+            try:
+                if os.path.exists(self.snapshot_path):
+                    with open(self.snapshot_path, "rb") as fh:
+                        magic = fh.read(len(SNAPSHOT_MAGIC))
+                    if magic == SNAPSHOT_MAGIC:
+                        _replay(self.snapshot_path, store, aliases, len(SNAPSHOT_MAGIC))
+                    else:
+                        print(f"[GraphPersistence] Ignoring {self.snapshot_path}: bad header")
+                replayed, end = _replay(self.wal_path, store, aliases)
+                if os.path.exists(self.wal_path) and os.path.getsize(self.wal_path) > end:
+                    print(f"[GraphPersistence] Truncating torn WAL tail at byte {end}")
+                    with open(self.wal_path, "r+b") as fh:
+                        fh.truncate(end)
+            except Exception as e:
+                print(f"[GraphPersistence] Could not load {self.directory} ({e}), starting empty")
+                return len(store)
+            print(f"[GraphPersistence] Loaded {len(store)} facts, {len(aliases)} aliases ({replayed} WAL records)")
+            return len(store)
+
+    def _append(self, record: bytes):
+        if self._wal is None:
+            self._wal = open(self.wal_path, "ab")
+        self._wal.write(record)
+        self._wal.flush()
+        if self.fsync:
+            os.fsync(self._wal.fileno())
+
+    def log_facts(self, facts: List[Dict[str, Any]], store: FactStore, aliases: Dict[str, str]):
+        """Append an upsert record, compacting first if the WAL is over snapshot_bytes."""
+        if facts:
+            with self._lock:
+                self._append(encode_record(FACTS, facts))
+                self._maybe_compact(store, aliases)
+
+    def log_aliases(self, pairs: List[Tuple[str, str]], store: FactStore, aliases: Dict[str, str]):
+        if pairs:
+            with self._lock:
+                self._append(encode_record(ALIASES, [list(p) for p in pairs]))
+                self._maybe_compact(store, aliases)
+
+    def wal_size(self) -> int:
+        return os.path.getsize(self.wal_path) if os.path.exists(self.wal_path) else 0
+
+    def _maybe_compact(self, store: FactStore, aliases: Dict[str, str]):
+        if self.snapshot_bytes > 0 and self.wal_size() >= self.snapshot_bytes:
+            self._compact(store, aliases)
+
+    def snapshot(self, store: FactStore, aliases: Dict[str, str]):
+        """Write a compacted snapshot of the current state and reset the WAL."""
+        with self._lock:
+            self._compact(store, aliases)
+
+    def _compact(self, store: FactStore, aliases: Dict[str, str]):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(SNAPSHOT_MAGIC)
+            fh.write(encode_record(ALIASES, [[k, v] for k, v in list(aliases.items())]))
+            for chunk in _chunks(store, _SNAPSHOT_CHUNK):
+                fh.write(encode_record(FACTS, chunk))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.snapshot_path)
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        with open(self.wal_path, "wb"):
+            pass
+        print(f"[GraphPersistence] Snapshot written: {len(store)} facts, {len(aliases)} aliases")
+
+    def close(self):
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+
+
+def _chunks(facts: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for f in facts:
+        chunk.append(f)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,353 @@
+"""
+Approximate nearest-neighbour index over fact embeddings (IVF-flat, NumPy).
+
+Vectors are L2-normalized, so inner product == cosine similarity.
+
+- Below `train_threshold` vectors the index is an exact flat scan.
+- Above it, spherical k-means picks `nlist` centroids; every vector lives in
+  the inverted list of its nearest centroid and a query only scans the
+  `nprobe` closest lists.
+- add() starts (re)training on a background thread once the index reaches
+  train_threshold or 4x its last trained size. K-means and the new
+  inverted lists are built without the lock, so searches and upserts keep
+  using the current layout; rows written meanwhile are re-assigned when
+  the new layout is swapped in.
+- add() replaces an existing id in place; remove() is swap-with-last, so
+  deletes are O(1) and the matrix stays dense.
+- save()/load() write plain .npy files plus an id list, so a reload is a few
+  sequential reads instead of re-encoding every fact.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+def _l2_normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+class IVFFlatIndex:
+    """
+    IVF-flat index keyed by string ids.
+
+    Args:
+        nprobe: Number of inverted lists scanned per query
+        train_threshold: Size at which the flat index is first clustered
+        nlist: Number of centroids (default: ~sqrt(n) at training time)
+    """
+
+    def __init__(self, nprobe: int = 8, train_threshold: int = 4096, nlist: Optional[int] = None, seed: int = 0):
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.nlist = nlist
+        self.seed = seed
+        self.dim: Optional[int] = None
+        self._vecs = np.zeros((0, 0), dtype=np.float32)
+        self._ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[Set[int]] = []
+        self._trained_size = 0
+        self._dirty: Optional[Set[int]] = None  # rows written while train() runs
+        self._training: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._row
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    # -- storage -------------------------------------------------------------
+
+    def _reserve(self, n: int):
+        cap = self._vecs.shape[0]
+        if n <= cap:
+            return
+        new_cap = max(n, cap * 2, 256)
+        grown = np.zeros((new_cap, self.dim or 0), dtype=np.float32)
+        grown[: len(self._ids)] = self._vecs[: len(self._ids)]
+        self._vecs = grown
+        assign = np.full(new_cap, -1, dtype=np.int32)
+        assign[: len(self._ids)] = self._assign[: len(self._ids)]
+        self._assign = assign
+
+    def _nearest_centroid(self, vecs: np.ndarray) -> np.ndarray:
+        assert self._centroids is not None
+        return np.argmax(vecs @ self._centroids.T, axis=1).astype(np.int32)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert or replace vectors for the given ids."""
+        vectors = _l2_normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+        if not len(ids):
+            return
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._vecs = np.zeros((0, self.dim), dtype=np.float32)
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dim {self.dim}, got {vectors.shape[1]}")
+            lists = self._nearest_centroid(vectors) if self.is_trained else None
+            for i, item_id in enumerate(ids):
+                row = self._row.get(item_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._reserve(row + 1)
+                    self._ids.append(item_id)
+                    self._row[item_id] = row
+                elif self.is_trained:
+                    self._lists[self._assign[row]].discard(row)
+                self._vecs[row] = vectors[i]
+                if self._dirty is not None:
+                    self._dirty.add(row)
+                if lists is not None:
+                    self._assign[row] = lists[i]
+                    self._lists[lists[i]].add(row)
+            n = len(self._ids)
+            if n >= self.train_threshold and (not self.is_trained or n >= 4 * self._trained_size) and self._training is None:
+                self._training = threading.Thread(target=self._train_in_background, daemon=True, name="geo-ivf-train")
+                self._training.start()
+
+    def remove(self, item_id: str) -> bool:
+        with self._lock:
+            row = self._row.pop(item_id, None)
+            if row is None:
+                return False
+            last = len(self._ids) - 1
+            if self.is_trained:
+                self._lists[self._assign[row]].discard(row)
+            if row != last:
+                moved = self._ids[last]
+                self._vecs[row] = self._vecs[last]
+                if self._dirty is not None:
+                    self._dirty.add(row)
+                self._ids[row] = moved
+                self._row[moved] = row
+                if self.is_trained:
+                    lst = self._assign[last]
+                    self._lists[lst].discard(last)
+                    self._lists[lst].add(row)
+                    self._assign[row] = lst
+            self._ids.pop()
+            self._assign[last] = -1
+            return True
+
+    # -- clustering ------------------------------------------------------------
+
+    def _train_in_background(self):
+        try:
+            self.train()
+        except Exception as e:
+            print(f"[VectorIndex] Training failed: {e}")
+        finally:
+            with self._lock:
+                self._training = None
+
+    def wait_for_training(self, timeout: Optional[float] = None) -> bool:
+        """Block until a background retrain finishes; False if it is still running."""
+        thread = self._training
+        if thread is not None:
+            thread.join(timeout)
+        return self._training is None
+
+    def train(self, iterations: int = 10, sample_size: int = 50000):
+        """
+        (Re)cluster the stored vectors with spherical k-means.
+
+        The lock is only held to snapshot the row count and to swap in the
+        result. Rows added, replaced or moved in between are tracked and
+        assigned to the new centroids at the swap. Returns at once if
+        another train() is running.
+        """
+        with self._lock:
+            n = len(self._ids)
+            if n == 0 or self._dirty is not None:
+                return
+            # Rows below n are only rewritten by add()/remove(), which mark them dirty
+            data = self._vecs[:n]
+            self._dirty = set()
+        try:
+            nlist = self.nlist or max(1, int(np.sqrt(n)))
+            nlist = min(nlist, n)
+            rng = np.random.default_rng(self.seed)
+            sample = data[rng.choice(n, size=min(n, sample_size), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+            for _ in range(iterations):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assign, sample)
+                counts = np.bincount(assign, minlength=nlist)
+                empty = counts == 0
+                sums[empty] = centroids[empty]  # keep empty clusters where they were
+                centroids = _l2_normalize(sums)
+            centroids = centroids.astype(np.float32)
+            assign = np.argmax(data @ centroids.T, axis=1).astype(np.int32)
+            lists: List[Set[int]] = [set() for _ in range(nlist)]
+            for row, lst in enumerate(assign):
+                lists[lst].add(row)
+
+            with self._lock:
+                current = len(self._ids)
+                for row in range(current, n):  # removed meanwhile
+                    lists[assign[row]].discard(row)
+                dirty = sorted(r for r in self._dirty if r < current)
+                for row in dirty:
+                    if row < n:
+                        lists[assign[row]].discard(row)
+                self._centroids = centroids
+                kept = min(current, n)
+                self._assign[:kept] = assign[:kept]
+                if dirty:
+                    for row, lst in zip(dirty, self._nearest_centroid(self._vecs[dirty])):
+                        self._assign[row] = lst
+                        lists[lst].add(row)
+                self._lists = lists
+                self._trained_size = n
+        finally:
+            with self._lock:
+                self._dirty = None
+
+    # -- queries ---------------------------------------------------------------
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to k (id, cosine similarity) pairs, best first."""
+        with self._lock:
+            n = len(self._ids)
+            if n == 0 or k <= 0:
+                return []
+            q = _l2_normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+            if self.is_trained:
+                assert self._centroids is not None
+                probes = min(self.nprobe, len(self._centroids))
+                centroid_sims = self._centroids @ q
+                nearest = np.argpartition(-centroid_sims, probes - 1)[:probes]
+                rows = np.fromiter(
+                    (r for lst in nearest for r in self._lists[lst]),
+                    dtype=np.int64,
+                )
+            else:
+                rows = np.arange(n)
+            if rows.size == 0:
+                return []
+            sims = self._vecs[rows] @ q
+            top = min(k, rows.size)
+            best = np.argpartition(-sims, top - 1)[:top]
+            best = best[np.argsort(-sims[best])]
+            return [(self._ids[rows[i]], float(sims[i])) for i in best]
+
+    # -- persistence -----------------------------------------------------------
+
+    def save(self, directory: str):
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            n = len(self._ids)
+            np.save(os.path.join(directory, "vectors.npy"), self._vecs[:n])
+            np.save(os.path.join(directory, "assign.npy"), self._assign[:n])
+            if self._centroids is not None:
+                np.save(os.path.join(directory, "centroids.npy"), self._centroids)
+            elif os.path.exists(os.path.join(directory, "centroids.npy")):
+                os.remove(os.path.join(directory, "centroids.npy"))
+            with open(os.path.join(directory, "ids.json"), "w") as fh:
+                json.dump({"ids": self._ids, "dim": self.dim, "trained_size": self._trained_size}, fh)
+
+    @classmethod
+    def load(cls, directory: str, **kwargs) -> "IVFFlatIndex":
+        index = cls(**kwargs)
+        with open(os.path.join(directory, "ids.json"), "r") as fh:
+            meta = json.load(fh)
+        index.dim = meta.get("dim")
+        index._ids = list(meta["ids"])
+        index._row = {item_id: i for i, item_id in enumerate(index._ids)}
+        index._vecs = np.load(os.path.join(directory, "vectors.npy")).astype(np.float32, copy=False)
+        index._assign = np.load(os.path.join(directory, "assign.npy")).astype(np.int32, copy=False)
+        index._trained_size = int(meta.get("trained_size", 0))
+        centroids_path = os.path.join(directory, "centroids.npy")
+        if os.path.exists(centroids_path):
+            index._centroids = np.load(centroids_path).astype(np.float32, copy=False)
+            index._lists = [set() for _ in range(len(index._centroids))]
+            for row, lst in enumerate(index._assign):
+                index._lists[lst].add(row)
+        return index
+
+
+class FactVectorIndex:
+    """
+    IVF index over stored facts, fed by GraphClient.upsert_fact.
+
+    Args:
+        encode: Maps a list of fact texts to an (n, dim) embedding matrix
+        path: Directory for save()/load(); None keeps the index in memory only
+    """
+
+    def __init__(self, encode: Callable[[List[str]], Any], path: Optional[str] = None, nprobe: int = 8, train_threshold: int = 4096):
+        self.encode = encode
+        self.path = path
+        self.index = IVFFlatIndex(nprobe=nprobe, train_threshold=train_threshold)
+        if path and os.path.exists(os.path.join(path, "ids.json")):
+            try:
+                self.index = IVFFlatIndex.load(path, nprobe=nprobe, train_threshold=train_threshold)
+                print(f"[VectorIndex] Loaded {len(self.index)} vectors from {path}")
+            except Exception as e:
+                print(f"[VectorIndex] Could not load {path} ({e}), starting empty")
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, fact_id: str) -> bool:
+        return str(fact_id) in self.index
+
+    @staticmethod
+    def fact_text(f: Dict[str, Any]) -> str:
+        return f"{str(f.get('subject', '')).strip()} {str(f.get('predicate', '')).strip()} {str(f.get('object', '')).strip()}"
+
+    def upsert(self, facts: List[Dict[str, Any]]):
+        facts = [f for f in facts if f.get("id") is not None]
+        if not facts:
+            return
+        vectors = np.asarray(self.encode([self.fact_text(f) for f in facts]), dtype=np.float32)
+        self.index.add([str(f["id"]) for f in facts], vectors)
+
+    def _add_missing(self, facts: List[Dict[str, Any]]) -> int:
+        vectors = np.asarray(self.encode([self.fact_text(f) for f in facts]), dtype=np.float32)
+        with self.index._lock:
+            # A concurrent upsert_fact may have indexed a newer version meanwhile; keep it
+            keep = [i for i, f in enumerate(facts) if str(f["id"]) not in self.index]
+            if keep:
+                self.index.add([str(facts[i]["id"]) for i in keep], vectors[keep])
+        return len(keep)
+
+    def backfill(self, facts: Iterable[Dict[str, Any]], batch_size: int = 256) -> int:
+        """Index the facts whose ids are not indexed yet, batch_size per encode call."""
+        added = 0
+        batch: List[Dict[str, Any]] = []
+        for f in facts:
+            if f.get("id") is None or str(f["id"]) in self.index:
+                continue
+            batch.append(f)
+            if len(batch) >= batch_size:
+                added += self._add_missing(batch)
+                batch = []
+        if batch:
+            added += self._add_missing(batch)
+        return added
+
+    def remove(self, fact_id: str):
+        self.index.remove(str(fact_id))
+
+    def search(self, query_vec: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        return self.index.search(query_vec, k)
+
+    def save(self):
+        if self.path:
+            self.index.save(self.path)
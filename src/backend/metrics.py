@@ -96,6 +96,47 @@ deduplication_checks = Counter(
     ['result']  # duplicate, unique
 )
 
+# Search provider circuit breakers
+search_breaker_state = Gauge(
+    'geo_search_breaker_state',
+    'Circuit breaker state per search provider (0=closed, 1=half_open, 2=open)',
+    ['provider']
+)
+
+search_breaker_transitions = Counter(
+    'geo_search_breaker_transitions_total',
+    'Circuit breaker state transitions',
+    ['provider', 'from_state', 'to_state']
+)
+
+search_breaker_rejections = Counter(
+    'geo_search_breaker_rejections_total',
+    'Search calls rejected by an open circuit breaker',
+    ['provider']
+)
+
+search_provider_timeout = Gauge(
+    'geo_search_provider_timeout_seconds',
+    'Current adaptive request timeout per search provider',
+    ['provider']
+)
+
+BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+# Outbound search scheduler (per-host token buckets)
+search_queue_wait = Histogram(
+    'geo_search_queue_wait_seconds',
+    'Time a search request waited for its host rate limit',
+    ['host', 'priority'],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+search_queue_timeouts = Counter(
+    'geo_search_queue_timeouts_total',
+    'Search requests dropped after waiting too long for their host rate limit',
+    ['host', 'priority']
+)
+
 def track_request(method: str, endpoint: str, status: int):
     """Track HTTP request metrics."""
     request_count.labels(method=method, endpoint=endpoint, status=status).inc()
@@ -116,12 +157,33 @@ def track_facts_retrieved(count: int):
     """Track number of facts retrieved."""
     rag_facts_retrieved.observe(count)
 
-def track_cache(cache_type: str, hit: bool):
+def track_cache(cache_type: str, hit: bool, count: int = 1):
     """Track cache hit/miss."""
+    if count <= 0:
+        return
     if hit:
-        cache_hits.labels(cache_type=cache_type).inc()
+        cache_hits.labels(cache_type=cache_type).inc(count)
     else:
-        cache_misses.labels(cache_type=cache_type).inc()
+        cache_misses.labels(cache_type=cache_type).inc(count)
+
+def track_breaker_transition(provider: str, from_state: str, to_state: str):
+    """Track a circuit breaker state change."""
+    search_breaker_state.labels(provider=provider).set(BREAKER_STATE_VALUES.get(to_state, 0))
+    search_breaker_transitions.labels(provider=provider, from_state=from_state, to_state=to_state).inc()
+
+def track_breaker_rejection(provider: str):
+    """Track a call short-circuited by an open breaker."""
+    search_breaker_rejections.labels(provider=provider).inc()
+
+def track_provider_timeout(provider: str, seconds: float):
+    """Track the adaptive timeout in use for a provider."""
+    search_provider_timeout.labels(provider=provider).set(seconds)
+
+def track_queue_wait(host: str, priority: str, seconds: float, admitted: bool = True):
+    """Track time spent queued for a host's rate limit."""
+    search_queue_wait.labels(host=host, priority=priority).observe(seconds)
+    if not admitted:
+        search_queue_timeouts.labels(host=host, priority=priority).inc()
 
 def metrics_endpoint():
     """Generate Prometheus metrics endpoint response."""
@@ -0,0 +1,169 @@
+"""
+Semantic answer cache.
+
+Answers are keyed by the query embedding: a new query is served from cache
+when it lies within a configurable cosine distance of a cached one. TTLs
+depend on recency (queries asking for the "latest" expire quickly, evergreen
+ones live longer), the cache is size-bounded with LRU eviction, and expired
+entries can be served stale while a single background refresh runs.
+"""
+
+import copy
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+@dataclass
+class CachedAnswer:
+    """A cached answer plus the facts it cites."""
+    query: str
+    scope: Hashable
+    answer: str
+    facts: List[Dict[str, Any]]
+    embedding: np.ndarray
+    ttl: float
+    created: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    refreshing: bool = False
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.created
+
+    def copy_facts(self) -> List[Dict[str, Any]]:
+        return copy.deepcopy(self.facts)
+
+
+class SemanticAnswerCache:
+    """
+    Nearest-neighbour lookup over cached query embeddings.
+
+    Embeddings are expected to be L2-normalized, so cosine distance is
+    1 - dot product.
+    """
+
+    def __init__(
+        self,
+        max_distance: float = 0.08,
+        ttl_recent: float = 600.0,
+        ttl_evergreen: float = 86400.0,
+        max_entries: int = 2048,
+        stale_seconds: float = 300.0,
+    ):
+        self.max_distance = max_distance
+        self.ttl_recent = ttl_recent
+        self.ttl_evergreen = ttl_evergreen
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self._entries: List[CachedAnswer] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _state(self, entry: CachedAnswer, now: float) -> str:
+        age = entry.age(now)
+        if age <= entry.ttl:
+            return FRESH
+        if age <= entry.ttl + self.stale_seconds:
+            return STALE
+        return MISS
+
+    def _nearest(self, embedding: np.ndarray, scope: Hashable) -> Tuple[Optional[int], float]:
+        """Index and distance of the closest entry with the same scope (lock held)."""
+        if not self._entries:
+            return None, 1.0
+        if self._matrix is None:
+            self._matrix = np.vstack([e.embedding for e in self._entries])
+        sims = self._matrix @ np.asarray(embedding, dtype=np.float32)
+        for i, e in enumerate(self._entries):
+            if e.scope != scope:
+                sims[i] = -np.inf
+        best = int(np.argmax(sims))
+        if not np.isfinite(sims[best]):
+            return None, 1.0
+        return best, float(1.0 - sims[best])
+
+    def _remove(self, idx: int):
+        del self._entries[idx]
+        self._matrix = None
+
+    def lookup(self, embedding: np.ndarray, scope: Hashable = None) -> Tuple[Optional[CachedAnswer], str]:
+        """
+        Find a cached answer for a query embedding.
+
+        Args:
+            embedding: L2-normalized query embedding
+            scope: Request options the answer depends on (e.g. k); only
+                entries stored with an equal scope can match
+
+        Returns:
+            (entry, state) where state is "fresh", "stale" or "miss".
+        """
+        now = time.time()
+        with self._lock:
+            idx, dist = self._nearest(embedding, scope)
+            if idx is None or dist > self.max_distance:
+                return None, MISS
+            entry = self._entries[idx]
+            state = self._state(entry, now)
+            if state == MISS:
+                self._remove(idx)
+                return None, MISS
+            entry.last_access = now
+            return entry, state
+
+    def claim_refresh(self, entry: CachedAnswer) -> bool:
+        """Mark a stale entry as refreshing; only the first caller wins."""
+        with self._lock:
+            if entry.refreshing:
+                return False
+            entry.refreshing = True
+            return True
+
+    def store(
+        self,
+        query: str,
+        scope: Hashable,
+        embedding: np.ndarray,
+        answer: str,
+        facts: List[Dict[str, Any]],
+        recent: bool = False,
+    ) -> CachedAnswer:
+        """Insert or replace the answer for a query (and its near-duplicates)."""
+        entry = CachedAnswer(
+            query=query,
+            scope=scope,
+            answer=answer,
+            facts=copy.deepcopy(facts),
+            embedding=np.asarray(embedding, dtype=np.float32),
+            ttl=self.ttl_recent if recent else self.ttl_evergreen,
+        )
+        now = time.time()
+        with self._lock:
+            idx, dist = self._nearest(entry.embedding, scope)
+            if idx is not None and dist <= self.max_distance:
+                self._remove(idx)
+            # Drop entries that are past their stale window
+            expired = [i for i, e in enumerate(self._entries) if self._state(e, now) == MISS]
+            for i in reversed(expired):
+                self._remove(i)
+            while len(self._entries) >= self.max_entries:
+                lru = min(range(len(self._entries)), key=lambda i: self._entries[i].last_access)
+                self._remove(lru)
+            self._entries.append(entry)
+            self._matrix = None
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries = []
+            self._matrix = None
@@ -0,0 +1,207 @@
+"""
+Cross-request micro-batching for model inference.
+
+Under concurrency every request would otherwise run its own small
+CrossEncoder.predict / SentenceTransformer.encode call, and those calls
+compete for the same CPU cores. A MicroBatcher collects work from concurrent
+callers for a few milliseconds (or until the batch is full), runs one batched
+call on a single worker thread, and routes each slice of the output back to
+the caller that submitted it.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class _Pending:
+    """One caller's slice of a batch."""
+    __slots__ = ("items", "done", "result", "error")
+
+    def __init__(self, items: Sequence[Any]):
+        self.items = items
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent calls of a batch function.
+
+    Args:
+        fn: Takes a list of items and returns an array-like with one row per item
+        max_batch_size: Dispatch as soon as this many items are queued
+        max_wait_ms: Longest a queued item waits for others to join its batch
+        name: Used for the worker thread name and log lines
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], Any], max_batch_size: int = 64, max_wait_ms: float = 3.0, name: str = "batcher"):
+        self.fn = fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches_run = 0
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._loop, daemon=True, name=f"geo-{self.name}")
+                    self._worker.start()
+
+    def submit(self, items: Sequence[Any]) -> Any:
+        """Run fn over items as part of a shared batch and return this caller's rows."""
+        if not items:
+            return self.fn([])
+        pending = _Pending(list(items))
+        self._ensure_worker()
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def close(self):
+        """Stop the worker thread once queued work has drained."""
+        self._queue.put(None)
+
+    def _collect(self) -> Optional[List[_Pending]]:
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        size = len(first.items)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                nxt = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if nxt is None:
+                self._queue.put(None)  # re-queue the stop marker for the next round
+                break
+            batch.append(nxt)
+            size += len(nxt.items)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            flat: List[Any] = []
+            for p in batch:
+                flat.extend(p.items)
+            try:
+                out = self.fn(flat)
+                self.batches_run += 1
+                offset = 0
+                for p in batch:
+                    p.result = out[offset: offset + len(p.items)]
+                    offset += len(p.items)
+            except BaseException as e:  # deliver the failure to every caller
+                for p in batch:
+                    p.error = e
+            finally:
+                for p in batch:
+                    p.done.set()
+
+
+class BatchedReranker:
+    """Drop-in for CrossEncoder.predict that batches across requests."""
+
+    def __init__(self, model: Any, max_batch_size: int = 64, max_wait_ms: float = 3.0):
+        self.model = model
+        self._batcher = MicroBatcher(
+            lambda pairs: np.asarray(model.predict(pairs, batch_size=max_batch_size)),
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            name="rerank-batcher",
+        )
+
+    def predict(self, pairs: Sequence[Any], **kwargs) -> np.ndarray:
+        return np.asarray(self._batcher.submit(list(pairs)))
+
+    def close(self):
+        self._batcher.close()
+
+
+class BatchedEmbedder:
+    """Drop-in for SentenceTransformer.encode that batches across requests."""
+
+    def __init__(self, model: Any, max_batch_size: int = 64, max_wait_ms: float = 3.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._batchers: Dict[bool, MicroBatcher] = {}
+        self._lock = threading.Lock()
+
+    def _batcher(self, normalize: bool) -> MicroBatcher:
+        with self._lock:
+            if normalize not in self._batchers:
+                self._batchers[normalize] = MicroBatcher(
+                    lambda texts: np.asarray(self.model.encode(texts, normalize_embeddings=normalize, batch_size=self.max_batch_size)),
+                    max_batch_size=self.max_batch_size,
+                    max_wait_ms=self.max_wait_ms,
+                    name="embed-batcher",
+                )
+            return self._batchers[normalize]
+
+    def encode(self, texts: Any, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        out = np.asarray(self._batcher(normalize_embeddings).submit([texts] if single else list(texts)))
+        return out[0] if single else out
+
+    def close(self):
+        with self._lock:
+            for b in self._batchers.values():
+                b.close()
+            self._batchers = {}
+
+
+# One shared service per loaded model instance, so every pipeline in the
+# process feeds the same batches.
+_services: Dict[int, Any] = {}
+_services_lock = threading.Lock()
+
+
+def _shared(model: Any, factory: Callable[..., Any]) -> Any:
+    from ..config import settings
+    with _services_lock:
+        svc = _services.get(id(model))
+        if svc is None or svc.model is not model:
+            svc = factory(
+                model,
+                max_batch_size=settings.inference_batch_max_size,
+                max_wait_ms=settings.inference_batch_max_wait_ms,
+            )
+            _services[id(model)] = svc
+        return svc
+
+
+def get_batched_reranker(model: Any) -> BatchedReranker:
+    """Shared batching service for a CrossEncoder instance."""
+    return _shared(model, BatchedReranker)
+
+
+def get_batched_embedder(model: Any) -> BatchedEmbedder:
+    """Shared batching service for a SentenceTransformer instance."""
+    return _shared(model, BatchedEmbedder)
+
+
+def release(model: Any):
+    """Forget the batching service for a model (e.g. after it is unloaded)."""
+    with _services_lock:
+        svc = _services.pop(id(model), None)
+    if svc is not None:
+        svc.close()
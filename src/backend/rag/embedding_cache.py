@@ -0,0 +1,234 @@
+"""
+Embedding cache for fact texts and queries.
+
+Two tiers:
+- An in-process LRU of recently used vectors
+- An optional disk tier: a memory-mapped float32 matrix plus an append-only
+  key file, so vectors survive restarts without re-encoding
+
+Keys are a hash of the model name and the normalized text, so switching
+models never returns stale vectors.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    from ..metrics import track_cache
+except Exception:
+    track_cache = None  # type: ignore
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and lowercase (the MiniLM tokenizers are uncased)."""
+    return " ".join(str(text or "").split()).lower()
+
+
+def cache_key(model_name: str, text: str) -> str:
+    """Stable key for a (model, text) pair."""
+    return hashlib.sha1(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class MmapEmbeddingStore:
+    """
+    Disk tier: vectors live in a preallocated float32 matrix opened with np.memmap.
+
+    Files (for prefix P):
+    - P.f32   row-major float32 matrix, capacity x dim
+    - P.keys  one hex key per line; line number == row number
+    - P.json  {"dim": ..., "capacity": ...}
+
+    Vectors are written before their key is appended, so a crash can only lose
+    the tail, never point a key at garbage. One writer per directory.
+    """
+
+    def __init__(self, prefix: str, initial_capacity: int = 1024):
+        self.prefix = prefix
+        self.initial_capacity = initial_capacity
+        self.dim: Optional[int] = None
+        self.capacity = 0
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def _matrix_path(self) -> str:
+        return f"{self.prefix}.f32"
+
+    @property
+    def _keys_path(self) -> str:
+        return f"{self.prefix}.keys"
+
+    @property
+    def _meta_path(self) -> str:
+        return f"{self.prefix}.json"
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        try:
+            with open(self._meta_path, "r") as fh:
+                meta = json.load(fh)
+            self.dim = int(meta["dim"])
+            self.capacity = int(meta["capacity"])
+            with open(self._keys_path, "r") as fh:
+                keys = [line.strip() for line in fh]
+            keys = [k for k in keys if k][: self.capacity]
+            self._rows = {k: i for i, k in enumerate(keys)}
+            self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+            print(f"[EmbeddingCache] Loaded {len(self._rows)} vectors from {self._matrix_path}")
+        except Exception as e:
+            print(f"[EmbeddingCache] Could not load disk tier ({e}), starting empty")
+            self.dim, self.capacity, self._rows, self._matrix = None, 0, {}, None
+
+    def _grow(self, needed: int):
+        new_capacity = max(self.initial_capacity, self.capacity * 2, needed)
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self._matrix_path, "ab") as fh:
+            fh.truncate(new_capacity * int(self.dim or 0) * 4)
+        self.capacity = new_capacity
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+        with open(self._meta_path, "w") as fh:
+            json.dump({"dim": self.dim, "capacity": self.capacity}, fh)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        if row is None or self._matrix is None:
+            return None
+        return np.array(self._matrix[row], dtype=np.float32)
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray):
+        with self._lock:
+            fresh = [(k, v) for k, v in zip(keys, vectors) if k not in self._rows]
+            if not fresh:
+                return
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+            elif int(vectors.shape[1]) != self.dim:
+                return
+            start = len(self._rows)
+            if start + len(fresh) > self.capacity:
+                self._grow(start + len(fresh))
+            assert self._matrix is not None
+            for offset, (_, vec) in enumerate(fresh):
+                self._matrix[start + offset] = vec
+            self._matrix.flush()
+            with open(self._keys_path, "a") as fh:
+                fh.write("".join(f"{k}\n" for k, _ in fresh))
+            for offset, (k, _) in enumerate(fresh):
+                self._rows[k] = start + offset
+
+
+class EmbeddingCache:
+    """
+    Cache in front of an encoder such as SentenceTransformer.encode.
+
+    Only texts that miss both tiers are sent to the encoder, in one batch.
+    Hits and misses are reported as geo_cache_hits_total/geo_cache_misses_total
+    with cache_type="embedding".
+    """
+
+    def __init__(self, model_name: str, max_entries: int = 20000, cache_dir: Optional[str] = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[MmapEmbeddingStore] = None
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                slug = "".join(c if c.isalnum() or c in "-_." else "_" for c in model_name)
+                self._disk = MmapEmbeddingStore(os.path.join(cache_dir, slug))
+            except Exception as e:
+                print(f"[EmbeddingCache] Disk tier disabled: {e}")
+                self._disk = None
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                return vec
+        if self._disk is not None:
+            vec = self._disk.get(key)
+            if vec is not None:
+                self._remember(key, vec)
+                return vec
+        return None
+
+    def _remember(self, key: str, vec: np.ndarray):
+        with self._lock:
+            self._lru[key] = vec
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def encode(
+        self,
+        encoder: Callable[..., np.ndarray],
+        texts: Union[str, List[str]],
+        normalize_embeddings: bool = True,
+    ) -> np.ndarray:
+        """
+        Encode texts through the cache.
+
+        Args:
+            encoder: Callable with the SentenceTransformer.encode signature
+            texts: A single string or a list of strings
+            normalize_embeddings: Passed through to the encoder
+
+        Returns:
+            1-D vector for a single string, otherwise a (len(texts), dim) matrix
+        """
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+        model_tag = self.model_name if normalize_embeddings else f"{self.model_name}:raw"
+        keys = [cache_key(model_tag, t) for t in items]
+
+        vectors: List[Optional[np.ndarray]] = [self._get(k) for k in keys]
+        missing = [i for i, v in enumerate(vectors) if v is None]
+
+        if track_cache is not None:
+            track_cache("embedding", True, len(items) - len(missing))
+            track_cache("embedding", False, len(missing))
+
+        if missing:
+            # Encode each distinct missing text once
+            unique: Dict[str, int] = {}
+            for i in missing:
+                unique.setdefault(keys[i], i)
+            fresh = np.asarray(
+                encoder([items[i] for i in unique.values()], normalize_embeddings=normalize_embeddings),
+                dtype=np.float32,
+            )
+            by_key = dict(zip(unique.keys(), fresh))
+            for key, vec in by_key.items():
+                self._remember(key, vec)
+            if self._disk is not None:
+                try:
+                    self._disk.put_many(list(by_key.keys()), fresh)
+                except Exception as e:
+                    print(f"[EmbeddingCache] Disk write failed: {e}")
+            for i in missing:
+                vectors[i] = by_key[keys[i]]
+
+        if single:
+            return vectors[0]  # type: ignore[return-value]
+        if not items:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vectors)  # type: ignore[arg-type]
@@ -0,0 +1,85 @@
+"""
+Score fusion for hybrid retrieval.
+
+Every ranking signal (source prior, BM25, embedding similarity) is a NumPy
+array aligned with the candidate list. Two strategies are available:
+
+- "weighted": per-signal min-max normalization, then a weighted sum. Raw BM25
+  scores are unbounded and vary from query to query; normalizing first keeps
+  the weights meaningful.
+- "rrf": reciprocal rank fusion, sum of w / (rrf_k + rank). Uses only ranks,
+  so it is insensitive to score scales altogether.
+
+top_k_indices uses argpartition, so selecting k of n candidates is O(n)
+rather than a full sort.
+"""
+
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+FUSION_STRATEGIES = ("weighted", "rrf")
+
+# Same relative weights the hand-written combo used (0.5*prev + 0.3*bm25 + 0.7*emb)
+DEFAULT_WEIGHTS: Dict[str, float] = {"prior": 0.5, "bm25": 0.3, "embedding": 0.7}
+
+
+def normalize_scores(scores: np.ndarray) -> np.ndarray:
+    """Min-max scale to [0, 1]; a constant signal carries no ranking information and maps to 0."""
+    x = np.asarray(scores, dtype=np.float64)
+    if x.size == 0:
+        return x
+    lo, hi = float(np.min(x)), float(np.max(x))
+    if hi - lo <= 1e-12:
+        return np.zeros_like(x)
+    return (x - lo) / (hi - lo)
+
+
+def weighted_fusion(signals: Mapping[str, np.ndarray], weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    weights = weights or DEFAULT_WEIGHTS
+    n = len(next(iter(signals.values()))) if signals else 0
+    fused = np.zeros(n, dtype=np.float64)
+    for name, scores in signals.items():
+        w = weights.get(name, 0.0)
+        if w:
+            fused += w * normalize_scores(scores)
+    return fused
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """0-based rank of each element, highest score first (ties broken by position)."""
+    order = np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return ranks
+
+
+def reciprocal_rank_fusion(signals: Mapping[str, np.ndarray], weights: Optional[Mapping[str, float]] = None, rrf_k: int = 60) -> np.ndarray:
+    n = len(next(iter(signals.values()))) if signals else 0
+    fused = np.zeros(n, dtype=np.float64)
+    for name, scores in signals.items():
+        w = 1.0 if weights is None else weights.get(name, 0.0)
+        if w:
+            fused += w / (rrf_k + 1.0 + _ranks(scores))
+    return fused
+
+
+def fuse(signals: Mapping[str, np.ndarray], strategy: str = "weighted", weights: Optional[Mapping[str, float]] = None, rrf_k: int = 60) -> np.ndarray:
+    """Combine aligned score arrays into one score per candidate."""
+    if strategy == "weighted":
+        return weighted_fusion(signals, weights)
+    if strategy == "rrf":
+        return reciprocal_rank_fusion(signals, weights, rrf_k)
+    raise ValueError(f"Unknown fusion strategy: {strategy!r} (expected one of {FUSION_STRATEGIES})")
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    x = np.asarray(scores, dtype=np.float64)
+    n = x.size
+    if n == 0 or k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-x, kind="stable")
+    part = np.argpartition(-x, k - 1)[:k]
+    return part[np.argsort(-x[part], kind="stable")]
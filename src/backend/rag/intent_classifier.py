@@ -0,0 +1,239 @@
+"""
+In-process conversational vs search classifier.
+
+A logistic regression over hashed word and character n-grams, trained at
+first use from the few-shot examples in the LLM classification prompt, the
+rule-based pattern lists and a set of typical search queries. Training takes
+a few milliseconds, and a prediction needs no network round trip.
+
+The training set is small, so the two directions are trusted differently.
+Sending a real question down the conversational path skips retrieval
+entirely. Search decisions are therefore accepted at the normal threshold,
+but conversational ones need a much higher cut-off; the held-out set in
+tests/test_intent_classifier.py keeps that cut-off honest. Anything in
+between goes to the LLM (or the rules), and only those answers are memoized
+per normalized query.
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Phrase lists used by RAGPipeline._rule_based_classification
+GREETINGS = ['hi', 'hello', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening', 'howdy', 'sup', "what's up", 'yo']
+APPRECIATIONS = ['thanks', 'thank you', 'thx', 'ty', 'appreciate it', 'awesome', 'great', 'cool', 'nice', 'perfect', 'excellent', 'amazing']
+CASUAL = ['how are you', 'how r u', 'wassup', 'whats good', 'hows it going', 'ok', 'okay']
+FAREWELLS = ['bye', 'goodbye', 'see you', 'later', 'cya', 'good night']
+ABOUT_ASSISTANT = [
+    'who are you', 'what are you', 'tell me about yourself', 'what can you do',
+    'your capabilities', 'introduce yourself', 'what do you do', 'what exactly do you do',
+    'how are you different', 'difference between you', 'whats the difference',
+    'compare yourself', 'why use you', 'what makes you special', 'how do you work'
+]
+
+# Few-shot examples shown to the LLM classifier: (message, is_conversational, label)
+PROMPT_EXAMPLES: List[Tuple[str, bool, str]] = [
+    ("Hi", True, "greeting"),
+    ("Thanks!", True, "appreciation"),
+    ("How are you?", True, "casual_chat"),
+    ("Who are you?", True, "about_assistant"),
+    ("Tell me about yourself", True, "about_assistant"),
+    ("What can you do?", True, "about_assistant"),
+    ("What is Python?", False, "search"),
+    ("How does photosynthesis work?", False, "search"),
+    ("Who is the president?", False, "search"),
+    ("Tell me about quantum physics", False, "search"),
+    ("Latest news on AI", False, "search"),
+]
+
+# Extra conversational phrasings (the pattern lists are mostly bare keywords)
+CONVERSATIONAL_EXAMPLES = [
+    "hi there", "hello there", "hey there", "hey how are you", "hello how are you doing",
+    "good morning to you", "thanks a lot", "thank you so much", "thanks for the help",
+    "that was helpful thanks", "great answer", "cool thanks", "nice one", "ok thanks",
+    "how is your day going", "how are you doing today", "what's going on", "nice to meet you",
+    "bye for now", "see you later", "talk to you later", "have a good night",
+    "who made you", "are you a bot", "what is your name", "can you help me",
+    "what are your features", "how are you better than google", "are you an ai",
+]
+
+SEARCH_EXAMPLES = [
+    "what is machine learning", "what is the capital of france", "what are black holes",
+    "how does a transformer model work", "how do vaccines work", "how to make sourdough bread",
+    "how to install python on windows", "who is the ceo of microsoft", "who wrote war and peace",
+    "who invented the telephone", "when did world war 2 end", "when is the next solar eclipse",
+    "where is mount everest", "why is the sky blue", "why do cats purr",
+    "latest research on quantum computing", "recent news about climate change",
+    "current price of bitcoin", "weather in london today", "best laptops for programming",
+    "compare react and vue", "difference between tcp and udp", "explain gradient descent",
+    "explain the theory of relativity", "tell me about the roman empire",
+    "tell me about large language models", "summarize the paper attention is all you need",
+    "benefits of intermittent fasting", "symptoms of vitamin d deficiency",
+    "population of tokyo", "history of the internet", "python list comprehension examples",
+    "rust vs go performance", "what happened in the stock market today",
+    "new papers on protein folding", "define entropy", "meaning of serendipity",
+    "how many moons does jupiter have", "is coffee bad for you", "can dogs eat grapes",
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(_TOKEN_RE.findall(str(text or "").lower()))
+
+
+def training_examples() -> List[Tuple[str, bool]]:
+    """(text, is_conversational) pairs the classifier is trained on."""
+    examples = [(text, conv) for text, conv, _ in PROMPT_EXAMPLES]
+    for patterns in (GREETINGS, APPRECIATIONS, CASUAL, FAREWELLS, ABOUT_ASSISTANT):
+        examples.extend((p, True) for p in patterns)
+    examples.extend((t, True) for t in CONVERSATIONAL_EXAMPLES)
+    examples.extend((t, False) for t in SEARCH_EXAMPLES)
+    return examples
+
+
+class HashedNgramClassifier:
+    """
+    Binary logistic regression over hashed n-gram features.
+
+    Features are word unigrams and bigrams, character trigrams and a query
+    length bucket. They are hashed with crc32 (stable across processes) into
+    a fixed number of buckets.
+    """
+
+    def __init__(self, n_features: int = 1 << 12, l2: float = 3e-4, epochs: int = 200, lr: float = 8.0):
+        self.n_features = n_features
+        self.l2 = l2
+        self.epochs = epochs
+        self.lr = lr
+        self.weights = np.zeros(n_features, dtype=np.float64)
+        self.bias = 0.0
+
+    def _features(self, text: str) -> List[str]:
+        words = normalize_query(text).split()
+        feats = [f"w:{w}" for w in words]
+        feats += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+        for w in words:
+            padded = f"^{w}$"
+            feats += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        feats.append(f"len:{min(len(words), 8)}")
+        return feats
+
+    def _vector(self, text: str) -> np.ndarray:
+        x = np.zeros(self.n_features, dtype=np.float64)
+        for feat in self._features(text):
+            x[zlib.crc32(feat.encode("utf-8")) % self.n_features] += 1.0
+        norm = np.linalg.norm(x)
+        return x / norm if norm > 0 else x
+
+    def fit(self, texts: Sequence[str], labels: Sequence[bool]) -> "HashedNgramClassifier":
+        """Full-batch gradient descent with class-balanced sample weights."""
+        X = np.vstack([self._vector(t) for t in texts])
+        y = np.asarray(labels, dtype=np.float64)
+        pos = max(float(y.sum()), 1.0)
+        neg = max(float(len(y) - y.sum()), 1.0)
+        sample_w = np.where(y > 0, len(y) / (2 * pos), len(y) / (2 * neg))
+        w = np.zeros(self.n_features, dtype=np.float64)
+        b = 0.0
+        for _ in range(self.epochs):
+            p = 1.0 / (1.0 + np.exp(-(X @ w + b)))
+            err = sample_w * (p - y)
+            w -= self.lr * (X.T @ err / len(y) + self.l2 * w)
+            b -= self.lr * float(err.mean())
+        self.weights, self.bias = w, b
+        return self
+
+    def predict_proba(self, text: str) -> float:
+        """Probability that the text is conversational."""
+        z = float(self._vector(text) @ self.weights + self.bias)
+        return float(1.0 / (1.0 + np.exp(-z)))
+
+
+class IntentClassifier:
+    """
+    Conversational/search decisions with a confidence threshold and a memo.
+
+    classify() returns None when the model is unsure; the caller then falls
+    back to the LLM and can remember() its answer. threshold is the
+    confidence needed for a search decision (p <= 1 - threshold);
+    conversational_threshold is the probability needed for a conversational one.
+    """
+
+    def __init__(self, threshold: float = 0.8, conversational_threshold: float = 0.95, memo_size: int = 4096):
+        self.threshold = threshold
+        self.conversational_threshold = conversational_threshold
+        self.memo_size = memo_size
+        self._model: Optional[HashedNgramClassifier] = None
+        self._memo: "OrderedDict[str, Tuple[bool, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> HashedNgramClassifier:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    examples = training_examples()
+                    self._model = HashedNgramClassifier().fit(
+                        [t for t, _ in examples], [c for _, c in examples]
+                    )
+        return self._model
+
+    def recall(self, query: str) -> Optional[Tuple[bool, str]]:
+        key = normalize_query(query)
+        with self._lock:
+            decision = self._memo.get(key)
+            if decision is not None:
+                self._memo.move_to_end(key)
+            return decision
+
+    def remember(self, query: str, decision: Tuple[bool, str]):
+        if self.memo_size <= 0:
+            return
+        key = normalize_query(query)
+        with self._lock:
+            self._memo[key] = decision
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def classify(self, query: str) -> Optional[bool]:
+        """True/False for a confident conversational/search decision, else None."""
+        p = self.model.predict_proba(query)
+        if p >= self.conversational_threshold:
+            return True
+        if p <= 1.0 - self.threshold:
+            return False
+        return None
+
+
+_classifier: Optional[IntentClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Process-wide classifier (trained once, memo shared by all pipelines)."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                from ..config import settings
+                _classifier = IntentClassifier(
+                    threshold=settings.intent_classifier_threshold,
+                    conversational_threshold=settings.intent_conversational_threshold,
+                    memo_size=settings.intent_memo_size,
+                )
+    return _classifier
+
+
+def render_prompt_examples() -> str:
+    """Few-shot block for the LLM classification prompt."""
+    lines = []
+    for text, conv, label in PROMPT_EXAMPLES:
+        verdict = f"CONVERSATIONAL ({label})" if conv else "SEARCH"
+        lines.append(f'- "{text}" → {verdict}')
+    return "\n".join(lines)
@@ -0,0 +1,250 @@
+"""
+Process-wide registry for the embedding and reranking models.
+
+Models are loaded lazily on first use, or ahead of time by a background
+warmup thread, and every RAGPipeline in the process shares the same
+instance. When the process is over its memory budget, models that have been
+idle for a while are unloaded and reloaded on next use. A load that fails
+(e.g. the weights could not be downloaded) is retried on a later get(),
+after a backoff that doubles with each consecutive failure. status() feeds
+the /health/ready check.
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from ..config import settings
+
+try:
+    from sentence_transformers import SentenceTransformer  # type: ignore
+except Exception:
+    SentenceTransformer = None  # type: ignore
+try:
+    from sentence_transformers import CrossEncoder  # type: ignore
+except Exception:
+    CrossEncoder = None  # type: ignore
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+UNAVAILABLE = "unavailable"  # library not installed
+UNLOADED = "unloaded"
+LOADING = "loading"
+LOADED = "loaded"
+FAILED = "failed"
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (None if it cannot be read)."""
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except Exception:
+        pass
+    try:
+        import psutil  # type: ignore
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class _Slot:
+    """Load state for one registered model."""
+
+    def __init__(self, name: str, model_id: str, loader: Optional[Callable[[], Any]]):
+        self.name = name
+        self.model_id = model_id
+        self.loader = loader
+        self.model: Any = None
+        self.state = UNLOADED if loader is not None else UNAVAILABLE
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.last_used: Optional[float] = None
+        self.failures = 0
+        self.failed_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Lazy, shared model loading with background warmup and idle unloading.
+
+    Args:
+        retry_seconds: Wait before retrying a failed load; doubles per consecutive failure
+        max_retry_seconds: Upper bound on that wait
+    """
+
+    def __init__(self, retry_seconds: float = 30.0, max_retry_seconds: float = 900.0):
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self._slots: Dict[str, _Slot] = {}
+        self._reaper: Optional[threading.Thread] = None
+
+    def register(self, name: str, model_id: str, loader: Optional[Callable[[], Any]]):
+        """Register a model; loader=None marks it unavailable (library missing)."""
+        self._slots[name] = _Slot(name, model_id, loader)
+
+    def available(self, name: str) -> bool:
+        """True if the model can be (or already is) loaded; a failed model counts once its retry is due."""
+        slot = self._slots.get(name)
+        return slot is not None and slot.state != UNAVAILABLE and not self._backing_off(slot)
+
+    def _retry_at(self, slot: _Slot) -> Optional[float]:
+        """When a failed model may be loaded again (None unless it failed)."""
+        if slot.state != FAILED or slot.failed_at is None:
+            return None
+        delay = min(self.max_retry_seconds, self.retry_seconds * 2 ** max(0, slot.failures - 1))
+        return slot.failed_at + delay
+
+    def _backing_off(self, slot: _Slot) -> bool:
+        retry_at = self._retry_at(slot)
+        return retry_at is not None and time.time() < retry_at
+
+    def state(self, name: str) -> str:
+        slot = self._slots.get(name)
+        return slot.state if slot is not None else UNAVAILABLE
+
+    def _load(self, slot: _Slot):
+        """Load a model (slot.lock held)."""
+        slot.state = LOADING
+        start = time.time()
+        try:
+            assert slot.loader is not None
+            slot.model = slot.loader()
+            slot.state = LOADED
+            slot.error = None
+            slot.failures = 0
+            slot.failed_at = None
+            slot.load_seconds = time.time() - start
+            print(f"[Models] Loaded {slot.model_id} in {slot.load_seconds:.1f}s")
+        except Exception as e:
+            slot.model = None
+            slot.state = FAILED
+            slot.error = str(e)
+            slot.failures += 1
+            slot.failed_at = time.time()
+            print(f"[Models] Failed to load {slot.model_id} (attempt {slot.failures}, retry in {self._retry_at(slot) - slot.failed_at:.0f}s): {e}")
+
+    def get(self, name: str, wait: bool = True) -> Any:
+        """
+        Return a loaded model, loading it on first use.
+
+        Args:
+            name: Registered model name ("embedder", "reranker")
+            wait: If False and another thread is loading the model (e.g. warmup),
+                return None instead of blocking, so callers can degrade gracefully
+
+        Returns:
+            The model, or None if it is unavailable, failed (until its retry is
+            due) or (with wait=False) still loading
+        """
+        slot = self._slots.get(name)
+        if slot is None or slot.state == UNAVAILABLE or self._backing_off(slot):
+            return None
+        if slot.state != LOADED:
+            if not slot.lock.acquire(blocking=wait):
+                return None
+            try:
+                if slot.state in (UNLOADED, LOADING) or (slot.state == FAILED and not self._backing_off(slot)):
+                    self._load(slot)
+            finally:
+                slot.lock.release()
+        slot.last_used = time.time()
+        return slot.model
+
+    def warmup(self, names: Optional[Iterable[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """Load models ahead of the first request."""
+        targets = list(names) if names is not None else list(self._slots)
+
+        def run():
+            for name in targets:
+                self.get(name)
+
+        if not background:
+            run()
+            return None
+        t = threading.Thread(target=run, daemon=True, name="geo-model-warmup")
+        t.start()
+        return t
+
+    def unload(self, name: str) -> bool:
+        slot = self._slots.get(name)
+        if slot is None or slot.state != LOADED:
+            return False
+        with slot.lock:
+            model, slot.model = slot.model, None
+            slot.state = UNLOADED
+        from .batching import release
+        release(model)
+        del model
+        gc.collect()
+        print(f"[Models] Unloaded {slot.model_id}")
+        return True
+
+    def unload_idle(self, max_idle_seconds: float, memory_limit_mb: float = 0.0) -> int:
+        """
+        Unload models idle for longer than max_idle_seconds.
+
+        With memory_limit_mb > 0 this only happens while the process RSS is
+        above the limit.
+        """
+        if memory_limit_mb > 0:
+            rss = current_rss_mb()
+            if rss is None or rss <= memory_limit_mb:
+                return 0
+        now = time.time()
+        unloaded = 0
+        for name, slot in list(self._slots.items()):
+            if slot.state == LOADED and (now - (slot.last_used or 0.0)) > max_idle_seconds:
+                unloaded += int(self.unload(name))
+        return unloaded
+
+    def start_idle_reaper(self, max_idle_seconds: float, memory_limit_mb: float = 0.0, interval: float = 30.0):
+        """Background thread that calls unload_idle periodically."""
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.unload_idle(max_idle_seconds, memory_limit_mb)
+                except Exception as e:
+                    print(f"[Models] Idle reaper error: {e}")
+
+        self._reaper = threading.Thread(target=loop, daemon=True, name="geo-model-reaper")
+        self._reaper.start()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        status = {}
+        for name, slot in self._slots.items():
+            retry_at = self._retry_at(slot)
+            status[name] = {
+                "model": slot.model_id,
+                "state": slot.state,
+                "loaded": slot.state == LOADED,
+                "load_seconds": round(slot.load_seconds, 2) if slot.load_seconds is not None else None,
+                "idle_seconds": round(now - slot.last_used, 1) if slot.last_used else None,
+                "error": slot.error,
+                "failures": slot.failures,
+                "retry_in_seconds": round(max(0.0, retry_at - now), 1) if retry_at is not None else None,
+            }
+        return status
+
+
+model_registry = ModelRegistry(settings.model_retry_seconds, settings.model_max_retry_seconds)
+model_registry.register(
+    "embedder",
+    EMBEDDING_MODEL,
+    (lambda: SentenceTransformer(EMBEDDING_MODEL)) if SentenceTransformer is not None else None,
+)
+model_registry.register(
+    "reranker",
+    RERANKER_MODEL,
+    (lambda: CrossEncoder(RERANKER_MODEL)) if CrossEncoder is not None else None,
+)
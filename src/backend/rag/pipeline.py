@@ -1,31 +1,70 @@
-from typing import List, Dict, Tuple, Optional
+import contextvars
+import threading
+import time
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Dict, Optional, Sequence, Tuple
 
 try:
     from rank_bm25 import BM25Okapi  # type: ignore
 except Exception:
     BM25Okapi = None  # type: ignore
 
-try:
-    from sentence_transformers import SentenceTransformer  # type: ignore
-except Exception:
-    SentenceTransformer = None  # type: ignore
-try:
-    from sentence_transformers import CrossEncoder  # type: ignore
-except Exception:
-    CrossEncoder = None  # type: ignore
-
 from ..graph.client import GraphClient
+from ..graph.vector_index import FactVectorIndex
+from .batching import get_batched_embedder, get_batched_reranker
+from .answer_cache import SemanticAnswerCache, STALE
+from .embedding_cache import EmbeddingCache
+from .fusion import FUSION_STRATEGIES, fuse, top_k_indices
+from .intent_classifier import (
+    ABOUT_ASSISTANT, APPRECIATIONS, CASUAL, FAREWELLS, GREETINGS,
+    get_intent_classifier, render_prompt_examples,
+)
 from .llm import LLM
+from .models import EMBEDDING_MODEL, model_registry
 from .query_expansion import QueryExpander
 from .query_analyzer import analyze_query, get_optimal_num_sources
+from ..singleflight import SingleFlight, StreamFlight, normalize_key
+
+try:
+    from ..metrics import track_cache
+except Exception:
+    track_cache = None  # type: ignore
 
 # Real-time web search
 try:
     from ..search.web_searcher import search_web_realtime
+    from ..search.page_fetcher import get_page_fetcher
+    from ..search.scheduler import background, search_deadline
     _HAS_WEB_SEARCH = True
 except ImportError:
     _HAS_WEB_SEARCH = False
     search_web_realtime = None  # type: ignore
+    get_page_fetcher = None  # type: ignore
+    from contextlib import nullcontext as background  # type: ignore
+    from contextlib import nullcontext as search_deadline  # type: ignore
+
+# Shared, bounded pools (one per process): "search" fans out query variants,
+# "speculative" runs retrieve() alongside query classification. They are kept
+# separate so speculative retrievals can never starve their own variant searches.
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(name: str) -> ThreadPoolExecutor:
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                from ..config import settings
+                executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.retrieval_max_workers),
+                    thread_name_prefix=f"geo-{name}",
+                )
+                _executors[name] = executor
+    return executor
+
 
 SYSTEM_PROMPT = (
     "You are GEO, a Generative Engine. You synthesize a clear, concise answer "
@@ -55,31 +94,92 @@ class RAGPipeline:
         self.graph = graph
         self.llm = llm
         self.use_query_expansion = use_query_expansion  # DISABLED for speed
-        self._embedder = None
-        self._reranker = None
         self._expander = None
+        # Models come from the shared registry and are loaded on first use;
+        # assigning _embedder/_reranker overrides them for this pipeline only.
+        self._embedder_override = None
+        self._reranker_override = None
         
-        if SentenceTransformer is not None:
-            try:
-                self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
-            except Exception:
-                self._embedder = None
-        if CrossEncoder is not None:
-            try:
-                self._reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
-            except Exception:
-                self._reranker = None
+        from ..config import settings
+        self._embedding_cache = EmbeddingCache(
+            EMBEDDING_MODEL,
+            max_entries=settings.embedding_cache_size,
+            cache_dir=settings.embedding_cache_dir or None,
+        )
+        if settings.vector_index_enabled and model_registry.available("embedder") and graph.vector_index is None:
+            # Stored facts become retrievable by meaning; ingestion keeps the index current
+            graph.attach_vector_index(FactVectorIndex(
+                self._index_encode,
+                path=settings.vector_index_path or None,
+                nprobe=settings.vector_index_nprobe,
+                train_threshold=settings.vector_index_train_threshold,
+            ))
+        self._answer_cache: Optional[SemanticAnswerCache] = None
+        if settings.answer_cache_enabled:
+            self._answer_cache = SemanticAnswerCache(
+                max_distance=settings.answer_cache_max_distance,
+                ttl_recent=settings.answer_cache_ttl_recent,
+                ttl_evergreen=settings.answer_cache_ttl_evergreen,
+                max_entries=settings.answer_cache_max_entries,
+                stale_seconds=settings.answer_cache_stale_seconds,
+            )
+        # Local conversational/search classifier (None: always ask the LLM)
+        self._intent = get_intent_classifier() if settings.intent_classifier_enabled else None
+        # Concurrent identical queries share one answer / token stream
+        self._answer_flights: SingleFlight = SingleFlight()
+        self._stream_flights = StreamFlight()
         
         # Initialize query expander
         if use_query_expansion:
             self._expander = QueryExpander(llm=llm)
 
+    def _shared_model(self, name: str, batched, wait: Optional[bool] = None):
+        from ..config import settings
+        model = model_registry.get(name, wait=not settings.model_warmup if wait is None else wait)
+        if model is None:
+            return None
+        # Route inference through the shared per-process batching services
+        return batched(model) if settings.inference_batching else model
+
+    @property
+    def _embedder(self):
+        if self._embedder_override is not None:
+            return self._embedder_override
+        return self._shared_model("embedder", get_batched_embedder)
+
+    @_embedder.setter
+    def _embedder(self, model):
+        self._embedder_override = model
+
+    @property
+    def _reranker(self):
+        if self._reranker_override is not None:
+            return self._reranker_override
+        return self._shared_model("reranker", get_batched_reranker)
+
+    @_reranker.setter
+    def _reranker(self, model):
+        self._reranker_override = model
+
     def _normalize(self, s: str) -> str:
         return (s or "").strip()
 
     def _fact_text(self, f: Dict) -> str:
         return f"{self._normalize(str(f.get('subject','')))} {self._normalize(str(f.get('predicate','')))} {self._normalize(str(f.get('object','')))}"
 
+    def _encode(self, texts, wait: bool = False):
+        """Encode text(s) with the embedder, going through the embedding cache."""
+        embedder = self._embedder
+        if embedder is None and wait:
+            embedder = self._shared_model("embedder", get_batched_embedder, wait=True)
+        if embedder is None:
+            raise RuntimeError(f"Embedding model {EMBEDDING_MODEL} is not loaded")
+        return self._embedding_cache.encode(embedder.encode, texts, normalize_embeddings=True)
+
+    def _index_encode(self, texts):
+        """_encode for vector index maintenance: waits out warmup instead of dropping the facts."""
+        return self._encode(texts, wait=True)
+
     def _simple_cosine(self, a_tokens: List[str], b_tokens: List[str]) -> float:
         if not a_tokens or not b_tokens:
             return 0.0
@@ -88,6 +188,12 @@ class RAGPipeline:
         import math
         return inter / math.sqrt(max(1, len(sa) * len(sb)))
     
+    def _is_temporal(self, query: str) -> bool:
+        """True if the query asks for latest/recent information."""
+        q_lower = query.lower()
+        temporal_keywords = ['latest', 'recent', 'current', 'newest', 'last', 'most recent', 'this year']
+        return any(keyword in q_lower for keyword in temporal_keywords)
+
     def _add_temporal_context(self, query: str) -> str:
         """
         Enhance query with temporal keywords for recency-sensitive questions.
@@ -99,11 +205,7 @@ class RAGPipeline:
         # Get current year
         current_year = time.strftime("%Y")
         
-        # Check for temporal keywords
-        temporal_keywords = ['latest', 'recent', 'current', 'newest', 'last', 'most recent', 'this year']
-        has_temporal = any(keyword in q_lower for keyword in temporal_keywords)
-        
-        if not has_temporal:
+        if not self._is_temporal(query):
             return query
         
         # Already has year? Don't add duplicate
@@ -126,13 +228,129 @@ class RAGPipeline:
         
         return enhanced
 
-    def retrieve(self, query: str, k: Optional[int] = None) -> List[Dict]:
+    def _search_variants(self, queries: List[str], provider: str, k: int, primary: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        """
+        Run web search for every query variant and merge results by fact ID.
+
+        In concurrent mode all variants go through the shared search pool. Each
+        variant gets settings.retrieval_variant_timeout seconds from when it
+        starts running; one that overruns is dropped, and one still queued
+        after that long (pool saturated) is cancelled. The same deadline is
+        handed to the outbound scheduler, so a dropped variant's requests
+        stop waiting for a rate-limit token. Results are merged in query
+        order once collected, so earlier variants win dedup ties.
+
+        Variants not in primary (default: the first query) are searched at
+        background priority, so the outbound rate limiter serves the user's
+        own query first.
+        """
+        from ..config import settings
+        all_facts: Dict[str, Dict] = {}  # Use dict to deduplicate by fact ID
+        primary = set(primary) if primary is not None else set(queries[:1])
+
+        def merge(web_facts: List[Dict]):
+            for f in web_facts:
+                fact_id = f.get("id", f"{f.get('subject', '')}_{f.get('object', '')}")
+                if fact_id not in all_facts:
+                    all_facts[fact_id] = f
+
+        def search(q: str) -> List[Dict]:
+            if q in primary:
+                return search_web_realtime(q, provider=provider, num_results=k)
+            with background():
+                return search_web_realtime(q, provider=provider, num_results=k)
+
+        if not settings.concurrent_retrieval:
+            for q in queries:
+                try:
+                    merge(search(q))
+                except Exception as e:
+                    print(f"[Retrieval] Web search error for '{q}': {e}")
+            return all_facts
+
+        executor = _get_executor("search")
+        timeout = settings.retrieval_variant_timeout
+        started: Dict[int, float] = {}
+
+        def run(i: int, q: str) -> List[Dict]:
+            started[i] = time.time()
+            with search_deadline(time.monotonic() + timeout):
+                return search(q)
+
+        submitted = time.time()
+        # Each variant runs in a copy of the caller's context (keeps a background caller in the background)
+        futures = {
+            executor.submit(contextvars.copy_context().run, run, i, q): i
+            for i, q in enumerate(queries)
+        }
+        results: Dict[int, List[Dict]] = {}
+        pending = set(futures)
+        while pending:
+            now = time.time()
+            deadlines = {fut: started.get(futures[fut], submitted) + timeout for fut in pending}
+            for fut in [f for f in pending if deadlines[f] <= now and not f.done()]:
+                i = futures[fut]
+                if i not in started and not fut.cancel():
+                    continue  # began running just now; its own deadline applies from here
+                pending.discard(fut)
+                state = "timed out" if i in started else "never started (pool busy)"
+                print(f"[Retrieval] Dropping variant '{queries[i]}': {state} within {timeout}s")
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=max(0.0, min(deadlines[f] for f in pending) - now), return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                try:
+                    results[futures[fut]] = fut.result()
+                except Exception as e:
+                    print(f"[Retrieval] Web search error for '{queries[futures[fut]]}': {e}")
+        for i in sorted(results):
+            merge(results[i])
+        return all_facts
+
+    def _deep_passages(self, facts: List[Dict]) -> List[Dict]:
+        """Passages from the pages behind the top search hits (empty on failure)."""
+        from ..config import settings
+        try:
+            return get_page_fetcher().passages_for(
+                facts,
+                top_n=settings.deep_retrieval_top_n,
+                max_passages=settings.deep_retrieval_max_passages,
+            )
+        except Exception as e:
+            print(f"[Retrieval] Deep retrieval failed, using snippets only: {e}")
+            return []
+    
+    def _fusion_strategy(self, fusion: Optional[str]) -> str:
+        from ..config import settings
+        strategy = (fusion or settings.fusion_strategy or "weighted").lower()
+        if strategy not in FUSION_STRATEGIES:
+            print(f"[Retrieval] Unknown fusion strategy '{strategy}', using 'weighted'")
+            strategy = "weighted"
+        return strategy
+
+    def _vector_retrieve(self, query: str, limit: int) -> List[Dict]:
+        """Nearest stored facts from the graph's ANN index (empty if there is none)."""
+        if self.graph.vector_index is None or len(self.graph.vector_index) == 0 or self._embedder is None:
+            return []
+        try:
+            facts = self.graph.vector_search(self._encode(query), k=limit)
+        except Exception as e:
+            print(f"[Retrieval] Vector index search failed: {e}")
+            return []
+        for f in facts:
+            f.setdefault("score", f.get("vector_score", 0.0))
+        print(f"[Retrieval] {len(facts)} stored facts from vector index")
+        return facts
+
+    def retrieve(self, query: str, k: Optional[int] = None, fusion: Optional[str] = None) -> List[Dict]:
         """
         Retrieve relevant facts from web search.
         
         Args:
             query: User's search query
             k: Number of sources (if None, dynamically determined)
+            fusion: Score fusion strategy, "weighted" or "rrf" (default: settings.fusion_strategy)
             
         Returns:
             List of ranked facts/sources
@@ -149,6 +367,7 @@ class RAGPipeline:
         
         # k is now guaranteed to be int
         assert k is not None, "k should be determined by now"
+        fusion = self._fusion_strategy(fusion)
         
         # Query expansion: generate multiple query variants
         queries = [query]
@@ -172,6 +391,7 @@ class RAGPipeline:
         
         # **REAL-TIME WEB SEARCH** - Search the live web for each query variant
         all_facts: Dict[str, Dict] = {}  # Use dict to deduplicate by fact ID
+        from_graph = False
         
         if _HAS_WEB_SEARCH and search_web_realtime:
             # Use real-time web search (like Perplexity!)
@@ -179,18 +399,14 @@ class RAGPipeline:
             search_provider = settings.search_provider if hasattr(settings, 'search_provider') else "duckduckgo"
             
             print(f"[Retrieval] Using REAL-TIME web search (provider: {search_provider})")
-            for q in queries:
-                try:
-                    web_facts = search_web_realtime(q, provider=search_provider, num_results=k)
-                    for f in web_facts:
-                        fact_id = f.get("id", f"{f.get('subject', '')}_{f.get('object', '')}")
-                        if fact_id not in all_facts:
-                            all_facts[fact_id] = f
-                except Exception as e:
-                    print(f"[Retrieval] Web search error for '{q}': {e}")
+            all_facts = self._search_variants(queries, search_provider, k, primary=[query, enhanced_query])
+            if settings.deep_retrieval and all_facts:
+                for f in self._deep_passages(list(all_facts.values())):
+                    all_facts.setdefault(f["id"], f)
         else:
             # Fallback to database search (old behavior)
             print(f"[Retrieval] Web search not available, using database fallback")
+            from_graph = True
             for q in queries:
                 terms = [t for t in q.lower().split() if len(t) > 2]
                 facts = self.graph.search_facts(terms, limit=max(k * 3, 16))
@@ -206,51 +422,61 @@ class RAGPipeline:
                         if new_score > existing_score:
                             all_facts[fact_id] = f
         
+        # Stored knowledge (ingested papers, GEO submissions) retrieved by meaning
+        stored = self._vector_retrieve(query, max(k * 2, 10))
+        for f in stored:
+            if from_graph:
+                fact_id = f"{f.get('subject', '')}_{f.get('predicate', '')}_{f.get('object', '')}"
+            else:
+                fact_id = f.get("id", f"{f.get('subject', '')}_{f.get('object', '')}")
+            if fact_id not in all_facts:
+                all_facts[fact_id] = f
+        
         base = list(all_facts.values())
         print(f"[Retrieval] Retrieved {len(base)} unique facts from {len(queries)} query variants")
         
         texts = [self._fact_text(f) for f in base]
-        prev_scores = [float(f.get("score", 0.0)) for f in base]
-
-        # BM25
-        if BM25Okapi is not None and texts:
+        prev_scores = np.fromiter((float(f.get("score", 0.0) or 0.0) for f in base), dtype=np.float64, count=len(base))
+
+        # BM25: facts that came from the graph are scored from its inverted index
+        graph_bm25 = None
+        if from_graph and texts:
+            graph_bm25 = self.graph.bm25_scores(query, [str(f.get("id")) for f in base])
+        if graph_bm25 is not None:
+            bm25_scores = np.asarray(graph_bm25, dtype=np.float64)
+        elif BM25Okapi is not None and texts:
             tokenized = [t.lower().split() for t in texts]
             bm25 = BM25Okapi(tokenized)
-            bm25_scores = bm25.get_scores(query.lower().split()).tolist()
+            bm25_scores = np.asarray(bm25.get_scores(query.lower().split()), dtype=np.float64)
         else:
-            bm25_scores = [0.0] * len(texts)
+            bm25_scores = np.zeros(len(texts))
 
         # Embeddings if available, else token cosine
+        emb_scores = None
         if self._embedder is not None and texts:
             try:
-                q_emb = self._embedder.encode(query, normalize_embeddings=True)
-                d_emb = self._embedder.encode(texts, normalize_embeddings=True)
-                emb_scores = (d_emb @ q_emb).tolist()
+                q_emb = self._encode(query)
+                d_emb = self._encode(texts)
+                emb_scores = np.asarray(d_emb @ q_emb, dtype=np.float64)
             except Exception:
-                q_tok = query.lower().split()
-                emb_scores = [self._simple_cosine(q_tok, t.lower().split()) for t in texts]
-        else:
+                emb_scores = None
+        if emb_scores is None:
             q_tok = query.lower().split()
-            emb_scores = [self._simple_cosine(q_tok, t.lower().split()) for t in texts]
-
-        # Tiny reranker: combine source score + bm25 + embedding-like score
-        combo = []
-        for i, _ in enumerate(base):
-            s = 0.5 * prev_scores[i] + 0.3 * bm25_scores[i] + 0.7 * emb_scores[i]
-            combo.append((s, i))
-        combo.sort(reverse=True)
-        prelim = [base[i] for (s, i) in combo[: max(k * 2, 10)]]
+            emb_scores = np.array([self._simple_cosine(q_tok, t.lower().split()) for t in texts], dtype=np.float64)
+
+        # Fuse source prior + bm25 + embedding score (per-signal normalized, or RRF)
+        fused = fuse({"prior": prev_scores, "bm25": bm25_scores, "embedding": emb_scores}, strategy=fusion)
+        prelim = [base[i] for i in top_k_indices(fused, max(k * 2, 10))]
         # Optional cross-encoder rerank
-        if self._reranker is not None and prelim:
+        top = prelim[:k]
+        reranker = self._reranker
+        if reranker is not None and prelim:
             pairs = [(query, self._fact_text(f)) for f in prelim]
             try:
-                scores = self._reranker.predict(pairs).tolist()
-            except Exception:
-                scores = [0.0] * len(prelim)
-            order = sorted(range(len(prelim)), key=lambda i: scores[i], reverse=True)
-            top = [prelim[i] for i in order[:k]]
-        else:
-            top = prelim[:k]
+                scores = np.asarray(reranker.predict(pairs), dtype=np.float64)
+                top = [prelim[i] for i in top_k_indices(scores, k)]
+            except Exception as e:
+                print(f"[Retrieval] Rerank failed, keeping fused order: {e}")
         for idx, f in enumerate(top, start=1):
             f["idx"] = idx
         return top
@@ -264,12 +490,10 @@ class RAGPipeline:
             )
         return "\n".join(lines)
 
-    def _is_conversational(self, query: str) -> tuple[bool, str]:
+    def _quick_classification(self, query: str) -> Optional[tuple[bool, str]]:
         """
-        Use LLM to intelligently detect if query is conversational or informational.
-        Returns (is_conversational, category) where category is one of:
-        - 'greeting', 'appreciation', 'casual_chat', 'about_assistant', 'farewell'
-        - or 'search' if it needs web search
+        Classify without an LLM round trip when possible.
+        Returns None if the query needs LLM classification.
         """
         q_lower = query.lower().strip()
         
@@ -291,23 +515,41 @@ class RAGPipeline:
             # Fallback to rule-based for mock
             return self._rule_based_classification(q_lower)
         
+        # Memoized LLM answers, then the local classifier; the LLM is only asked when it is unsure.
+        # The classifier's own guesses are not memoized, so a wrong one is never pinned.
+        if self._intent is None:
+            return None
+        decision = self._intent.recall(query)
+        if decision is not None:
+            return decision
+        is_conversational = self._intent.classify(query)
+        if is_conversational is None:
+            return None
+        return (True, self._determine_conversational_category(q_lower)) if is_conversational else (False, 'search')
+    
+    def _is_conversational(self, query: str) -> tuple[bool, str]:
+        """
+        Use LLM to intelligently detect if query is conversational or informational.
+        Returns (is_conversational, category) where category is one of:
+        - 'greeting', 'appreciation', 'casual_chat', 'about_assistant', 'farewell'
+        - or 'search' if it needs web search
+        """
+        quick = self._quick_classification(query)
+        if quick is not None:
+            return quick
+        return self._llm_classification(query)
+    
+    def _llm_classification(self, query: str) -> tuple[bool, str]:
+        """Ask the LLM whether the query is CONVERSATIONAL or SEARCH (one round trip)."""
+        q_lower = query.lower().strip()
+        
         # Use LLM for intelligent classification
         classification_prompt = f"""You are a query classifier. Determine if the user's message is:
 1. CONVERSATIONAL - greetings, thanks, casual chat, questions about you as an assistant, farewells
 2. SEARCH - questions requiring factual information, explanations, current events, how-to, etc.
 
 Examples:
-- "Hi" → CONVERSATIONAL (greeting)
-- "Thanks!" → CONVERSATIONAL (appreciation)
-- "How are you?" → CONVERSATIONAL (casual_chat)
-- "Who are you?" → CONVERSATIONAL (about_assistant)
-- "Tell me about yourself" → CONVERSATIONAL (about_assistant)
-- "What can you do?" → CONVERSATIONAL (about_assistant)
-- "What is Python?" → SEARCH
-- "How does photosynthesis work?" → SEARCH
-- "Who is the president?" → SEARCH
-- "Tell me about quantum physics" → SEARCH
-- "Latest news on AI" → SEARCH
+{render_prompt_examples()}
 
 User message: "{query}"
 
@@ -320,26 +562,23 @@ Respond with ONLY ONE WORD: either "CONVERSATIONAL" or "SEARCH"
             
             if "CONVERSATIONAL" in result:
                 # Determine subcategory
-                category = self._determine_conversational_category(q_lower)
-                return (True, category)
+                decision = (True, self._determine_conversational_category(q_lower))
             else:
-                return (False, 'search')
+                decision = (False, 'search')
+            if self._intent is not None:
+                self._intent.remember(query, decision)
+            return decision
         except:
             # Fallback to rule-based if LLM fails
             return self._rule_based_classification(q_lower)
     
     def _rule_based_classification(self, q_lower: str) -> tuple[bool, str]:
         """Fallback rule-based classification."""
-        greetings = ['hi', 'hello', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening', 'howdy', 'sup', "what's up", 'yo']
-        appreciations = ['thanks', 'thank you', 'thx', 'ty', 'appreciate it', 'awesome', 'great', 'cool', 'nice', 'perfect', 'excellent', 'amazing']
-        casual = ['how are you', 'how r u', 'wassup', 'whats good', 'hows it going', 'ok', 'okay']
-        farewells = ['bye', 'goodbye', 'see you', 'later', 'cya', 'good night']
-        about_assistant = [
-            'who are you', 'what are you', 'tell me about yourself', 'what can you do', 
-            'your capabilities', 'introduce yourself', 'what do you do', 'what exactly do you do',
-            'how are you different', 'difference between you', 'whats the difference',
-            'compare yourself', 'why use you', 'what makes you special', 'how do you work'
-        ]
+        greetings = GREETINGS
+        appreciations = APPRECIATIONS
+        casual = CASUAL
+        farewells = FAREWELLS
+        about_assistant = ABOUT_ASSISTANT
         
         # Check patterns
         for pattern in greetings:
@@ -440,52 +679,196 @@ I'm not just another chatbot—I'm a **verifiable**, **transparent**, and **priv
         else:
             return "I'm GEO, your AI search assistant! 🚀 Ask me anything and I'll search the web in real-time to give you accurate answers with credible sources."
 
-    def answer(self, query: str, k: Optional[int] = None) -> Tuple[str, List[Dict]]:
+    def answer(self, query: str, k: Optional[int] = None, fusion: Optional[str] = None) -> Tuple[str, List[Dict]]:
         """
         Generate answer for a query.
         
         Args:
             query: User's search query
             k: Number of sources (if None, dynamically determined based on query complexity)
+            fusion: Score fusion strategy for retrieval ("weighted" or "rrf")
             
         Returns:
             Tuple of (answer, facts)
         """
         # Check if it's conversational first
-        is_conversational, category = self._is_conversational(query)
-        if is_conversational:
-            return self._get_conversational_response(query, category), []
+        quick = self._quick_classification(query)
+        if quick is not None and quick[0]:
+            return self._get_conversational_response(query, quick[1]), []
+        
+        # Only search answers are cached, so a hit also settles classification
+        cached = self._cached_answer(query, k, fusion)
+        if cached is not None:
+            return cached
+        
+        from ..config import settings
+        if not settings.singleflight_enabled:
+            return self._answer_search(query, k, fusion, classify=quick is None)
+        return self._answer_flights.do(
+            self._flight_key(query, k, fusion),
+            lambda: self._answer_search(query, k, fusion, classify=quick is None),
+        )
+    
+    def _flight_key(self, query: str, k: Optional[int], fusion: Optional[str]) -> Tuple[str, Optional[int], str]:
+        return (normalize_key(query), k, self._fusion_strategy(fusion))
+    
+    def _answer_search(self, query: str, k: Optional[int], fusion: Optional[str], classify: bool) -> Tuple[str, List[Dict]]:
+        """Slow path of answer(): LLM classification (if needed), retrieval and generation."""
+        facts = None
+        if classify:
+            is_conversational, category, facts = self._classify_with_speculation(query, k, fusion)
+            if is_conversational:
+                return self._get_conversational_response(query, category), []
+        return self._answer_uncached(query, k, fusion, facts=facts)
+    
+    def _classify_with_speculation(self, query: str, k: Optional[int], fusion: Optional[str]) -> Tuple[bool, str, Optional[List[Dict]]]:
+        """
+        Run LLM classification, speculatively retrieving at the same time.
+        
+        Most queries are searches, so retrieval is started before the
+        classifier has answered. If the query turns out to be conversational
+        the retrieval is cancelled (or its result discarded).
+        
+        Returns:
+            (is_conversational, category, facts) where facts is None when no
+            speculative result is available and retrieval must run normally
+        """
+        from ..config import settings
+        if not settings.speculative_retrieval:
+            is_conversational, category = self._llm_classification(query)
+            return is_conversational, category, None
         
-        # Retrieve with dynamic source determination
-        facts = self.retrieve(query, k)
+        future = _get_executor("speculative").submit(self.retrieve, query, k, fusion=fusion)
+        is_conversational, category = self._llm_classification(query)
+        if is_conversational:
+            if not future.cancel():
+                print(f"[RAG] Discarding speculative retrieval for conversational query '{query}'")
+            return is_conversational, category, None
+        try:
+            return is_conversational, category, future.result()
+        except Exception as e:
+            print(f"[RAG] Speculative retrieval failed, retrying: {e}")
+            return is_conversational, category, None
+    
+    def _answer_uncached(self, query: str, k: Optional[int] = None, fusion: Optional[str] = None, facts: Optional[List[Dict]] = None) -> Tuple[str, List[Dict]]:
+        """Retrieve (unless facts are given), generate and store the result in the answer cache."""
+        if facts is None:
+            # Retrieve with dynamic source determination
+            facts = self.retrieve(query, k, fusion=fusion)
         prompt = TEMPLATE.format(system=SYSTEM_PROMPT, question=query, facts=self.format_facts(facts))
         ans = self.llm.generate(prompt)
+        self._store_answer(query, k, fusion, ans, facts)
         return ans, facts
     
-    def answer_stream(self, query: str, k: Optional[int] = None):
+    def _query_embedding(self, query: str):
+        if self._answer_cache is None or self._embedder is None:
+            return None
+        try:
+            return self._encode(query)
+        except Exception as e:
+            print(f"[AnswerCache] Could not embed query: {e}")
+            return None
+    
+    def _cache_scope(self, k: Optional[int], fusion: Optional[str]) -> Tuple[Optional[int], str]:
+        """Request options a cached answer depends on."""
+        return (k, self._fusion_strategy(fusion))
+    
+    def _cached_answer(self, query: str, k: Optional[int], fusion: Optional[str] = None) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Look up a semantically equivalent cached answer.
+        
+        Stale entries are still returned, and one background thread is started
+        to recompute them (stale-while-revalidate).
+        """
+        q_emb = self._query_embedding(query)
+        if q_emb is None:
+            return None
+        assert self._answer_cache is not None
+        entry, state = self._answer_cache.lookup(q_emb, self._cache_scope(k, fusion))
+        if track_cache is not None:
+            track_cache("semantic", entry is not None)
+        if entry is None:
+            return None
+        print(f"[AnswerCache] {state} hit for '{query}' (cached query: '{entry.query}')")
+        if state == STALE and self._answer_cache.claim_refresh(entry):
+            def refresh():
+                try:
+                    with background():
+                        self._answer_uncached(entry.query, k, fusion)
+                except Exception as e:
+                    entry.refreshing = False
+                    print(f"[AnswerCache] Background refresh failed for '{entry.query}': {e}")
+            threading.Thread(target=refresh, daemon=True, name="geo-answer-refresh").start()
+        return entry.answer, entry.copy_facts()
+    
+    def _store_answer(self, query: str, k: Optional[int], fusion: Optional[str], answer: str, facts: List[Dict]):
+        q_emb = self._query_embedding(query)
+        if q_emb is None or not facts:
+            return
+        assert self._answer_cache is not None
+        self._answer_cache.store(query, self._cache_scope(k, fusion), q_emb, answer, facts, recent=self._is_temporal(query))
+    
+    def answer_stream(self, query: str, k: Optional[int] = None, fusion: Optional[str] = None):
         """
         Stream answer generation token by token.
         
         Args:
             query: User's search query
             k: Number of sources (if None, dynamically determined based on query complexity)
+            fusion: Score fusion strategy for retrieval ("weighted" or "rrf")
         """
         # Check if it's conversational first
-        is_conversational, category = self._is_conversational(query)
+        quick = self._quick_classification(query)
+        is_conversational, category = quick if quick is not None else (False, 'search')
+        
+        if not is_conversational:
+            cached = self._cached_answer(query, k, fusion)
+            if cached is not None:
+                answer, facts = cached
+                yield {"type": "facts", "facts": facts}
+                yield {"type": "text", "content": answer}
+                return
+        
         if is_conversational:
-            # Yield empty facts
-            yield {"type": "facts", "facts": []}
-            # Yield conversational response
-            response = self._get_conversational_response(query, category)
-            yield {"type": "text", "content": response}
+            yield from self._conversational_events(query, category)
             return
         
-        facts = self.retrieve(query, k)
+        from ..config import settings
+        if not settings.singleflight_enabled:
+            yield from self._stream_search(query, k, fusion, classify=quick is None)
+        else:
+            # Later subscribers replay the events produced so far, then follow live
+            yield from self._stream_flights.subscribe(
+                self._flight_key(query, k, fusion),
+                lambda: self._stream_search(query, k, fusion, classify=quick is None),
+            )
+    
+    def _conversational_events(self, query: str, category: str):
+        # Yield empty facts
+        yield {"type": "facts", "facts": []}
+        # Yield conversational response
+        response = self._get_conversational_response(query, category)
+        yield {"type": "text", "content": response}
+    
+    def _stream_search(self, query: str, k: Optional[int], fusion: Optional[str], classify: bool):
+        """Event stream for answer_stream() after the quick classification and cache checks."""
+        facts = None
+        if classify:
+            is_conversational, category, facts = self._classify_with_speculation(query, k, fusion)
+            if is_conversational:
+                yield from self._conversational_events(query, category)
+                return
+        
+        if facts is None:
+            facts = self.retrieve(query, k, fusion=fusion)
         prompt = TEMPLATE.format(system=SYSTEM_PROMPT, question=query, facts=self.format_facts(facts))
         
         # Yield facts first
         yield {"type": "facts", "facts": facts}
         
         # Then stream the answer
+        chunks: List[str] = []
         for chunk in self.llm.generate_stream(prompt):
+            chunks.append(chunk)
             yield {"type": "text", "content": chunk}
+        self._store_answer(query, k, fusion, "".join(chunks), facts)
@@ -1,5 +1,9 @@
 """Real-time web search for dynamic knowledge retrieval."""
 
-from .web_searcher import WebSearcher, SearchResult, search_web_realtime
+from .web_searcher import WebSearcher, SearchResult, asearch_web_realtime, get_searcher, search_web_realtime
+from .hedging import HedgedSearcher, get_hedged_searcher
 
-__all__ = ["WebSearcher", "SearchResult", "search_web_realtime"]
+__all__ = [
+    "WebSearcher", "SearchResult", "asearch_web_realtime", "get_searcher", "search_web_realtime",
+    "HedgedSearcher", "get_hedged_searcher",
+]
@@ -0,0 +1,178 @@
+"""
+Per-provider circuit breakers with adaptive timeouts.
+
+Each search provider gets a breaker with a rolling window of call outcomes
+and a rolling window of successful call latencies:
+
+- closed: calls pass. Once the window holds at least min_calls outcomes and
+  the error rate reaches failure_rate, the breaker opens.
+- open: calls are rejected immediately for open_seconds.
+- half_open: up to half_open_calls probe calls pass. One success closes
+  the breaker, one failure opens it again.
+
+The request timeout follows the provider's observed p99 latency times a
+multiplier, clamped to [min_timeout, max_timeout], so an outage fails
+quickly instead of waiting the full maximum timeout on every call.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+import numpy as np
+
+try:
+    from ..metrics import track_breaker_rejection, track_breaker_transition, track_provider_timeout
+except Exception:
+    track_breaker_rejection = track_breaker_transition = track_provider_timeout = None  # type: ignore
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over rolling error-rate and latency windows."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        min_timeout: float = 1.0,
+        max_timeout: float = 10.0,
+        timeout_multiplier: float = 1.5,
+        latency_window: int = 100,
+        min_latency_samples: int = 10,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.min_latency_samples = min_latency_samples
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failure
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, new_state: str):
+        """Change state (lock held)."""
+        old_state, self.state = self.state, new_state
+        if new_state == OPEN:
+            self._opened_at = time.time()
+        if new_state in (OPEN, HALF_OPEN):
+            self._probes = 0
+        if new_state == CLOSED:
+            self._outcomes.clear()
+        print(f"[CircuitBreaker] {self.name}: {old_state} -> {new_state}")
+        if track_breaker_transition is not None:
+            track_breaker_transition(self.name, old_state, new_state)
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (counts half-open probes)."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.time() - self._opened_at < self.open_seconds:
+                    rejected = True
+                else:
+                    self._transition(HALF_OPEN)
+                    rejected = False
+            else:
+                rejected = False
+            if not rejected and self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    rejected = True
+                else:
+                    self._probes += 1
+        if rejected and track_breaker_rejection is not None:
+            track_breaker_rejection(self.name)
+        return not rejected
+
+    def release(self):
+        """Give back a call allowed by allow() that was never sent (frees its half-open probe)."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+            self._outcomes.append(False)
+            if self.state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(True)
+            if self.state == HALF_OPEN:
+                self._transition(OPEN)
+            elif self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._transition(OPEN)
+
+    def timeout(self) -> float:
+        """Request timeout from the observed p99 latency."""
+        with self._lock:
+            if len(self._latencies) < self.min_latency_samples:
+                value = self.max_timeout
+            else:
+                p99 = float(np.percentile(np.fromiter(self._latencies, dtype=np.float64), 99))
+                value = min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_multiplier))
+        if track_provider_timeout is not None:
+            track_provider_timeout(self.name, value)
+        return value
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": self.state,
+                "error_rate": round(sum(self._outcomes) / calls, 3) if calls else 0.0,
+                "calls": calls,
+                "latency_samples": len(self._latencies),
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Shared breaker for a provider, configured from settings."""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(provider)
+            if breaker is None:
+                from ..config import settings
+                breaker = CircuitBreaker(
+                    provider,
+                    failure_rate=settings.search_breaker_failure_rate,
+                    window=settings.search_breaker_window,
+                    min_calls=settings.search_breaker_min_calls,
+                    open_seconds=settings.search_breaker_open_seconds,
+                    min_timeout=settings.search_timeout_min,
+                    max_timeout=settings.search_timeout_max,
+                    timeout_multiplier=settings.search_timeout_p99_multiplier,
+                )
+                _breakers[provider] = breaker
+    return breaker
+
+
+def breaker_status() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.status() for name, breaker in _breakers.items()}
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,173 @@
+"""
+Hedged multi-provider search.
+
+The primary provider is queried first. If it has not returned an adequate
+result set after its recent p95 latency, the same query goes to the next
+provider too, and the first adequate response wins. If no provider returns
+enough results, everything that arrived is merged (deduplicated by URL).
+This caps the latency tail of a slow or blocking provider (e.g. DuckDuckGo
+HTML scraping) at roughly its p95 plus the backup's latency.
+
+Enabled by a comma-separated SEARCH_PROVIDER, e.g. "duckduckgo,tavily".
+"""
+
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .web_searcher import SearchResult, WebSearcher, get_searcher
+
+
+class LatencyTracker:
+    """Rolling window of call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(np.fromiter(self._samples, dtype=np.float64), q))
+
+
+def parse_providers(spec: str) -> List[str]:
+    """"duckduckgo, tavily" -> ["duckduckgo", "tavily"] (order = priority)."""
+    return [p.strip().lower() for p in (spec or "").split(",") if p.strip()]
+
+
+def merge_results(result_sets: Sequence[List[SearchResult]], num_results: int) -> List[SearchResult]:
+    """Interleave result sets by rank, dropping duplicate URLs."""
+    merged: List[SearchResult] = []
+    seen = set()
+    for rank in range(max((len(r) for r in result_sets), default=0)):
+        for results in result_sets:
+            if rank < len(results) and results[rank].url not in seen:
+                seen.add(results[rank].url)
+                merged.append(results[rank])
+    return merged[:num_results]
+
+
+class HedgedSearcher:
+    """Query providers in priority order, hedging after the primary's p95 latency."""
+
+    def __init__(
+        self,
+        searchers: Sequence[WebSearcher],
+        default_delay: float = 1.0,
+        min_delay: float = 0.05,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        min_results: int = 3,
+        max_workers: int = 8,
+    ):
+        if not searchers:
+            raise ValueError("HedgedSearcher needs at least one provider")
+        self.searchers = list(searchers)
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_results = min_results
+        self.latency: Dict[str, LatencyTracker] = {s.provider: LatencyTracker() for s in self.searchers}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geo-hedge")
+
+    @property
+    def provider(self) -> str:
+        return ",".join(s.provider for s in self.searchers)
+
+    def hedge_delay(self, provider: str) -> float:
+        """How long to wait on a provider before asking the next one."""
+        tracker = self.latency[provider]
+        if len(tracker) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, tracker.percentile(self.percentile) or self.default_delay)
+
+    def _timed(self, searcher: WebSearcher, query: str, num_results: int) -> List[SearchResult]:
+        # Only provider round trips are sampled; near-zero cache hits would drag the p95 to the floor
+        results, elapsed = searcher.search_timed(query, num_results)
+        if elapsed is not None:
+            self.latency[searcher.provider].record(elapsed)
+        return results
+
+    def _adequate(self, results: List[SearchResult], num_results: int) -> bool:
+        return len(results) >= min(self.min_results, num_results)
+
+    def search(self, query: str, num_results: int = 8) -> List[SearchResult]:
+        pending: Dict[Future, WebSearcher] = {}
+        finished: List[Tuple[WebSearcher, List[SearchResult]]] = []
+        queue = list(self.searchers)
+
+        def launch():
+            searcher = queue.pop(0)
+            # Carry the caller's context so its search priority applies in the pool
+            pending[self._executor.submit(contextvars.copy_context().run, self._timed, searcher, query, num_results)] = searcher
+            return searcher
+
+        current = launch()
+        while pending:
+            timeout = self.hedge_delay(current.provider) if queue else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary is slow: hedge with the next provider
+                current = launch()
+                print(f"[WebSearch] Hedging '{query}' with {current.provider}")
+                continue
+            for future in done:
+                searcher = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"[WebSearch] {searcher.provider} failed: {e}")
+                    results = []
+                if self._adequate(results, num_results):
+                    for loser in pending:
+                        loser.cancel()  # not-yet-started requests are dropped, running ones discarded
+                    return results
+                finished.append((searcher, results))
+            if queue:
+                # A provider answered badly: fall through to the next one right away
+                current = launch()
+
+        order = {s.provider: i for i, s in enumerate(self.searchers)}
+        finished.sort(key=lambda item: order[item[0].provider])
+        return merge_results([results for _, results in finished], num_results)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_hedged: Dict[str, HedgedSearcher] = {}
+_hedged_lock = threading.Lock()
+
+
+def get_hedged_searcher(spec: str) -> HedgedSearcher:
+    """Shared HedgedSearcher for a comma-separated provider list."""
+    providers = tuple(parse_providers(spec))
+    key = ",".join(providers)
+    searcher = _hedged.get(key)
+    if searcher is None:
+        with _hedged_lock:
+            searcher = _hedged.get(key)
+            if searcher is None:
+                from ..config import settings
+                searcher = HedgedSearcher(
+                    [get_searcher(p) for p in providers],
+                    default_delay=settings.search_hedge_delay,
+                    percentile=settings.search_hedge_percentile,
+                    min_results=settings.search_hedge_min_results,
+                )
+                _hedged[key] = searcher
+    return searcher
@@ -0,0 +1,112 @@
+"""
+Process-wide HTTP connection pools for search providers.
+
+Every provider host gets one keep-alive requests.Session (sync) and every
+event loop one shared httpx.AsyncClient (async). Repeated searches then
+reuse TCP/TLS connections instead of paying DNS, connect and handshake
+again on each call.
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx  # type: ignore
+except Exception:
+    httpx = None  # type: ignore
+
+# ingest/pdf_extractor.py installs requests_cache globally, which swaps
+# requests.Session for a caching subclass; search traffic has its own cache
+# (result_cache.py), so build sessions from the unpatched class.
+try:
+    from requests_cache.patcher import OriginalSession as _Session  # type: ignore
+except Exception:
+    _Session = requests.Session  # type: ignore
+
+_sessions: Dict[str, requests.Session] = {}
+_async_clients: Dict[int, "httpx.AsyncClient"] = {}
+_lock = threading.Lock()
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _new_session(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None) -> requests.Session:
+    """Session from the unpatched class; pool sizes default to the http_pool_* settings."""
+    from ..config import settings
+    session = _Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or settings.http_pool_connections,
+        pool_maxsize=pool_maxsize or settings.http_pool_maxsize,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """Keep-alive session for the host of url (created on first use)."""
+    host = _host(url)
+    session = _sessions.get(host)
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _new_session()
+                _sessions[host] = session
+    return session
+
+
+def get_async_client() -> "httpx.AsyncClient":
+    """
+    Shared httpx.AsyncClient for the running event loop.
+
+    httpx clients are bound to the loop they were first used on, so there is
+    one per loop; connections are pooled per host inside each client.
+    """
+    if httpx is None:
+        raise RuntimeError("httpx is not installed")
+    from ..config import settings
+    loop_id = id(asyncio.get_running_loop())
+    client = _async_clients.get(loop_id)
+    if client is None or client.is_closed:
+        with _lock:
+            client = _async_clients.get(loop_id)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.http_pool_connections * settings.http_pool_maxsize,
+                        max_keepalive_connections=settings.http_pool_maxsize,
+                        keepalive_expiry=settings.http_keepalive_expiry,
+                    ),
+                    follow_redirects=True,
+                )
+                _async_clients[loop_id] = client
+    return client
+
+
+def pool_stats() -> Dict[str, int]:
+    return {"sessions": len(_sessions), "async_clients": len(_async_clients)}
+
+
+def close_sessions(url: Optional[str] = None):
+    """Close pooled sessions (all hosts, or only the host of url)."""
+    with _lock:
+        hosts = [_host(url)] if url else list(_sessions)
+        for host in hosts:
+            session = _sessions.pop(host, None)
+            if session is not None:
+                session.close()
+
+
+async def aclose_async_client():
+    """Close the shared async client of the running loop."""
+    client = _async_clients.pop(id(asyncio.get_running_loop()), None)
+    if client is not None:
+        await client.aclose()
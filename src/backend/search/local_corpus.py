@@ -0,0 +1,266 @@
+"""
+Offline "local" search provider backed by an indexed on-disk corpus.
+
+The corpus is built from a directory of documents (.txt, .md, .html, plus
+any .jsonl files in it) or from a JSONL dump of past search results. Each
+record becomes one result. Records are ranked with BM25 over the shared
+InvertedIndex. When an encoder is given, ranking also uses IVF vector
+similarity, and the two rankings are combined with reciprocal rank fusion.
+
+Results are SearchResult objects, like the network providers return. Each
+search can sleep for a log-normally distributed time (median latency_ms).
+This emulates a remote provider's latency and tail, so retrieve()
+benchmarks and load tests behave like production without any network
+access. The random generator is seeded, so runs are reproducible.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..graph.inverted_index import InvertedIndex, tokenize
+from ..graph.vector_index import IVFFlatIndex
+from .page_fetcher import extract_text, split_passages
+from .web_searcher import SearchResult
+
+_TEXT_EXTENSIONS = {".txt", ".md", ".rst"}
+_HTML_EXTENSIONS = {".html", ".htm"}
+_RRF_K = 60
+
+
+def record_from_json(obj: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Normalize one JSONL line to a corpus record.
+
+    Accepts SearchResult fields (title/url/snippet/source/timestamp) and fact
+    dicts from to_fact() (subject/object/source_url/source_name/ts). An
+    optional "text" field holds the full document body.
+    """
+    url = obj.get("url") or obj.get("source_url")
+    title = obj.get("title") or obj.get("subject")
+    snippet = obj.get("snippet") or obj.get("object") or ""
+    if not url or not title:
+        return None
+    return {
+        "title": str(title),
+        "url": str(url),
+        "snippet": str(snippet),
+        "source": str(obj.get("source") or obj.get("source_name") or url.split("//")[-1].split("/")[0]),
+        "timestamp": str(obj.get("timestamp") or obj.get("ts") or ""),
+        "text": str(obj.get("text") or snippet),
+    }
+
+
+def _record_from_file(path: str) -> Optional[Dict[str, str]]:
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            raw = fh.read()
+    except OSError as e:
+        print(f"[LocalSearch] Could not read {path}: {e}")
+        return None
+    text = extract_text(raw) if ext in _HTML_EXTENSIONS else raw
+    lines = [line.strip().lstrip("#").strip() for line in text.splitlines() if line.strip()]
+    if not lines:
+        return None
+    title = lines[0][:200]
+    return {
+        "title": title,
+        "url": "file://" + os.path.abspath(path),
+        "snippet": " ".join(lines[1:])[:300] or title,
+        "source": "local",
+        "timestamp": time.strftime("%Y-%m-%d", time.localtime(os.path.getmtime(path))),
+        "text": "\n".join(lines),
+    }
+
+
+class LocalCorpus:
+    """
+    Searchable corpus of documents.
+
+    Args:
+        encode: Optional texts -> (n, dim) embedding function; enables vector ranking
+        index_dir: Where the vector index is saved/loaded (None: rebuild each start)
+        latency_ms: Median injected latency per search (0 disables injection)
+        latency_sigma: Log-normal sigma of the injected latency (tail heaviness)
+        seed: Seed for the latency generator
+    """
+
+    def __init__(
+        self,
+        encode: Optional[Callable[[List[str]], Any]] = None,
+        index_dir: Optional[str] = None,
+        latency_ms: float = 0.0,
+        latency_sigma: float = 0.5,
+        seed: int = 0,
+    ):
+        self.encode = encode
+        self.index_dir = index_dir
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.records: Dict[str, Dict[str, str]] = {}
+        self.passages: Dict[str, List[str]] = {}
+        self.bm25 = InvertedIndex()
+        self.vectors: Optional[IVFFlatIndex] = None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # -- building ------------------------------------------------------------
+
+    def add(self, records: Iterable[Dict[str, str]]) -> int:
+        """Index records (keyed by url; a later record replaces an earlier one)."""
+        added = 0
+        for record in records:
+            url = record["url"]
+            text = record.get("text") or record["snippet"]
+            self.records[url] = record
+            self.passages[url] = split_passages(text, max_chars=300, min_chars=1) or [record["snippet"]]
+            self.bm25.add(url, f"{record['title']} {text}")
+            added += 1
+        return added
+
+    def load_jsonl(self, path: str) -> int:
+        records = []
+        with open(path, encoding="utf-8") as fh:
+            for n, line in enumerate(fh, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = record_from_json(json.loads(line))
+                except json.JSONDecodeError as e:
+                    print(f"[LocalSearch] Skipping {path}:{n}: {e}")
+                    continue
+                if record is not None:
+                    records.append(record)
+        return self.add(records)
+
+    def load_directory(self, path: str) -> int:
+        added = 0
+        records = []
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                ext = os.path.splitext(name)[1].lower()
+                if ext == ".jsonl":
+                    added += self.load_jsonl(full)
+                elif ext in _TEXT_EXTENSIONS or ext in _HTML_EXTENSIONS:
+                    record = _record_from_file(full)
+                    if record is not None:
+                        records.append(record)
+        return added + self.add(records)
+
+    def load(self, path: str) -> int:
+        """Load a directory or a JSONL file."""
+        added = self.load_directory(path) if os.path.isdir(path) else self.load_jsonl(path)
+        print(f"[LocalSearch] Indexed {added} documents from {path}")
+        return added
+
+    def build_vectors(self):
+        """Embed every record (or load a saved index whose ids match the corpus)."""
+        if self.encode is None or not self.records:
+            return
+        ids = sorted(self.records)
+        if self.index_dir and os.path.exists(os.path.join(self.index_dir, "ids.json")):
+            try:
+                index = IVFFlatIndex.load(self.index_dir)
+                if len(index) == len(ids) and all(i in index for i in ids):
+                    self.vectors = index
+                    print(f"[LocalSearch] Loaded {len(index)} vectors from {self.index_dir}")
+                    return
+            except Exception as e:
+                print(f"[LocalSearch] Could not load {self.index_dir} ({e}), re-embedding")
+        texts = [f"{self.records[i]['title']} {self.records[i]['snippet']}" for i in ids]
+        index = IVFFlatIndex()
+        index.add(ids, np.asarray(self.encode(texts), dtype=np.float32))
+        self.vectors = index
+        if self.index_dir:
+            index.save(self.index_dir)
+
+    # -- search ----------------------------------------------------------------
+
+    def _sleep(self):
+        if self.latency_ms <= 0:
+            return
+        with self._lock:
+            delay = self.latency_ms * self._rng.lognormvariate(0.0, self.latency_sigma)
+        time.sleep(delay / 1000.0)
+
+    def _rank(self, query: str, candidates: int) -> List[str]:
+        scores = self.bm25.bm25(query)
+        bm25_order = sorted(scores, key=lambda d: (-scores[d], d))[:candidates]
+        if self.vectors is None or self.encode is None:
+            return bm25_order
+        q = np.asarray(self.encode([query]), dtype=np.float32)[0]
+        vector_order = [i for i, _ in self.vectors.search(q, candidates)]
+        fused: Dict[str, float] = {}
+        for order in (bm25_order, vector_order):
+            for rank, doc_id in enumerate(order):
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (_RRF_K + 1 + rank)
+        return sorted(fused, key=lambda d: (-fused[d], d))
+
+    def _snippet(self, doc_id: str, terms: set) -> str:
+        """The passage sharing the most terms with the query."""
+        passages = self.passages[doc_id]
+        return max(passages, key=lambda p: len(terms & set(tokenize(p))))
+
+    def search(self, query: str, num_results: int = 8) -> List[SearchResult]:
+        self._sleep()
+        terms = set(tokenize(query))
+        results = []
+        for doc_id in self._rank(query, max(num_results * 4, 20))[:num_results]:
+            record = self.records[doc_id]
+            results.append(SearchResult(
+                title=record["title"],
+                url=record["url"],
+                snippet=self._snippet(doc_id, terms),
+                source=record["source"],
+                timestamp=record["timestamp"],
+            ))
+        return results
+
+
+_corpus: Optional[LocalCorpus] = None
+_corpus_lock = threading.Lock()
+
+
+def get_local_corpus() -> LocalCorpus:
+    """Process-wide corpus built from settings.local_search_path (comma-separated paths)."""
+    global _corpus
+    if _corpus is None:
+        with _corpus_lock:
+            if _corpus is None:
+                from ..config import settings
+                encode = None
+                if settings.local_search_vectors:
+                    from ..rag.models import model_registry
+                    if model_registry.available("embedder"):
+                        encode = lambda texts: model_registry.get("embedder").encode(texts, normalize_embeddings=True)  # noqa: E731
+                    else:
+                        print("[LocalSearch] Embedder unavailable, using BM25 only")
+                corpus = LocalCorpus(
+                    encode=encode,
+                    index_dir=settings.local_search_index_dir or None,
+                    latency_ms=settings.local_search_latency_ms,
+                    latency_sigma=settings.local_search_latency_sigma,
+                    seed=settings.local_search_seed,
+                )
+                paths = [p.strip() for p in settings.local_search_path.split(",") if p.strip()]
+                if not paths:
+                    print("[LocalSearch] LOCAL_SEARCH_PATH is not set, the local corpus is empty")
+                for path in paths:
+                    try:
+                        corpus.load(path)
+                    except OSError as e:
+                        print(f"[LocalSearch] Could not load {path}: {e}")
+                corpus.build_vectors()
+                _corpus = corpus
+    return _corpus
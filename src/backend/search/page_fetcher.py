@@ -0,0 +1,349 @@
+"""
+Deep retrieval: fetch top result pages and split them into passages.
+
+Search snippets are only a sentence or two. For the top-N hits, this module
+fetches the pages concurrently and extracts the main text with a streaming
+HTMLParser that skips scripts, navigation and boilerplate containers. It
+then splits the text into passages that become facts for the ranking stages
+of RAGPipeline.retrieve.
+
+Each fetch has caps on bytes read and wall time. Concurrent fetches to the
+same host are limited, and extracted pages are kept in an LRU with a TTL.
+
+Result URLs come from the open web, so every hop (the first request and each
+redirect) is checked before it is sent: the host must resolve only to public
+addresses. Redirects are followed by hand for that reason. All fetches share
+one session whose connection pools are bounded, instead of the per-provider
+sessions in http_pool.
+"""
+
+import codecs
+import ipaddress
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from .http_pool import _new_session
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "button", "select", "iframe"}
+_BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+               "blockquote", "pre", "table", "tr", "td", "th", "dd", "dt", "br", "hr", "figcaption"}
+_VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "area", "base", "col", "embed", "source", "track", "wbr"}
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WS = re.compile(r"\s+")
+
+USER_AGENT = "Mozilla/5.0 (compatible; GEO/2.0; +https://github.com/StrungPattern-coder/GEO)"
+
+
+class _TextExtractor(HTMLParser):
+    """Incremental main-text extractor; feed() it chunks as they arrive."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self._current: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag in _BLOCK_TAGS:
+                self._flush()
+            return
+        if tag in _SKIP_TAGS or tag == "title":
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS or tag == "title":
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._current.append(data)
+
+    def _flush(self):
+        if self._current:
+            text = _WS.sub(" ", "".join(self._current)).strip()
+            if text:
+                self.blocks.append(text)
+            self._current = []
+
+    def text(self) -> str:
+        self._flush()
+        return "\n".join(self.blocks)
+
+
+def is_public_host(host: str) -> bool:
+    """
+    True if every address host resolves to is publicly routable.
+
+    Loopback, private, link-local, reserved, multicast and unspecified
+    addresses (and hosts that do not resolve) are rejected.
+    """
+    if not host:
+        return False
+    try:
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    except (OSError, UnicodeError):
+        return False
+    for info in infos:
+        try:
+            addr = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        except ValueError:
+            return False
+        if addr.version == 6 and addr.ipv4_mapped is not None:
+            addr = addr.ipv4_mapped
+        if (addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved
+                or addr.is_multicast or addr.is_unspecified):
+            return False
+    return bool(infos)
+
+
+def extract_text(html: str) -> str:
+    """Main text of an HTML document, one block per line."""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def split_passages(text: str, max_chars: int = 600, min_chars: int = 80) -> List[str]:
+    """
+    Split page text into passages of roughly max_chars.
+
+    Short blocks (menus, captions) are merged with their neighbours, and long
+    blocks are cut at sentence boundaries. Passages shorter than min_chars
+    are dropped.
+    """
+    passages: List[str] = []
+    current = ""
+    for block in (b.strip() for b in text.split("\n")):
+        if not block:
+            continue
+        pieces = [block] if len(block) <= max_chars else _SENTENCE_END.split(block)
+        for piece in pieces:
+            if current and len(current) + len(piece) + 1 > max_chars:
+                passages.append(current)
+                current = ""
+            current = f"{current} {piece}".strip()
+            while len(current) > max_chars:
+                passages.append(current[:max_chars])
+                current = current[max_chars:]
+    if current:
+        passages.append(current)
+    return [p for p in passages if len(p) >= min_chars]
+
+
+class PageFetcher:
+    """Concurrent, capped page fetching with per-host limits and a page cache."""
+
+    def __init__(
+        self,
+        max_bytes: int = 512 * 1024,
+        timeout: float = 3.0,
+        per_host: int = 2,
+        max_workers: int = 8,
+        cache_size: int = 256,
+        cache_ttl: float = 3600.0,
+        max_redirects: int = 5,
+        allow_private: bool = False,
+    ):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.per_host = per_host
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.max_redirects = max_redirects
+        self.allow_private = allow_private
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geo-fetch")
+        # urllib3 keeps at most pool_connections host pools and closes the least recently used
+        self._session = _new_session(pool_connections=max_workers, pool_maxsize=per_host)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _cached(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.cache_ttl:
+                del self._cache[url]
+                return None
+            self._cache.move_to_end(url)
+            return entry[1]
+
+    def _remember(self, url: str, text: str):
+        with self._lock:
+            self._cache[url] = (time.time(), text)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _allowed(self, url: str) -> bool:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+        return self.allow_private or is_public_host(parts.hostname or "")
+
+    def _open(self, url: str, deadline: float):
+        """
+        GET url with a streamed body, following redirects by hand.
+
+        Every hop is checked with _allowed before it is sent. Returns None if
+        a hop is refused or there are more than max_redirects redirects.
+        """
+        for _ in range(self.max_redirects + 1):
+            if not self._allowed(url):
+                print(f"[PageFetcher] Refusing non-public URL {url}")
+                return None
+            remaining = max(0.1, deadline - time.time())
+            response = self._session.get(url, stream=True, timeout=remaining, allow_redirects=False,
+                                         headers={"User-Agent": USER_AGENT})
+            if not response.is_redirect:
+                return response
+            location = response.headers.get("Location", "")
+            response.close()
+            url = urljoin(url, location)
+        print(f"[PageFetcher] Too many redirects for {url}")
+        return None
+
+    def close(self):
+        self._session.close()
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Fetch one page and return its main text (None on failure or non-HTML).
+
+        The body is streamed into the parser and reading stops at max_bytes
+        or after timeout seconds, whichever comes first.
+        """
+        text = self._cached(url)
+        if text is not None:
+            return text
+        if not url.startswith(("http://", "https://")):
+            return None
+        slot = self._slot(url)
+        deadline = time.time() + self.timeout
+        if not slot.acquire(timeout=self.timeout):
+            return None
+        try:
+            response = self._open(url, deadline)
+            if response is None:
+                return None
+            with response:
+                response.raise_for_status()
+                if "html" not in response.headers.get("Content-Type", "text/html").lower():
+                    return None
+                # requests defaults text/* without a charset to latin-1; pages are mostly UTF-8
+                charset = "charset" in response.headers.get("Content-Type", "").lower()
+                try:
+                    decoder = codecs.getincrementaldecoder((response.encoding if charset else None) or "utf-8")(errors="replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                parser = _TextExtractor()
+                read = 0
+                for chunk in response.iter_content(chunk_size=16384):
+                    parser.feed(decoder.decode(chunk))
+                    read += len(chunk)
+                    if read >= self.max_bytes or time.time() >= deadline:
+                        break
+                parser.feed(decoder.decode(b"", final=True))
+                parser.close()
+                text = parser.text()
+        except Exception as e:
+            print(f"[PageFetcher] Failed to fetch {url}: {e}")
+            return None
+        finally:
+            slot.release()
+        self._remember(url, text)
+        return text
+
+    def fetch_many(self, urls: Sequence[str], timeout: Optional[float] = None) -> Dict[str, str]:
+        """Fetch pages concurrently; pages not done within timeout are skipped."""
+        unique = list(dict.fromkeys(urls))
+        futures = {self._executor.submit(self.fetch, url): url for url in unique}
+        done, not_done = wait(futures, timeout=timeout if timeout is not None else self.timeout + 0.5)
+        for future in not_done:
+            future.cancel()
+        pages = {}
+        for future in done:
+            text = future.result()
+            if text:
+                pages[futures[future]] = text
+        return pages
+
+    def passages_for(self, facts: Sequence[Dict[str, Any]], top_n: int = 3, max_passages: int = 4) -> List[Dict[str, Any]]:
+        """
+        Passage facts for the pages behind the first top_n facts.
+
+        Each passage inherits the source metadata of the fact it came from.
+        """
+        sources: Dict[str, Dict[str, Any]] = {}
+        for fact in facts:
+            url = fact.get("source_url")
+            if url and url not in sources:
+                sources[url] = fact
+            if len(sources) >= top_n:
+                break
+        pages = self.fetch_many(list(sources))
+        passages = []
+        for url, fact in sources.items():
+            text = pages.get(url)
+            if not text:
+                continue
+            for i, passage in enumerate(split_passages(text)[:max_passages]):
+                passages.append({
+                    "id": f"{url}#p{i}",
+                    "subject": fact.get("subject", ""),
+                    "predicate": "passage",
+                    "object": passage,
+                    "source_url": url,
+                    "source_name": fact.get("source_name", ""),
+                    "ts": fact.get("ts", ""),
+                    "truth_weight": fact.get("truth_weight", 0.5),
+                    "score": float(fact.get("score", 0.8) or 0.0),
+                })
+        print(f"[PageFetcher] {len(passages)} passages from {len(pages)}/{len(sources)} pages")
+        return passages
+
+
+_fetcher: Optional[PageFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    """Process-wide fetcher configured from settings."""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                from ..config import settings
+                _fetcher = PageFetcher(
+                    max_bytes=settings.deep_retrieval_max_bytes,
+                    timeout=settings.deep_retrieval_timeout,
+                    per_host=settings.deep_retrieval_per_host,
+                    cache_size=settings.deep_retrieval_cache_size,
+                    cache_ttl=settings.deep_retrieval_cache_ttl,
+                    max_redirects=settings.deep_retrieval_max_redirects,
+                    allow_private=settings.deep_retrieval_allow_private,
+                )
+    return _fetcher
@@ -0,0 +1,232 @@
+"""
+Search result cache.
+
+Results are keyed by provider, normalized query and num_results. Two tiers:
+- An in-process LRU
+- An optional SQLite table that survives restarts
+
+Each provider has its own TTL. Within a stale window after expiry, cached
+results are still served while WebSearcher refreshes them in the
+background (stale-while-revalidate). Rows past that window are deleted from
+SQLite when the table is opened and again every purge_every writes.
+
+This cache is independent of the requests_cache patch that
+ingest/pdf_extractor.py installs for PDF downloads.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "duckduckgo": 900.0,
+    "google": 1800.0,
+    "tavily": 3600.0,   # paid: cache longer
+    "serpapi": 3600.0,  # paid: cache longer
+}
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query or "").lower().split())
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """Parse "provider=seconds,provider=seconds" (unknown entries are ignored)."""
+    ttls = dict(DEFAULT_TTLS)
+    for part in (spec or "").split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            ttls[name.strip().lower()] = float(value)
+        except ValueError:
+            print(f"[SearchCache] Ignoring invalid TTL entry: {part!r}")
+    return ttls
+
+
+class SearchResultCache:
+    """Two-tier (memory LRU + SQLite) cache of search results."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        db_path: Optional[str] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 900.0,
+        stale_seconds: float = 600.0,
+        purge_every: int = 500,
+    ):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stale_seconds = stale_seconds
+        self.purge_every = purge_every
+        self._memory: "OrderedDict[str, Tuple[float, List]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        if db_path:
+            self._open_db(db_path)
+            self.purge_expired()
+
+    def _open_db(self, db_path: str):
+        try:
+            parent = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(parent, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_results ("
+                "key TEXT PRIMARY KEY, provider TEXT NOT NULL, stored_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+        except Exception as e:
+            print(f"[SearchCache] Disk tier disabled ({db_path}): {e}")
+            self._db = None
+
+    @staticmethod
+    def key(provider: str, query: str, num_results: int) -> str:
+        return f"{provider}\x00{normalize_query(query)}\x00{int(num_results)}"
+
+    def ttl(self, provider: str) -> float:
+        return self.ttls.get(provider, self.default_ttl)
+
+    def _state(self, provider: str, stored_at: float, now: float) -> str:
+        age = now - stored_at
+        ttl = self.ttl(provider)
+        if age <= ttl:
+            return FRESH
+        if age <= ttl + self.stale_seconds:
+            return STALE
+        return MISS
+
+    def _remember(self, key: str, stored_at: float, results: List):
+        """Insert into the memory tier (lock held)."""
+        self._memory[key] = (stored_at, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, provider: str, query: str, num_results: int) -> Tuple[Optional[List], str]:
+        """
+        Look up cached results.
+
+        Returns:
+            (results, state) where state is "fresh", "stale" or "miss"
+        """
+        from .web_searcher import SearchResult
+
+        key = self.key(provider, query, num_results)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, payload FROM search_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    try:
+                        entry = (row[0], [SearchResult(**d) for d in json.loads(row[1])])
+                        self._remember(key, *entry)
+                    except Exception as e:
+                        print(f"[SearchCache] Dropping unreadable entry: {e}")
+                        entry = None
+            if entry is None:
+                return None, MISS
+            stored_at, results = entry
+            state = self._state(provider, stored_at, now)
+            if state == MISS:
+                self._memory.pop(key, None)
+                return None, MISS
+            self._memory.move_to_end(key)
+            return list(results), state
+
+    def put(self, provider: str, query: str, num_results: int, results: List):
+        """Store results (empty result sets are not cached)."""
+        if not results:
+            return
+        key = self.key(provider, query, num_results)
+        now = time.time()
+        purge = False
+        with self._lock:
+            self._remember(key, now, list(results))
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO search_results (key, provider, stored_at, payload) VALUES (?, ?, ?, ?)",
+                        (key, provider, now, json.dumps([asdict(r) for r in results])),
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    print(f"[SearchCache] Disk write failed: {e}")
+                self._writes += 1
+                purge = self.purge_every > 0 and self._writes % self.purge_every == 0
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete disk entries past their stale window; returns rows removed."""
+        if self._db is None:
+            return 0
+        now = time.time()
+        removed = 0
+        with self._lock:
+            if self._db is None:
+                return 0
+            try:
+                for provider, in self._db.execute("SELECT DISTINCT provider FROM search_results").fetchall():
+                    cutoff = now - self.ttl(provider) - self.stale_seconds
+                    cur = self._db.execute(
+                        "DELETE FROM search_results WHERE provider = ? AND stored_at < ?", (provider, cutoff)
+                    )
+                    removed += cur.rowcount
+                self._db.commit()
+            except Exception as e:
+                print(f"[SearchCache] Purge failed: {e}")
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM search_results")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_cache: Optional[SearchResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[SearchResultCache]:
+    """Process-wide cache built from settings (None when disabled)."""
+    global _cache
+    from ..config import settings
+    if not settings.search_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchResultCache(
+                    max_entries=settings.search_cache_size,
+                    db_path=settings.search_cache_path or None,
+                    ttls=parse_ttls(settings.search_cache_ttls),
+                    default_ttl=settings.search_cache_default_ttl,
+                    stale_seconds=settings.search_cache_stale_seconds,
+                    purge_every=settings.search_cache_purge_every,
+                )
+    return _cache
@@ -0,0 +1,199 @@
+"""
+HTML result-page parsing for the scraping providers (DuckDuckGo, Google).
+
+The page is trimmed before parsing. Everything ahead of the result list
+and all script/style blocks are cut with string operations. After that, only
+the result containers are turned into a tree, via a SoupStrainer (div.result
+for DuckDuckGo, div.g for Google). lxml is used as the tree builder when it
+is installed, and html.parser otherwise. Date patterns are compiled once at
+import.
+
+Parsers return plain dicts with the SearchResult fields.
+scripts/bench_result_parsing.py compares the parse time per page with a
+full-page parse on the synthetic pages in tests/fixtures. Those pages mimic
+the providers' result containers but are generated, so parity with a
+full-page parse is only checked on that markup, not on live captures.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # type: ignore  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+_MONTHS = r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*"
+_DATE_MDY = re.compile(_MONTHS + r"\s+(\d{1,2}),?\s+(\d{4})", re.IGNORECASE)   # "Mar 3, 2025"
+_DATE_DMY = re.compile(r"(\d{1,2})\s+" + _MONTHS + r"\s+(\d{4})", re.IGNORECASE)  # "3 March 2025"
+_DATE_ISO = re.compile(r"(\d{4})-(\d{2})-(\d{2})")                                # "2025-03-03"
+_YEAR = re.compile(r"\b(202[3-9]|203[0-9])\b")                                    # "2025"
+
+
+def _has_class(name: str):
+    """
+    Class matcher for SoupStrainer.
+
+    While parsing, the strainer sees the raw attribute ("result results_links"),
+    not the split class list, so class_="result" alone would miss multi-class
+    containers.
+    """
+    def match(value) -> bool:
+        if not value:
+            return False
+        return name in (value.split() if isinstance(value, str) else value)
+    return match
+
+
+_DDG_RESULTS = SoupStrainer("div", class_=_has_class("result"))
+_GOOGLE_RESULTS = SoupStrainer("div", class_=_has_class("g"))
+_GOOGLE_SNIPPET_CLASSES = ["VwiC3b", "IsZvec", "aCOpRe"]
+
+# Result lists start at these containers; everything before is header/navigation
+_DDG_START = 'id="links"'
+_GOOGLE_START = 'id="rso"'
+_SCRIPT_STYLE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def default_backend() -> str:
+    return "lxml" if HAS_LXML else "html.parser"
+
+
+def extract_date(text: str) -> str:
+    """
+    Extract a date from text as YYYY-MM-DD.
+    Looks for dates like: "Mar 3, 2025", "3 March 2025", "2025-03-03", or a bare year.
+    """
+    if not text:
+        return ""
+
+    match = _DATE_MDY.search(text)
+    if match:
+        try:
+            return datetime.strptime(f"{match.group(1)} {match.group(2)}, {match.group(3)}", "%b %d, %Y").strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    match = _DATE_DMY.search(text)
+    if match:
+        try:
+            return datetime.strptime(f"{match.group(2)} {match.group(1)}, {match.group(3)}", "%b %d, %Y").strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    match = _DATE_ISO.search(text)
+    if match:
+        return match.group(0)
+
+    match = _YEAR.search(text)
+    if match:
+        return f"{match.group(0)}-01-01"  # Default to Jan 1st
+
+    return ""
+
+
+def trim_page(html: str, start_marker: str) -> str:
+    """
+    Cut what the parser would only tokenize and throw away.
+
+    Drops everything before the tag containing start_marker (if present)
+    and all script/style blocks.
+    """
+    idx = html.find(start_marker)
+    if idx > 0:
+        html = html[max(0, html.rfind("<", 0, idx)):]
+    return _SCRIPT_STYLE.sub("", html)
+
+
+def _soup(html: str, strainer: Optional[SoupStrainer], backend: Optional[str]) -> BeautifulSoup:
+    return BeautifulSoup(html, backend or default_backend(), parse_only=strainer)
+
+
+def parse_duckduckgo(html: str, num_results: int, backend: Optional[str] = None, strain: bool = True) -> List[Dict[str, str]]:
+    """Results from a DuckDuckGo HTML page (strain=False parses the whole, untrimmed page)."""
+    if strain:
+        soup = _soup(trim_page(html, _DDG_START), _DDG_RESULTS, backend)
+    else:
+        soup = _soup(html, None, backend)
+    results = []
+    for result_div in soup.find_all("div", class_="result", limit=num_results):
+        try:
+            title_tag = result_div.find("a", class_="result__a")
+            if not title_tag:
+                continue
+            title = title_tag.get_text(strip=True)
+            url = title_tag.get("href", "")
+
+            snippet_tag = result_div.find("a", class_="result__snippet")
+            snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
+
+            source_tag = result_div.find("span", class_="result__url")
+            source = source_tag.get_text(strip=True) if source_tag else url
+
+            if title and url:
+                results.append({
+                    "title": title,
+                    "url": url,
+                    "snippet": snippet or title,
+                    "source": source,
+                    "timestamp": extract_date(snippet + " " + title),
+                })
+        except Exception as e:
+            print(f"[WebSearch] Error parsing result: {e}")
+    return results
+
+
+def _google_snippet(div) -> str:
+    snippet = ""
+    for tag in div.find_all(["div", "span"], class_=_GOOGLE_SNIPPET_CLASSES):
+        text = tag.get_text(strip=True)
+        if len(text) > len(snippet):
+            snippet = text
+    if not snippet:
+        tag = div.find("div", attrs={"data-sncf": "1"})
+        if tag:
+            snippet = tag.get_text(strip=True)
+    return snippet
+
+
+def parse_google(html: str, num_results: int, backend: Optional[str] = None, strain: bool = True) -> List[Dict[str, str]]:
+    """Organic results from a Google results page (strain=False parses the whole, untrimmed page)."""
+    if strain:
+        soup = _soup(trim_page(html, _GOOGLE_START), _GOOGLE_RESULTS, backend)
+    else:
+        soup = _soup(html, None, backend)
+    results = []
+    for div in soup.find_all("div", class_="g", limit=num_results):
+        try:
+            title_tag = div.find("h3")
+            if not title_tag:
+                continue
+            title = title_tag.get_text(strip=True)
+
+            link_tag = div.find("a", href=True)
+            if not link_tag:
+                continue
+            url = link_tag["href"]
+            # Skip non-http links (like javascript:void(0))
+            if not url.startswith("http"):
+                continue
+
+            snippet = _google_snippet(div)
+            cite_tag = div.find("cite")
+            source = cite_tag.get_text(strip=True) if cite_tag else url.split("//")[-1].split("/")[0]
+
+            if title and url:
+                results.append({
+                    "title": title,
+                    "url": url,
+                    "snippet": snippet or title,
+                    "source": source,
+                    "timestamp": extract_date(snippet + " " + title),
+                })
+        except Exception as e:
+            print(f"[WebSearch] Error parsing Google result: {e}")
+    return results
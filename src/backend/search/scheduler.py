@@ -0,0 +1,235 @@
+"""
+Outbound search scheduler: per-host token buckets with prioritized queueing.
+
+Scraped providers throttle or block clients that send requests as fast as
+traffic arrives. Every WebSearcher request therefore goes through
+acquire(url) first. Each host has a token bucket with a sustained rate and
+a burst allowance. A request that finds the bucket empty waits in the
+host's queue, where interactive searches go ahead of background ones
+(query expansions, stale-cache refreshes, prefetch). Within one priority,
+the queue is first in, first out.
+
+A request that cannot be admitted within the queue timeout is dropped, and
+the provider call returns no results. Hosts without a configured rate are
+not limited. Queue wait times are exported as
+geo_search_queue_wait_seconds.
+
+The priority of the current call comes from a context variable, so callers
+mark background work with `with background():` rather than passing a
+parameter through every search layer. A caller that gives up on its result
+after a fixed time sets `with search_deadline(t):`. Queued requests in that
+block are dropped at t, so an abandoned search never takes a token.
+"""
+
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from ..metrics import track_queue_wait
+except Exception:
+    track_queue_wait = None  # type: ignore
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# host -> (requests per second, burst); scraped endpoints only, APIs have their own quotas
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, int]] = {
+    "html.duckduckgo.com": (1.0, 3),
+    "www.google.com": (0.5, 2),
+}
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("search_priority", default=INTERACTIVE)
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("search_deadline", default=None)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """Run searches in this block at background priority."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def search_deadline(deadline: float) -> Iterator[None]:
+    """Drop queued searches in this block at deadline (a time.monotonic() value)."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def parse_host_rates(spec: str) -> Dict[str, Tuple[float, int]]:
+    """
+    "html.duckduckgo.com=1:3,www.google.com=0.5" -> {host: (rate, burst)}.
+
+    Entries override DEFAULT_HOST_RATES. The burst defaults to 1, and a rate
+    of 0 removes the limit for that host.
+    """
+    rates = dict(DEFAULT_HOST_RATES)
+    for part in (spec or "").split(","):
+        host, sep, value = part.partition("=")
+        if not sep:
+            continue
+        rate, _, burst = value.partition(":")
+        try:
+            rates[host.strip().lower()] = (float(rate), int(burst) if burst else 1)
+        except ValueError:
+            print(f"[Scheduler] Ignoring invalid host rate: {part!r}")
+    return {host: rb for host, rb in rates.items() if rb[0] > 0}
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate tokens/s up to burst."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """Take a token if one is available; otherwise return the seconds until one is."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class _HostQueue:
+    def __init__(self, rate: float, burst: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.waiting: List[Tuple[int, int]] = []  # heap of (priority, seq)
+        self.cond = threading.Condition()
+
+
+class OutboundScheduler:
+    """Per-host rate limiting shared by every WebSearcher in the process."""
+
+    def __init__(self, host_rates: Optional[Dict[str, Tuple[float, int]]] = None, queue_timeout: float = 5.0):
+        self.host_rates = dict(DEFAULT_HOST_RATES if host_rates is None else host_rates)
+        self.queue_timeout = queue_timeout
+        self._hosts: Dict[str, _HostQueue] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _queue(self, host: str) -> Optional[_HostQueue]:
+        limit = self.host_rates.get(host)
+        if limit is None:
+            return None
+        with self._lock:
+            queue = self._hosts.get(host)
+            if queue is None:
+                queue = _HostQueue(*limit)
+                self._hosts[host] = queue
+            return queue
+
+    def acquire(
+        self,
+        url: str,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> bool:
+        """
+        Block until a request to url may be sent.
+
+        Args:
+            url: Request URL (its host selects the bucket)
+            priority: INTERACTIVE or BACKGROUND (default: the current context's priority)
+            timeout: Maximum queueing time (default: queue_timeout)
+            deadline: time.monotonic() after which the caller no longer wants
+                the result (default: the current context's search_deadline)
+
+        Returns:
+            False if the request was not admitted in time and should be dropped
+        """
+        host = urlsplit(url).netloc.lower()
+        queue = self._queue(host)
+        if queue is None:
+            return True
+        priority = current_priority() if priority is None else priority
+        caller_deadline = current_deadline() if deadline is None else deadline
+        start = time.monotonic()
+        deadline = start + (self.queue_timeout if timeout is None else timeout)
+        if caller_deadline is not None:
+            deadline = min(deadline, caller_deadline)
+        entry = (priority, next(self._seq))
+        admitted = False
+        if caller_deadline is not None and caller_deadline <= start:
+            print(f"[Scheduler] Dropped {PRIORITY_NAMES.get(priority, priority)} request to {host}: caller deadline passed")
+            return False
+        with queue.cond:
+            heapq.heappush(queue.waiting, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if queue.waiting[0] == entry:
+                        wait = queue.bucket.take(now)
+                        if wait == 0.0:
+                            admitted = True
+                            break
+                    if now >= deadline:
+                        break
+                    queue.cond.wait(deadline - now if wait is None else min(wait, deadline - now))
+            finally:
+                queue.waiting.remove(entry)
+                heapq.heapify(queue.waiting)
+                queue.cond.notify_all()
+        waited = time.monotonic() - start
+        if track_queue_wait is not None:
+            track_queue_wait(host, PRIORITY_NAMES.get(priority, str(priority)), waited, admitted)
+        if not admitted:
+            print(f"[Scheduler] Dropped {PRIORITY_NAMES.get(priority, priority)} request to {host} after {waited:.1f}s in queue")
+        return admitted
+
+    def status(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {
+            host: {"rate": q.bucket.rate, "burst": q.bucket.burst, "queued": len(q.waiting)}
+            for host, q in hosts.items()
+        }
+
+
+_scheduler: Optional[OutboundScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> OutboundScheduler:
+    """Process-wide scheduler configured from settings."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                from ..config import settings
+                rates = parse_host_rates(settings.search_host_rates) if settings.search_rate_limit_enabled else {}
+                _scheduler = OutboundScheduler(rates, queue_timeout=settings.search_queue_timeout)
+    return _scheduler
+
+
+def reset_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
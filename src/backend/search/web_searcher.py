@@ -3,12 +3,36 @@ Real-time web search module for dynamic fact retrieval.
 Supports multiple search providers with fallback mechanisms.
 """
 
+import asyncio
+import contextvars
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-import requests
-from bs4 import BeautifulSoup
-import re
+
+from .circuit_breaker import get_breaker
+from .http_pool import get_async_client, get_session
+from .result_parser import extract_date, parse_duckduckgo, parse_google
+from .result_cache import STALE, get_result_cache
+from .scheduler import background, current_priority, get_scheduler
+from ..singleflight import SingleFlight, normalize_key
+
+try:
+    from ..metrics import track_cache
+except Exception:
+    track_cache = None  # type: ignore
+
+# (method, url, request kwargs) for one provider call
+_Request = Tuple[str, str, Dict[str, Any]]
+
+# Round-trip times of the provider requests sent during the current search_timed() call
+_round_trips: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar("search_round_trips", default=None)
+
+
+def _note_round_trip(seconds: float):
+    trips = _round_trips.get()
+    if trips is not None:
+        trips.append(seconds)
 
 @dataclass
 class SearchResult:
@@ -63,12 +87,17 @@ class WebSearcher:
         Initialize web searcher.
         
         Args:
-            provider: "duckduckgo" (free), "tavily" (paid), "serpapi" (paid), "google" (paid)
+            provider: "duckduckgo" (free), "tavily" (paid), "serpapi" (paid), "google" (paid),
+                "local" (offline corpus, see local_corpus.py)
             api_key: API key for paid providers
         """
         self.provider = provider
         self.api_key = api_key
-        self.timeout = 10
+        self.timeout = 10  # upper bound; each provider's breaker adapts below it
+        # The local corpus is already an index; caching it would also hide its injected latency
+        self.cache = get_result_cache() if provider != "local" else None
+        self._refreshing: set = set()
+        self._refresh_lock = threading.Lock()
         
         print(f"[WebSearcher] Initialized with provider: {provider}")
     
@@ -83,8 +112,66 @@ class WebSearcher:
         Returns:
             List of SearchResult objects
         """
+        return self.search_timed(query, num_results)[0]
+    
+    def search_timed(self, query: str, num_results: int = 8) -> Tuple[List[SearchResult], Optional[float]]:
+        """
+        search() plus the provider round-trip time in seconds.
+        
+        The time is None when no request reached the provider: a cache hit,
+        an open circuit breaker or a request dropped by the rate limiter.
+        Queueing time is not included.
+        """
         print(f"[WebSearch] Searching for: '{query}' (provider: {self.provider})")
         
+        cached = self._cached(query, num_results)
+        if cached is not None:
+            return cached, None
+        trips: List[float] = []
+        token = _round_trips.set(trips)
+        try:
+            results = self._search_uncached(query, num_results)
+        finally:
+            _round_trips.reset(token)
+        if self.cache is not None:
+            self.cache.put(self.provider, query, num_results, results)
+        return results, (sum(trips) if trips else None)
+    
+    def _cached(self, query: str, num_results: int) -> Optional[List[SearchResult]]:
+        """Cached results, starting a background refresh if they are stale."""
+        if self.cache is None:
+            return None
+        results, state = self.cache.get(self.provider, query, num_results)
+        if track_cache is not None:
+            track_cache("search", results is not None)
+        if results is None:
+            return None
+        print(f"[WebSearch] Cache {state} hit for '{query}' ({len(results)} results)")
+        if state == STALE:
+            self._refresh(query, num_results)
+        return results
+    
+    def _refresh(self, query: str, num_results: int):
+        """Re-run a stale search in the background (one refresh per key at a time)."""
+        key = (query, num_results)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def run():
+            try:
+                with background():
+                    results = self._search_uncached(query, num_results)
+                if self.cache is not None:
+                    self.cache.put(self.provider, query, num_results, results)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=run, daemon=True, name="geo-search-refresh").start()
+    
+    def _search_uncached(self, query: str, num_results: int) -> List[SearchResult]:
         try:
             if self.provider == "duckduckgo":
                 return self._search_duckduckgo(query, num_results)
@@ -94,6 +181,8 @@ class WebSearcher:
                 return self._search_serpapi(query, num_results)
             elif self.provider == "google":
                 return self._search_google(query, num_results)
+            elif self.provider == "local":
+                return self._search_local(query, num_results)
             else:
                 print(f"[WebSearch] Unknown provider: {self.provider}, falling back to DuckDuckGo")
                 return self._search_duckduckgo(query, num_results)
@@ -101,181 +190,199 @@ class WebSearcher:
             print(f"[WebSearch] Error: {e}")
             return []
     
-    def _search_duckduckgo(self, query: str, num_results: int) -> List[SearchResult]:
+    async def asearch(self, query: str, num_results: int = 8) -> List[SearchResult]:
+        """Async variant of search() using the shared httpx client."""
+        print(f"[WebSearch] Searching for: '{query}' (provider: {self.provider}, async)")
+        
+        cached = self._cached(query, num_results)
+        if cached is not None:
+            return cached
+        results = await self._asearch_uncached(query, num_results)
+        if self.cache is not None:
+            self.cache.put(self.provider, query, num_results, results)
+        return results
+    
+    async def _asearch_uncached(self, query: str, num_results: int) -> List[SearchResult]:
+        if self.provider == "local":
+            return await asyncio.to_thread(self._search_uncached, query, num_results)
+        provider = self.provider if self.provider in _PROVIDERS else "duckduckgo"
+        try:
+            if provider == "google" and self._google_api_request(query, num_results) is None:
+                provider = "google_scrape"
+            results = await self._afetch(provider, query, num_results)
+            if results is None and provider == "google":
+                results = await self._afetch("google_scrape", query, num_results)
+            return results or []
+        except Exception as e:
+            print(f"[WebSearch] Error: {e}")
+            return []
+    
+    def _send(self, method: str, url: str, timeout: float, **kwargs):
+        """Issue a request on the pooled keep-alive session for the url's host."""
+        response = get_session(url).request(method, url, timeout=timeout, **kwargs)
+        response.raise_for_status()
+        return response
+    
+    async def _asend(self, method: str, url: str, timeout: float, **kwargs):
+        response = await get_async_client().request(method, url, timeout=timeout, **kwargs)
+        response.raise_for_status()
+        return response
+    
+    def _breaker(self, provider: str, label: str):
+        """The provider's circuit breaker, or None if it is open."""
+        breaker = get_breaker(provider)
+        if not breaker.allow():
+            print(f"[WebSearch] {label} circuit open, skipping")
+            return None
+        return breaker
+    
+    def _fetch(self, provider: str, query: str, num_results: int) -> Optional[List[SearchResult]]:
         """
-        Search using DuckDuckGo (free, no API key needed).
-        Uses HTML scraping as DuckDuckGo doesn't have an official API.
+        Build, send and parse one provider request.
+        
+        Calls go through the provider's circuit breaker, then wait for the
+        host's rate limit (see scheduler.py), and are sent with a timeout that
+        follows the provider's p99 latency (never above self.timeout).
+        
+        Returns None if the request failed, was not admitted by the rate
+        limiter or the breaker is open, [] if the
+        provider is not usable (e.g. missing API key).
         """
+        build, parse, label = _PROVIDERS[provider]
+        request = getattr(self, build)(query, num_results)
+        if request is None:
+            return []
+        breaker = self._breaker(provider, label)
+        if breaker is None:
+            return None
+        method, url, kwargs = request
+        if not get_scheduler().acquire(url):
+            breaker.release()
+            return None
+        start = time.time()
         try:
-            # DuckDuckGo HTML search
-            url = "https://html.duckduckgo.com/html/"
-            params = {"q": query}
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            }
-            
-            response = requests.post(url, data=params, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Parse search results
-            for result_div in soup.find_all('div', class_='result')[:num_results]:
-                try:
-                    # Extract title and URL
-                    title_tag = result_div.find('a', class_='result__a')
-                    if not title_tag:
-                        continue
-                    
-                    title = title_tag.get_text(strip=True)
-                    url = title_tag.get('href', '')
-                    
-                    # Extract snippet
-                    snippet_tag = result_div.find('a', class_='result__snippet')
-                    snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
-                    
-                    # Extract source domain
-                    source_tag = result_div.find('span', class_='result__url')
-                    source = source_tag.get_text(strip=True) if source_tag else url
-                    
-                    # Extract date/timestamp from snippet if available
-                    timestamp = self._extract_date_from_text(snippet + " " + title)
-                    
-                    if title and url:
-                        results.append(SearchResult(
-                            title=title,
-                            url=url,
-                            snippet=snippet or title,
-                            source=source,
-                            timestamp=timestamp
-                        ))
-                except Exception as e:
-                    print(f"[WebSearch] Error parsing result: {e}")
-                    continue
-            
-            print(f"[WebSearch] Found {len(results)} results from DuckDuckGo")
-            return results
-            
+            response = self._send(method, url, min(self.timeout, breaker.timeout()), **kwargs)
+            results = getattr(self, parse)(response, num_results)
         except Exception as e:
-            print(f"[WebSearch] DuckDuckGo search failed: {e}")
+            _note_round_trip(time.time() - start)
+            breaker.record_failure()
+            print(f"[WebSearch] {label} search failed: {e}")
+            return None
+        _note_round_trip(time.time() - start)
+        breaker.record_success(time.time() - start)
+        print(f"[WebSearch] Found {len(results)} results from {label}")
+        return results
+    
+    async def _afetch(self, provider: str, query: str, num_results: int) -> Optional[List[SearchResult]]:
+        build, parse, label = _PROVIDERS[provider]
+        request = getattr(self, build)(query, num_results)
+        if request is None:
             return []
+        breaker = self._breaker(provider, label)
+        if breaker is None:
+            return None
+        method, url, kwargs = request
+        if not await asyncio.to_thread(get_scheduler().acquire, url, current_priority()):
+            breaker.release()
+            return None
+        start = time.time()
+        try:
+            response = await self._asend(method, url, min(self.timeout, breaker.timeout()), **kwargs)
+            results = getattr(self, parse)(response, num_results)
+        except Exception as e:
+            breaker.record_failure()
+            print(f"[WebSearch] {label} search failed: {e}")
+            return None
+        breaker.record_success(time.time() - start)
+        print(f"[WebSearch] Found {len(results)} results from {label}")
+        return results
+    
+    def _search_local(self, query: str, num_results: int) -> List[SearchResult]:
+        """Search the offline corpus (LOCAL_SEARCH_PATH); no network access."""
+        from .local_corpus import get_local_corpus
+        start = time.time()
+        results = get_local_corpus().search(query, num_results)
+        _note_round_trip(time.time() - start)
+        print(f"[WebSearch] Found {len(results)} results from local corpus")
+        return results
+    
+    def _search_duckduckgo(self, query: str, num_results: int) -> List[SearchResult]:
+        """
+        Search using DuckDuckGo (free, no API key needed).
+        Uses HTML scraping as DuckDuckGo doesn't have an official API.
+        """
+        return self._fetch("duckduckgo", query, num_results) or []
+    
+    def _duckduckgo_request(self, query: str, num_results: int) -> _Request:
+        # DuckDuckGo HTML search
+        url = "https://html.duckduckgo.com/html/"
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+        }
+        return "POST", url, {"data": {"q": query}, "headers": headers}
+    
+    def _parse_duckduckgo(self, response, num_results: int) -> List[SearchResult]:
+        return [SearchResult(**r) for r in parse_duckduckgo(response.text, num_results)]
     
     def _extract_date_from_text(self, text: str) -> str:
         """
         Extract date from text using regex patterns.
         Looks for dates like: "Mar 3, 2025", "March 2025", "2025-03-03", etc.
         """
-        import re
-        from datetime import datetime
-        
-        if not text:
-            return ""
-        
-        # Pattern 1: "Mar 3, 2025" or "March 3, 2025"
-        pattern1 = r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{1,2}),?\s+(\d{4})'
-        match1 = re.search(pattern1, text, re.IGNORECASE)
-        if match1:
-            try:
-                date_str = f"{match1.group(1)} {match1.group(2)}, {match1.group(3)}"
-                parsed = datetime.strptime(date_str, "%b %d, %Y")
-                return parsed.strftime("%Y-%m-%d")
-            except:
-                pass
-        
-        # Pattern 2: "3 March 2025" or "3 Mar 2025"
-        pattern2 = r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})'
-        match2 = re.search(pattern2, text, re.IGNORECASE)
-        if match2:
-            try:
-                date_str = f"{match2.group(2)} {match2.group(1)}, {match2.group(3)}"
-                parsed = datetime.strptime(date_str, "%b %d, %Y")
-                return parsed.strftime("%Y-%m-%d")
-            except:
-                pass
-        
-        # Pattern 3: "2025-03-03" (ISO format)
-        pattern3 = r'(\d{4})-(\d{2})-(\d{2})'
-        match3 = re.search(pattern3, text)
-        if match3:
-            return match3.group(0)
-        
-        # Pattern 4: Just year "2025" or "2024" (last resort)
-        pattern4 = r'\b(202[3-9]|203[0-9])\b'
-        match4 = re.search(pattern4, text)
-        if match4:
-            return f"{match4.group(0)}-01-01"  # Default to Jan 1st
-        
-        return ""
+        return extract_date(text)
     
     def _search_tavily(self, query: str, num_results: int) -> List[SearchResult]:
         """Search using Tavily AI API (requires API key)."""
+        return self._fetch("tavily", query, num_results) or []
+    
+    def _tavily_request(self, query: str, num_results: int) -> Optional[_Request]:
         if not self.api_key:
             print("[WebSearch] Tavily requires API key")
-            return []
-        
-        try:
-            url = "https://api.tavily.com/search"
-            payload = {
-                "api_key": self.api_key,
-                "query": query,
-                "search_depth": "advanced",
-                "max_results": num_results
-            }
-            
-            response = requests.post(url, json=payload, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            
-            results = []
-            for item in data.get("results", []):
-                results.append(SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("url", ""),
-                    snippet=item.get("content", ""),
-                    source=item.get("url", "").split("//")[-1].split("/")[0]
-                ))
-            
-            print(f"[WebSearch] Found {len(results)} results from Tavily")
-            return results
-            
-        except Exception as e:
-            print(f"[WebSearch] Tavily search failed: {e}")
-            return []
+            return None
+        payload = {
+            "api_key": self.api_key,
+            "query": query,
+            "search_depth": "advanced",
+            "max_results": num_results
+        }
+        return "POST", "https://api.tavily.com/search", {"json": payload}
+    
+    def _parse_tavily(self, response, num_results: int) -> List[SearchResult]:
+        results = []
+        for item in response.json().get("results", []):
+            results.append(SearchResult(
+                title=item.get("title", ""),
+                url=item.get("url", ""),
+                snippet=item.get("content", ""),
+                source=item.get("url", "").split("//")[-1].split("/")[0]
+            ))
+        return results
     
     def _search_serpapi(self, query: str, num_results: int) -> List[SearchResult]:
         """Search using SerpAPI (requires API key)."""
+        return self._fetch("serpapi", query, num_results) or []
+    
+    def _serpapi_request(self, query: str, num_results: int) -> Optional[_Request]:
         if not self.api_key:
             print("[WebSearch] SerpAPI requires API key")
-            return []
-        
-        try:
-            url = "https://serpapi.com/search"
-            params = {
-                "q": query,
-                "api_key": self.api_key,
-                "num": num_results
-            }
-            
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            
-            results = []
-            for item in data.get("organic_results", []):
-                results.append(SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("link", ""),
-                    snippet=item.get("snippet", ""),
-                    source=item.get("displayed_link", "")
-                ))
-            
-            print(f"[WebSearch] Found {len(results)} results from SerpAPI")
-            return results
-            
-        except Exception as e:
-            print(f"[WebSearch] SerpAPI search failed: {e}")
-            return []
+            return None
+        params = {
+            "q": query,
+            "api_key": self.api_key,
+            "num": num_results
+        }
+        return "GET", "https://serpapi.com/search", {"params": params}
+    
+    def _parse_serpapi(self, response, num_results: int) -> List[SearchResult]:
+        results = []
+        for item in response.json().get("organic_results", []):
+            results.append(SearchResult(
+                title=item.get("title", ""),
+                url=item.get("link", ""),
+                snippet=item.get("snippet", ""),
+                source=item.get("displayed_link", "")
+            ))
+        return results
     
     def _search_google(self, query: str, num_results: int) -> List[SearchResult]:
         """
@@ -294,129 +401,97 @@ class WebSearcher:
     
     def _search_google_api(self, query: str, num_results: int) -> List[SearchResult]:
         """Search using Google Custom Search API (paid, requires API key + CSE ID)."""
-        try:
-            import os
-            cse_id = os.getenv("GOOGLE_CSE_ID", "")
-            if not cse_id:
-                print("[WebSearch] GOOGLE_CSE_ID not set, falling back to scraping")
-                return self._search_google_scrape(query, num_results)
-            
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                "key": self.api_key,
-                "cx": cse_id,
-                "q": query,
-                "num": min(num_results, 10)  # Google API limits to 10
-            }
-            
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            
-            results = []
-            for item in data.get("items", []):
-                results.append(SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("link", ""),
-                    snippet=item.get("snippet", ""),
-                    source=item.get("displayLink", ""),
-                    timestamp=self._extract_date_from_text(item.get("snippet", ""))
-                ))
-            
-            print(f"[WebSearch] Found {len(results)} results from Google API")
-            return results
-            
-        except Exception as e:
-            print(f"[WebSearch] Google API failed: {e}, trying scraping")
+        if self._google_api_request(query, num_results) is None:
+            print("[WebSearch] GOOGLE_CSE_ID not set, falling back to scraping")
+            return self._search_google_scrape(query, num_results)
+        results = self._fetch("google", query, num_results)
+        if results is None:
+            print("[WebSearch] Google API failed, trying scraping")
             return self._search_google_scrape(query, num_results)
+        return results
+    
+    def _google_api_request(self, query: str, num_results: int) -> Optional[_Request]:
+        import os
+        cse_id = os.getenv("GOOGLE_CSE_ID", "")
+        if not self.api_key or not cse_id:
+            return None
+        params = {
+            "key": self.api_key,
+            "cx": cse_id,
+            "q": query,
+            "num": min(num_results, 10)  # Google API limits to 10
+        }
+        return "GET", "https://www.googleapis.com/customsearch/v1", {"params": params}
+    
+    def _parse_google_api(self, response, num_results: int) -> List[SearchResult]:
+        results = []
+        for item in response.json().get("items", []):
+            results.append(SearchResult(
+                title=item.get("title", ""),
+                url=item.get("link", ""),
+                snippet=item.get("snippet", ""),
+                source=item.get("displayLink", ""),
+                timestamp=self._extract_date_from_text(item.get("snippet", ""))
+            ))
+        return results
     
     def _search_google_scrape(self, query: str, num_results: int) -> List[SearchResult]:
         """
         Search Google using free HTML scraping (no API key needed).
         Note: Google may rate-limit this method. Use responsibly.
         """
-        try:
-            # Google search URL
-            url = "https://www.google.com/search"
-            params = {"q": query, "num": num_results}
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Parse organic search results
-            # Google uses different div structures, so we try multiple selectors
-            search_divs = soup.find_all('div', class_='g')
-            
-            for div in search_divs[:num_results]:
-                try:
-                    # Extract title and URL
-                    title_tag = div.find('h3')
-                    if not title_tag:
-                        continue
-                    
-                    title = title_tag.get_text(strip=True)
-                    
-                    # Find the link (usually in parent <a> tag)
-                    link_tag = div.find('a', href=True)
-                    if not link_tag:
-                        continue
-                    
-                    url = link_tag['href']
-                    
-                    # Skip non-http links (like javascript:void(0))
-                    if not url.startswith('http'):
-                        continue
-                    
-                    # Extract snippet/description
-                    snippet_divs = div.find_all(['div', 'span'], class_=lambda x: x and ('VwiC3b' in x or 'IsZvec' in x or 'aCOpRe' in x))
-                    snippet = ""
-                    for s_div in snippet_divs:
-                        text = s_div.get_text(strip=True)
-                        if len(text) > len(snippet):
-                            snippet = text
-                    
-                    # If no snippet found, try alternative selectors
-                    if not snippet:
-                        snippet_tag = div.find('div', {'data-sncf': '1'})
-                        if snippet_tag:
-                            snippet = snippet_tag.get_text(strip=True)
-                    
-                    # Extract source domain
-                    cite_tag = div.find('cite')
-                    source = cite_tag.get_text(strip=True) if cite_tag else url.split("//")[-1].split("/")[0]
-                    
-                    # Extract timestamp
-                    timestamp = self._extract_date_from_text(snippet + " " + title)
-                    
-                    if title and url:
-                        results.append(SearchResult(
-                            title=title,
-                            url=url,
-                            snippet=snippet or title,
-                            source=source,
-                            timestamp=timestamp
-                        ))
-                        
-                except Exception as e:
-                    print(f"[WebSearch] Error parsing Google result: {e}")
-                    continue
-            
-            print(f"[WebSearch] Found {len(results)} results from Google (scraping)")
-            return results
-            
-        except Exception as e:
-            print(f"[WebSearch] Google scraping failed: {e}")
-            return []
+        return self._fetch("google_scrape", query, num_results) or []
+    
+    def _google_scrape_request(self, query: str, num_results: int) -> _Request:
+        # Google search URL
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip, deflate, br",
+            "DNT": "1",
+        }
+        return "GET", "https://www.google.com/search", {"params": {"q": query, "num": num_results}, "headers": headers}
+    
+    def _parse_google_scrape(self, response, num_results: int) -> List[SearchResult]:
+        return [SearchResult(**r) for r in parse_google(response.text, num_results)]
+
+
+# provider -> (request builder, response parser, label used in logs)
+_PROVIDERS: Dict[str, Tuple[str, str, str]] = {
+    "duckduckgo": ("_duckduckgo_request", "_parse_duckduckgo", "DuckDuckGo"),
+    "tavily": ("_tavily_request", "_parse_tavily", "Tavily"),
+    "serpapi": ("_serpapi_request", "_parse_serpapi", "SerpAPI"),
+    "google": ("_google_api_request", "_parse_google_api", "Google API"),
+    "google_scrape": ("_google_scrape_request", "_parse_google_scrape", "Google (scraping)"),
+}
+
+
+_searchers: Dict[Tuple[str, str], WebSearcher] = {}
+_searchers_lock = threading.Lock()
+
+
+def get_searcher(provider: str = "duckduckgo", api_key: Optional[str] = None) -> WebSearcher:
+    """
+    Shared WebSearcher for a provider (one per provider/API key per process).
+    
+    If api_key is None it is read from <PROVIDER>_API_KEY.
+    """
+    import os
+    if api_key is None:
+        api_key = os.getenv(f"{provider.upper()}_API_KEY", "")
+    key = (provider, api_key)
+    searcher = _searchers.get(key)
+    if searcher is None:
+        with _searchers_lock:
+            searcher = _searchers.get(key)
+            if searcher is None:
+                searcher = WebSearcher(provider=provider, api_key=api_key)
+                _searchers[key] = searcher
+    return searcher
+
+
+_search_flights: SingleFlight = SingleFlight()
 
 
 def search_web_realtime(query: str, provider: str = "duckduckgo", num_results: int = 8) -> List[Dict[str, Any]]:
@@ -425,18 +500,30 @@ def search_web_realtime(query: str, provider: str = "duckduckgo", num_results: i
     
     Args:
         query: Search query
-        provider: Search provider to use
+        provider: Search provider to use; a comma-separated list
+            (e.g. "duckduckgo,tavily") enables hedged search across them
         num_results: Number of results
         
     Returns:
         List of facts extracted from search results
     """
-    import os
-    api_key = os.getenv(f"{provider.upper()}_API_KEY", "")
-    
-    searcher = WebSearcher(provider=provider, api_key=api_key)
-    results = searcher.search(query, num_results)
-    
-    # Convert to facts
-    facts = [result.to_fact() for result in results]
-    return facts
+    def run() -> List[Dict[str, Any]]:
+        if "," in provider:
+            from .hedging import get_hedged_searcher
+            results = get_hedged_searcher(provider).search(query, num_results)
+        else:
+            results = get_searcher(provider).search(query, num_results)
+        # Convert to facts
+        return [result.to_fact() for result in results]
+
+    from ..config import settings
+    if not settings.singleflight_enabled:
+        return run()
+    # Concurrent identical searches share one provider call
+    return _search_flights.do((provider, normalize_key(query), num_results), run)
+
+
+async def asearch_web_realtime(query: str, provider: str = "duckduckgo", num_results: int = 8) -> List[Dict[str, Any]]:
+    """Async variant of search_web_realtime (for use inside an event loop)."""
+    results = await get_searcher(provider).asearch(query, num_results)
+    return [result.to_fact() for result in results]
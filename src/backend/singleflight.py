@@ -0,0 +1,141 @@
+"""
+Request coalescing ("single flight").
+
+When many callers ask for the same thing at once, only the first one does
+the work and the rest wait for its result. SingleFlight does this for plain
+calls. StreamFlight does it for generators: one producer thread drains the
+generator into a shared buffer, and every subscriber replays the buffer
+from the start and then follows it live. Late joiners therefore receive the
+complete token stream. Each subscriber gets its own copy of every item, and
+the producer runs in a copy of the first subscriber's context (search
+priority, deadlines and other contextvars).
+
+Keys are only coalesced while a computation is in flight; nothing is cached
+afterwards.
+"""
+
+import contextvars
+import copy
+import threading
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_key(text: str) -> str:
+    """Case- and whitespace-insensitive form of a query."""
+    return " ".join(str(text or "").lower().split())
+
+
+class _Call(Generic[T]):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self, copy_result: bool = True):
+        # Followers get a deep copy so they can mutate results independently
+        self.copy_result = copy_result
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+            return call.result  # type: ignore[return-value]
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result) if self.copy_result else call.result  # type: ignore[return-value]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class _Stream:
+    def __init__(self):
+        self.items: List[Any] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.cond = threading.Condition()
+
+
+class StreamFlight:
+    """Fan one generator out to every concurrent subscriber with the same key."""
+
+    def __init__(self, copy_items: bool = True):
+        # Subscribers get deep copies so one consumer mutating an event cannot affect the others
+        self.copy_items = copy_items
+        self._streams: Dict[Hashable, _Stream] = {}
+        self._lock = threading.Lock()
+
+    def _produce(self, key: Hashable, stream: _Stream, factory: Callable[[], Iterator[Any]]):
+        try:
+            for item in factory():
+                with stream.cond:
+                    stream.items.append(item)
+                    stream.cond.notify_all()
+        except BaseException as e:
+            stream.error = e
+        finally:
+            with self._lock:
+                if self._streams.get(key) is stream:
+                    del self._streams[key]
+            with stream.cond:
+                stream.finished = True
+                stream.cond.notify_all()
+
+    def subscribe(self, key: Hashable, factory: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """
+        Iterate the shared stream for key, starting it if nobody else has.
+
+        The producer runs on its own thread, so a subscriber that stops
+        early does not cut the stream short for the others.
+        """
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = _Stream()
+                self._streams[key] = stream
+                ctx = contextvars.copy_context()
+                threading.Thread(
+                    target=ctx.run, args=(self._produce, key, stream, factory), daemon=True, name="geo-stream-flight"
+                ).start()
+        return self._follow(stream)
+
+    def _follow(self, stream: _Stream) -> Iterator[Any]:
+        i = 0
+        while True:
+            with stream.cond:
+                while i >= len(stream.items) and not stream.finished:
+                    stream.cond.wait()
+                pending = stream.items[i:]
+                finished = stream.finished
+            for item in pending:
+                yield copy.deepcopy(item) if self.copy_items else item
+            i += len(pending)
+            if finished and i >= len(stream.items):
+                if stream.error is not None:
+                    raise stream.error
+                return
+
+    def in_flight(self) -> int:
+        return len(self._streams)
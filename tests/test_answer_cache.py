@@ -0,0 +1,122 @@
+"""
+Tests for the semantic answer cache.
+"""
+
+import time
+
+import numpy as np
+
+from src.backend.graph.client import GraphClient
+from src.backend.rag.answer_cache import SemanticAnswerCache, FRESH, STALE, MISS
+from src.backend.rag.llm import LLM
+from src.backend.rag.pipeline import RAGPipeline
+
+
+def unit(*xs):
+    v = np.asarray(xs, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+FACTS = [{"id": "f1", "subject": "Python", "predicate": "content", "object": "a language", "idx": 1}]
+
+
+class TestSemanticAnswerCache:
+    """Test lookup, TTL and eviction."""
+
+    def test_near_duplicate_hits(self):
+        cache = SemanticAnswerCache(max_distance=0.05)
+        cache.store("what is python", None, unit(1, 0, 0), "A language.", FACTS)
+
+        entry, state = cache.lookup(unit(1, 0.05, 0), None)
+        assert state == FRESH
+        assert entry.answer == "A language."
+
+        entry, state = cache.lookup(unit(0, 1, 0), None)
+        assert entry is None and state == MISS
+
+    def test_scope_must_match(self):
+        cache = SemanticAnswerCache()
+        cache.store("q", 5, unit(1, 0), "answer", FACTS)
+        assert cache.lookup(unit(1, 0), 3)[1] == MISS
+        assert cache.lookup(unit(1, 0), 5)[1] == FRESH
+
+    def test_recent_queries_expire_sooner(self):
+        cache = SemanticAnswerCache(ttl_recent=0.0, ttl_evergreen=60.0, stale_seconds=0.0)
+        cache.store("latest news", None, unit(1, 0), "old news", FACTS, recent=True)
+        cache.store("what is rust", None, unit(0, 1), "a language", FACTS, recent=False)
+        time.sleep(0.01)
+
+        assert cache.lookup(unit(1, 0), None)[1] == MISS
+        assert cache.lookup(unit(0, 1), None)[1] == FRESH
+
+    def test_stale_while_revalidate(self):
+        cache = SemanticAnswerCache(ttl_evergreen=0.0, stale_seconds=60.0)
+        cache.store("q", None, unit(1, 0), "answer", FACTS)
+        time.sleep(0.01)
+
+        entry, state = cache.lookup(unit(1, 0), None)
+        assert state == STALE
+        assert cache.claim_refresh(entry) is True
+        assert cache.claim_refresh(entry) is False
+
+    def test_size_bounded(self):
+        cache = SemanticAnswerCache(max_entries=2)
+        for i in range(4):
+            vec = np.zeros(4, dtype=np.float32)
+            vec[i] = 1.0
+            cache.store(f"q{i}", None, vec, "a", FACTS)
+        assert len(cache) == 2
+
+    def test_returned_facts_are_copies(self):
+        cache = SemanticAnswerCache()
+        cache.store("q", None, unit(1, 0), "a", FACTS)
+        entry, _ = cache.lookup(unit(1, 0), None)
+        facts = entry.copy_facts()
+        facts[0]["idx"] = 99
+        assert entry.facts[0]["idx"] == 1
+
+
+class FakeEmbedder:
+    """Maps queries onto a couple of fixed directions."""
+
+    def encode(self, texts, normalize_embeddings=True):
+        def vec(t):
+            return unit(1, 0.01, 0) if "python" in t.lower() else unit(0, 0, 1)
+        if isinstance(texts, str):
+            return vec(texts)
+        return np.vstack([vec(t) for t in texts])
+
+
+class TestPipelineAnswerCache:
+    """RAGPipeline.answer and answer_stream reuse cached answers."""
+
+    def _pipeline(self, monkeypatch):
+        rag = RAGPipeline(GraphClient(), LLM())
+        rag._embedder = FakeEmbedder()
+        calls = []
+
+        def fake_retrieve(query, k=None, **kwargs):
+            calls.append(query)
+            return [dict(f) for f in FACTS]
+
+        monkeypatch.setattr(rag, "retrieve", fake_retrieve)
+        return rag, calls
+
+    def test_answer_served_from_cache(self, monkeypatch):
+        rag, calls = self._pipeline(monkeypatch)
+        first, _ = rag.answer("What is Python?")
+        second, facts = rag.answer("what is python")
+
+        assert calls == ["What is Python?"]
+        assert first == second
+        assert facts[0]["id"] == "f1"
+
+    def test_stream_served_from_cache(self, monkeypatch):
+        rag, calls = self._pipeline(monkeypatch)
+        streamed = list(rag.answer_stream("What is Python?"))
+        text = "".join(c["content"] for c in streamed if c["type"] == "text")
+
+        cached = list(rag.answer_stream("what is python"))
+        assert calls == ["What is Python?"]
+        assert cached[0] == {"type": "facts", "facts": streamed[0]["facts"]}
+        assert cached[1]["content"] == text
@@ -0,0 +1,203 @@
+"""
+Tests for the async graph client.
+"""
+
+import asyncio
+import threading
+
+from src.backend.config import settings
+from src.backend.graph import async_client
+from src.backend.graph.async_client import AsyncGraphClient
+from src.backend.graph.client import GraphClient
+
+
+class FakeRecord:
+    def __init__(self, data):
+        self._data = data
+
+    def data(self):
+        return dict(self._data)
+
+
+class FakeResult:
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for row in self.rows:
+            self.log.append(("fetch", row))
+            yield FakeRecord(row)
+
+
+class FakeAsyncSession:
+    def __init__(self, driver, kwargs):
+        self.driver = driver
+        self.kwargs = kwargs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.driver.closed_sessions += 1
+        return False
+
+    async def run(self, cypher, params=None):
+        self.driver.calls.append(("run", cypher, params or {}))
+        return FakeResult(self.driver.rows, self.driver.log)
+
+    async def execute_read(self, fn, *args):
+        self.driver.calls.append(("read",) + args)
+        return await fn(self, *args)
+
+    async def execute_write(self, fn, *args):
+        self.driver.calls.append(("write",) + args)
+        return await fn(self, *args)
+
+
+class FakeAsyncDriver:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.calls = []
+        self.log = []
+        self.sessions = []
+        self.closed_sessions = 0
+
+    def session(self, **kwargs):
+        self.sessions.append(kwargs)
+        return FakeAsyncSession(self, kwargs)
+
+
+def _client(driver):
+    g = GraphClient()
+    g._use_memory = True
+    client = AsyncGraphClient(g)
+    client._driver = driver
+    client._use_memory = False
+    return client
+
+
+class TestAsyncGraphClient:
+    """Managed transactions, routing and streaming."""
+
+    def test_read_routes_to_readers(self, monkeypatch):
+        monkeypatch.setattr(settings, "neo4j_database", "geo")
+        driver = FakeAsyncDriver(rows=[{"f": {"id": "f1", "subject": "s"}}])
+        client = _client(driver)
+
+        rows = asyncio.run(client.facts_by_subject("s", limit=5))
+        assert rows == [{"id": "f1", "subject": "s"}]
+        assert driver.calls[0][0] == "read"
+        assert driver.sessions[0]["default_access_mode"] == async_client.READ_ACCESS
+        assert driver.sessions[0]["database"] == "geo"
+        assert driver.closed_sessions == 1
+
+    def test_upsert_uses_write_transactions(self):
+        driver = FakeAsyncDriver()
+        client = _client(driver)
+        facts = [{"id": f"f{i}", "subject": "s", "predicate": "p", "object": f"o{i}", "source_url": "https://a.org"} for i in range(5)]
+
+        assert asyncio.run(client.upsert_facts(facts, batch_size=2)) == 5
+        writes = [c for c in driver.calls if c[0] == "write"]
+        assert [len(c[2]["rows"]) for c in writes] == [2, 2, 1]
+        assert all("default_access_mode" not in s for s in driver.sessions)
+
+    def test_stream_yields_incrementally(self):
+        driver = FakeAsyncDriver(rows=[{"f": {"id": f"f{i}"}} for i in range(3)])
+        client = _client(driver)
+
+        async def first():
+            async for row in client.stream("MATCH (f:Fact) RETURN f"):
+                return row
+
+        assert asyncio.run(first()) == {"f": {"id": "f0"}}
+        assert len(driver.log) == 1
+
+    def test_search_falls_back_to_contains(self):
+        driver = FakeAsyncDriver(rows=[{"f": {"id": "f1", "truth_weight": 0.8}, "score": 1.0, "corroboration": 2}])
+        client = _client(driver)
+
+        async def failing_read(cypher, **params):
+            raise RuntimeError("no such index")
+
+        original = client.read
+
+        async def read(cypher, **params):
+            if "queryNodes" in cypher:
+                return await failing_read(cypher, **params)
+            return await original(cypher, **params)
+
+        client.read = read
+        facts = asyncio.run(client.search_facts(["rust"]))
+        assert facts[0]["id"] == "f1" and facts[0]["corroboration_count"] == 2
+        assert client._fulltext_available is False
+
+    def test_transient_fulltext_error_keeps_index(self):
+        driver = FakeAsyncDriver(rows=[{"f": {"id": "f1"}, "score": 1.0, "corroboration": 1}])
+        client = _client(driver)
+        original = client.read
+
+        class ServiceUnavailable(Exception):
+            pass
+
+        async def read(cypher, **params):
+            if "queryNodes" in cypher:
+                raise ServiceUnavailable("connection reset")
+            return await original(cypher, **params)
+
+        client.read = read
+        assert [f["id"] for f in asyncio.run(client.search_facts(["rust"]))] == ["f1"]
+        assert client._fulltext_available is True
+
+    def test_vector_index_updated_off_loop(self):
+        driver = FakeAsyncDriver()
+        client = _client(driver)
+        threads = []
+        client.fallback._update_vector_index = lambda batch: threads.append(threading.current_thread())
+        asyncio.run(client.upsert_facts([{"id": "f1", "subject": "s", "predicate": "p", "object": "o", "source_url": "u"}]))
+        assert threads and threads[0] is not threading.main_thread()
+
+
+class TestMemoryMode:
+    """Without Neo4j the client delegates to the sync memory store."""
+
+    def test_delegates_to_fallback(self):
+        g = GraphClient()
+        g._use_memory = True
+        client = AsyncGraphClient(g)
+        facts = [{"id": "f1", "subject": "Rust", "predicate": "is_a", "object": "language", "source_url": "https://rust-lang.org"}]
+
+        async def scenario():
+            await client.upsert_facts(facts)
+            found = await client.search_facts(["rust"])
+            exported = [f async for f in client.export_facts()]
+            return found, exported
+
+        found, exported = asyncio.run(scenario())
+        assert [f["id"] for f in found] == ["f1"]
+        assert [f["id"] for f in exported] == ["f1"]
+        assert asyncio.run(client.read("RETURN 1")) == []
+
+    def test_connect_failure_stays_in_memory(self, monkeypatch):
+        class BrokenDriver:
+            closed = False
+
+            async def verify_connectivity(self):
+                raise OSError("connection refused")
+
+            async def close(self):
+                BrokenDriver.closed = True
+
+        class FakeAsyncGraphDatabase:
+            @staticmethod
+            def driver(uri, auth=None, **config):
+                assert config["max_connection_pool_size"] == settings.neo4j_max_pool_size
+                return BrokenDriver()
+
+        monkeypatch.setattr(async_client, "AsyncGraphDatabase", FakeAsyncGraphDatabase)
+        client = AsyncGraphClient()
+        assert asyncio.run(client.connect()) is False
+        assert client._use_memory and BrokenDriver.closed
@@ -0,0 +1,150 @@
+"""
+Tests for batched fact writes (UNWIND upserts).
+"""
+
+import pytest
+
+from src.backend.config import settings
+from src.backend.graph.client import GraphClient
+from src.backend.ingest import ingestor as ingestor_module
+from src.backend.ingest.ingestor import Ingestor
+
+
+class TransientError(Exception):
+    def is_retryable(self):
+        return True
+
+
+class FakeTx:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def run(self, cypher, **params):
+        self.calls.append((cypher, params))
+        return self
+
+    def consume(self):
+        return None
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn):
+        if self.driver.failures:
+            self.driver.failures -= 1
+            raise self.driver.error("deadlock detected")
+        return fn(FakeTx(self.driver.calls))
+
+
+class FakeDriver:
+    def __init__(self, failures=0, error=TransientError):
+        self.calls = []
+        self.failures = failures
+        self.error = error
+
+    def session(self):
+        return FakeSession(self)
+
+
+def _neo4j_graph(driver):
+    g = GraphClient()
+    g._use_memory = False
+    g._driver = driver
+    return g
+
+
+def _facts(n):
+    return [{"id": f"f{i}", "subject": f"s{i % 3}", "predicate": "p", "object": f"o{i}", "source_url": f"https://{i}.org", "truth_weight": 0.5} for i in range(n)]
+
+
+class TestUpsertFacts:
+    """GraphClient.upsert_facts."""
+
+    def test_unwind_batches(self):
+        driver = FakeDriver()
+        g = _neo4j_graph(driver)
+        assert g.upsert_facts(_facts(25), batch_size=10) == 25
+
+        assert [len(params["rows"]) for _, params in driver.calls] == [10, 10, 5]
+        cypher, params = driver.calls[0]
+        assert cypher.startswith("UNWIND $rows AS row")
+        assert set(params["rows"][0]) == {"id", "subject", "predicate", "object", "source_url", "truth_weight"}
+
+    def test_claims_locked_before_recount(self):
+        driver = FakeDriver()
+        _neo4j_graph(driver).upsert_facts(_facts(3))
+        cypher = driver.calls[0][0]
+        assert cypher.index("MERGE (c:Claim") < cypher.index("SET c._lock = true") < cypher.index("OPTIONAL MATCH (g:Fact")
+        assert "ORDER BY claim[0], claim[1]" in cypher and "REMOVE c._lock" in cypher
+
+    def test_retries_transient_errors(self, monkeypatch):
+        monkeypatch.setattr("src.backend.graph.client.time.sleep", lambda s: None)
+        driver = FakeDriver(failures=2)
+        g = _neo4j_graph(driver)
+        g.upsert_facts(_facts(3))
+        assert len(driver.calls) == 1
+
+    def test_gives_up(self, monkeypatch):
+        monkeypatch.setattr("src.backend.graph.client.time.sleep", lambda s: None)
+        monkeypatch.setattr(settings, "neo4j_write_retries", 1)
+        g = _neo4j_graph(FakeDriver(failures=5))
+        with pytest.raises(TransientError):
+            g.upsert_facts(_facts(3))
+
+    def test_other_errors_not_retried(self):
+        driver = FakeDriver(failures=1, error=ValueError)
+        g = _neo4j_graph(driver)
+        with pytest.raises(ValueError):
+            g.upsert_facts(_facts(3))
+        assert driver.failures == 0 and driver.calls == []
+
+    def test_memory_mode(self):
+        g = GraphClient()
+        g._use_memory = True
+        assert g.upsert_facts(_facts(5)) == 5
+        assert [f["id"] for f in g.facts_by_subject("s0")] == ["f0", "f3"]
+
+
+class TestIngestorBuffering:
+    """The ingestor flushes facts in batches."""
+
+    def test_flush_at_batch_size(self, monkeypatch):
+        monkeypatch.setattr(settings, "neo4j_write_batch_size", 4)
+        g = GraphClient()
+        g._use_memory = True
+        batches = []
+        original = g.upsert_facts
+        monkeypatch.setattr(g, "upsert_facts", lambda facts: batches.append(len(facts)) or original(facts))
+
+        ing = Ingestor(g, use_pdf_extraction=False, use_deduplication=False)
+        for f in _facts(10):
+            ing._buffer([f])
+        ing.flush()
+        assert batches == [4, 4, 2]
+        assert ing.flush() == 0
+
+    def test_partial_feed_is_flushed(self, monkeypatch):
+        monkeypatch.setattr(settings, "neo4j_write_batch_size", 100)
+        monkeypatch.setattr(ingestor_module, "_HAS_EXT", True)
+        g = GraphClient()
+        g._use_memory = True
+
+        def parse(url):
+            if url == "https://bad.example/feed":
+                raise ConnectionError("feed unreachable")
+            return type("Feed", (), {"entries": [{"link": f"{url}/{i}", "title": f"Post {i}"} for i in range(3)]})()
+
+        monkeypatch.setattr(ingestor_module, "feedparser", type("FeedParser", (), {"parse": staticmethod(parse)}), raising=False)
+        ing = Ingestor(g, use_pdf_extraction=False, use_deduplication=False)
+        with pytest.raises(ConnectionError):
+            ing.ingest_rss(["https://good.example/feed", "https://bad.example/feed"])
+        assert len(g._store) == 3
+        assert ing.flush() == 0
@@ -0,0 +1,85 @@
+"""
+Tests for cross-request micro-batching of model inference.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.backend.rag.batching import BatchedEmbedder, BatchedReranker, MicroBatcher
+
+
+class FakeCrossEncoder:
+    """Scores a pair by the length of its document; records batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, pairs, batch_size=32):
+        self.batch_sizes.append(len(pairs))
+        return np.array([float(len(doc)) for _, doc in pairs])
+
+
+class FakeSentenceTransformer:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def encode(self, texts, normalize_embeddings=False, batch_size=32):
+        self.batch_sizes.append(len(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+def run_concurrently(fn, args_list):
+    results = [None] * len(args_list)
+    barrier = threading.Barrier(len(args_list))
+
+    def worker(i, args):
+        barrier.wait()
+        results[i] = fn(*args)
+
+    threads = [threading.Thread(target=worker, args=(i, a)) for i, a in enumerate(args_list)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestMicroBatching:
+    """Concurrent callers share batches and get their own rows back."""
+
+    def test_reranker_batches_and_routes(self):
+        model = FakeCrossEncoder()
+        reranker = BatchedReranker(model, max_batch_size=1000, max_wait_ms=50)
+        requests = [[("q", "x" * (i * 10 + j)) for j in range(5)] for i in range(8)]
+
+        results = run_concurrently(reranker.predict, [(r,) for r in requests])
+
+        for req, scores in zip(requests, results):
+            assert scores.tolist() == [float(len(doc)) for _, doc in req]
+        assert len(model.batch_sizes) < len(requests)
+        assert sum(model.batch_sizes) == 40
+
+    def test_max_batch_size_splits_batches(self):
+        seen = []
+        batcher = MicroBatcher(lambda xs: (seen.append(len(xs)) or xs), max_batch_size=4, max_wait_ms=50)
+        results = run_concurrently(batcher.submit, [([i, i],) for i in range(6)])
+
+        assert results == [[i, i] for i in range(6)]
+        assert all(size <= 6 for size in seen)  # a batch closes once it reaches 4 items
+
+    def test_embedder_single_string(self):
+        embedder = BatchedEmbedder(FakeSentenceTransformer(), max_wait_ms=1)
+        vec = embedder.encode("abc", normalize_embeddings=True)
+        mat = embedder.encode(["a", "bb"], normalize_embeddings=True)
+        assert vec.tolist() == [3.0, 1.0]
+        assert mat.shape == (2, 2)
+
+    def test_errors_reach_every_caller(self):
+        def boom(xs):
+            raise RuntimeError("model failed")
+
+        batcher = MicroBatcher(boom, max_wait_ms=1)
+        with pytest.raises(RuntimeError):
+            batcher.submit([1])
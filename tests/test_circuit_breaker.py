@@ -0,0 +1,77 @@
+"""
+Tests for per-provider circuit breakers and adaptive timeouts.
+"""
+
+import time
+
+import requests
+
+from src.backend.search.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_breaker, reset_breakers
+from src.backend.search.web_searcher import WebSearcher
+
+
+class TestCircuitBreaker:
+    """State transitions and timeouts."""
+
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker("p", failure_rate=0.5, window=10, min_calls=4)
+        for _ in range(2):
+            breaker.record_success(0.1)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker("p", min_calls=1, open_seconds=0.05)
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        time.sleep(0.06)
+
+        assert breaker.allow() is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is False  # one probe at a time
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        time.sleep(0.06)
+        assert breaker.allow() is True
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED
+        assert breaker.status()["calls"] == 0
+
+    def test_timeout_follows_p99(self):
+        breaker = CircuitBreaker("p", min_timeout=0.5, max_timeout=10.0, timeout_multiplier=2.0, min_latency_samples=5)
+        assert breaker.timeout() == 10.0
+        for _ in range(50):
+            breaker.record_success(0.4)
+        assert abs(breaker.timeout() - 0.8) < 1e-6
+
+        fast = CircuitBreaker("q", min_timeout=0.5, min_latency_samples=1)
+        fast.record_success(0.01)
+        assert fast.timeout() == 0.5
+
+
+class TestSearcherBreaker:
+    """WebSearcher stops calling a failing provider."""
+
+    def test_open_breaker_short_circuits(self, monkeypatch):
+        reset_breakers()
+        searcher = WebSearcher(provider="duckduckgo")
+        searcher.cache = None
+        calls = []
+
+        def failing_send(method, url, timeout, **kwargs):
+            calls.append(timeout)
+            raise requests.ConnectionError("down")
+
+        monkeypatch.setattr(searcher, "_send", failing_send)
+        breaker = get_breaker("duckduckgo")
+        for _ in range(breaker.min_calls + 3):
+            assert searcher.search("anything") == []
+
+        assert len(calls) == breaker.min_calls
+        assert breaker.state == OPEN
+        assert all(t <= searcher.timeout for t in calls)
+        reset_breakers()
@@ -0,0 +1,131 @@
+"""
+Tests for concurrent fan-out of query variants in RAGPipeline.retrieve.
+"""
+
+import time
+
+import pytest
+
+from src.backend.config import settings
+from src.backend.graph.client import GraphClient
+from src.backend.rag import pipeline as pipeline_module
+from src.backend.rag.llm import LLM
+from src.backend.rag.pipeline import RAGPipeline
+from src.backend.search.scheduler import current_deadline
+
+
+def _fake_search(delays):
+    """Build a search_web_realtime stand-in that sleeps per query."""
+    def search(query, provider="duckduckgo", num_results=8):
+        time.sleep(delays.get(query, 0.0))
+        return [{
+            "id": f"https://example.com/{query.replace(' ', '-')}#snippet",
+            "subject": query,
+            "predicate": "content",
+            "object": f"snippet about {query}",
+            "source_url": f"https://example.com/{query.replace(' ', '-')}",
+            "truth_weight": 0.5,
+            "score": 0.8,
+        }]
+    return search
+
+
+@pytest.fixture
+def rag(monkeypatch):
+    monkeypatch.setattr(pipeline_module, "_HAS_WEB_SEARCH", True)
+    return RAGPipeline(GraphClient(), LLM())
+
+
+class TestConcurrentRetrieval:
+    """Test the concurrent retrieval mode."""
+
+    def test_variants_run_concurrently(self, rag, monkeypatch):
+        """Three slow variants should cost about one variant of latency."""
+        delays = {"a one": 0.3, "b two": 0.3, "c three": 0.3}
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", _fake_search(delays))
+        monkeypatch.setattr(settings, "concurrent_retrieval", True)
+        monkeypatch.setattr(settings, "retrieval_variant_timeout", 5.0)
+
+        start = time.time()
+        facts = rag._search_variants(list(delays), "duckduckgo", 3)
+        elapsed = time.time() - start
+
+        assert len(facts) == 3
+        assert elapsed < 0.8
+
+    def test_slow_variant_is_dropped(self, rag, monkeypatch):
+        """A variant slower than the timeout must not block the others."""
+        delays = {"fast one": 0.0, "slow one": 2.0}
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", _fake_search(delays))
+        monkeypatch.setattr(settings, "concurrent_retrieval", True)
+        monkeypatch.setattr(settings, "retrieval_variant_timeout", 0.3)
+
+        start = time.time()
+        facts = rag._search_variants(list(delays), "duckduckgo", 3)
+        elapsed = time.time() - start
+
+        assert [f["subject"] for f in facts.values()] == ["fast one"]
+        assert elapsed < 1.5
+
+    def test_duplicates_are_merged(self, rag, monkeypatch):
+        """Identical fact IDs from different variants are kept once."""
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", lambda q, **kw: [{"id": "same", "subject": q}])
+        monkeypatch.setattr(settings, "concurrent_retrieval", True)
+
+        facts = rag._search_variants(["x", "y", "z"], "duckduckgo", 3)
+        assert list(facts) == ["same"]
+
+    def test_sequential_mode(self, rag, monkeypatch):
+        """Disabling concurrency keeps the original in-order loop."""
+        delays = {"first": 0.0, "second": 0.0}
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", _fake_search(delays))
+        monkeypatch.setattr(settings, "concurrent_retrieval", False)
+
+        facts = rag._search_variants(list(delays), "duckduckgo", 3)
+        assert [f["subject"] for f in facts.values()] == ["first", "second"]
+
+    def test_timeout_counts_from_start(self, rag, monkeypatch):
+        """Variants queued behind a busy pool still get their full timeout once they run."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(pipeline_module, "_get_executor", lambda name: pool)
+        delays = {"a one": 0.2, "b two": 0.2}
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", _fake_search(delays))
+        monkeypatch.setattr(settings, "concurrent_retrieval", True)
+        monkeypatch.setattr(settings, "retrieval_variant_timeout", 0.3)
+
+        facts = rag._search_variants(list(delays), "duckduckgo", 3)
+        assert [f["subject"] for f in facts.values()] == ["a one", "b two"]
+        pool.shutdown()
+
+    def test_merge_follows_query_order(self, rag, monkeypatch):
+        """The first variant wins a dedup tie even when it finishes last."""
+        delays = {"first": 0.2, "second": 0.0}
+
+        def search(query, provider="duckduckgo", num_results=8):
+            time.sleep(delays[query])
+            return [{"id": "same", "subject": query}]
+
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", search)
+        monkeypatch.setattr(settings, "concurrent_retrieval", True)
+        monkeypatch.setattr(settings, "retrieval_variant_timeout", 5.0)
+
+        facts = rag._search_variants(list(delays), "duckduckgo", 3)
+        assert facts["same"]["subject"] == "first"
+
+    def test_variant_deadline_reaches_scheduler(self, rag, monkeypatch):
+        """Searches inside a variant see its deadline, so queued requests give up with it."""
+        seen = []
+
+        def search(query, provider="duckduckgo", num_results=8):
+            seen.append(current_deadline() - time.monotonic())
+            return []
+
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", search)
+        monkeypatch.setattr(settings, "concurrent_retrieval", True)
+        monkeypatch.setattr(settings, "retrieval_variant_timeout", 2.0)
+
+        rag._search_variants(["one", "two"], "duckduckgo", 3)
+        assert len(seen) == 2 and all(1.5 < left <= 2.0 for left in seen)
+        assert current_deadline() is None
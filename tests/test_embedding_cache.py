@@ -0,0 +1,69 @@
+"""
+Tests for the two-tier embedding cache.
+"""
+
+import numpy as np
+
+from src.backend.rag.embedding_cache import EmbeddingCache, cache_key
+
+
+class CountingEncoder:
+    """Deterministic fake encoder that records every text it encodes."""
+
+    def __init__(self, dim: int = 8):
+        self.dim = dim
+        self.calls = []
+
+    def __call__(self, texts, normalize_embeddings=True):
+        self.calls.append(list(texts))
+        out = []
+        for t in texts:
+            rng = np.random.default_rng(abs(hash(t.lower())) % (2 ** 32))
+            v = rng.standard_normal(self.dim).astype(np.float32)
+            out.append(v / np.linalg.norm(v))
+        return np.vstack(out)
+
+
+class TestEmbeddingCache:
+    """Test the LRU and mmap tiers."""
+
+    def test_hits_skip_encoder(self):
+        """Only misses are sent to the encoder."""
+        enc = CountingEncoder()
+        cache = EmbeddingCache("test-model")
+
+        first = cache.encode(enc, ["alpha", "beta"])
+        second = cache.encode(enc, ["beta", "gamma"])
+
+        assert first.shape == (2, 8)
+        assert enc.calls == [["alpha", "beta"], ["gamma"]]
+        np.testing.assert_allclose(first[1], second[0])
+
+    def test_single_string_returns_vector(self):
+        """A single query string returns a 1-D vector."""
+        cache = EmbeddingCache("test-model")
+        vec = cache.encode(CountingEncoder(), "what is rag?")
+        assert vec.shape == (8,)
+
+    def test_key_normalization_and_model(self):
+        """Whitespace/case changes hit the same key; other models do not."""
+        assert cache_key("m", "Hello   World") == cache_key("m", "hello world")
+        assert cache_key("m", "hello") != cache_key("other", "hello")
+
+    def test_lru_eviction(self):
+        """The memory tier is bounded."""
+        cache = EmbeddingCache("test-model", max_entries=2)
+        cache.encode(CountingEncoder(), ["a", "b", "c"])
+        assert len(cache) == 2
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Vectors written to disk are served by a fresh cache instance."""
+        enc = CountingEncoder()
+        texts = [f"text {i}" for i in range(1500)]  # forces the mmap file to grow
+        before = EmbeddingCache("test-model", cache_dir=str(tmp_path)).encode(enc, texts)
+
+        enc2 = CountingEncoder()
+        after = EmbeddingCache("test-model", cache_dir=str(tmp_path)).encode(enc2, texts)
+
+        assert enc2.calls == []
+        np.testing.assert_allclose(before, after)
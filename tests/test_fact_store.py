@@ -0,0 +1,108 @@
+"""
+Tests for the indexed in-memory fact store.
+"""
+
+import time
+
+from src.backend.graph.client import GraphClient
+from src.backend.graph.fact_store import FactStore
+
+
+def _fact(i, subject="s", predicate="p", obj="o", source="https://a.org"):
+    return {"id": f"f{i}", "subject": subject, "predicate": predicate, "object": obj, "source_url": source}
+
+
+class TestFactStore:
+    """Primary and secondary indexes."""
+
+    def test_secondary_indexes(self):
+        store = FactStore()
+        store.upsert(_fact(1, "GPT-4", "is_a", "model", "https://a.org"))
+        store.upsert(_fact(2, "GPT-4", "made_by", "OpenAI", "https://b.org"))
+        store.upsert(_fact(3, "Claude", "is_a", "model", "https://a.org"))
+
+        assert [f["id"] for f in store.by_subject("GPT-4")] == ["f1", "f2"]
+        assert [f["id"] for f in store.by_object("model")] == ["f1", "f3"]
+        assert [f["id"] for f in store.by_subject_predicate("GPT-4", "is_a")] == ["f1"]
+        assert [f["id"] for f in store.by_source("https://a.org")] == ["f1", "f3"]
+        assert store.by_subject("GPT-4", limit=1)[0]["id"] == "f1"
+
+    def test_replace_moves_keys(self):
+        store = FactStore()
+        store.upsert(_fact(1, "a", "p", "x", "https://a.org"))
+        store.upsert(_fact(2, "a", "p", "y", "https://a.org"))
+        old = store.upsert(_fact(1, "b", "p", "z", "https://b.org"))
+
+        assert old["subject"] == "a"
+        assert len(store) == 2
+        assert [f["id"] for f in store.by_subject("a")] == ["f2"]
+        assert [f["id"] for f in store.by_source("https://b.org")] == ["f1"]
+        assert store.by_object("x") == []
+        assert store.text.match_terms(["z"]) == {"f1": 1}
+
+    def test_remove_clears_empty_keys(self):
+        store = FactStore()
+        store.upsert(_fact(1))
+        assert store.remove("f1")["id"] == "f1"
+        assert store.remove("f1") is None
+        assert store._by_subject == {} and store._by_source == {} and len(store.text) == 0
+
+    def test_upsert_cost_does_not_grow(self):
+        store = FactStore()
+
+        def timed(start, n):
+            t = time.perf_counter()
+            for i in range(start, start + n):
+                store.upsert(_fact(i, subject=f"s{i % 50}", source=f"https://{i % 20}.org"))
+            return time.perf_counter() - t
+
+        first = timed(0, 2000)
+        timed(2000, 18000)
+        last = timed(20000, 2000)
+        assert last < first * 5
+
+
+class TestGraphClientStore:
+    """GraphClient memory mode uses the store."""
+
+    def test_lookups(self):
+        g = GraphClient()
+        g._use_memory = True
+        g.upsert_fact({"id": "f1", "subject": "Rust", "predicate": "is_a", "object": "language", "source_url": "https://rust-lang.org"})
+        g.upsert_fact({"id": "f2", "subject": "Go", "predicate": "is_a", "object": "language", "source_url": "https://go.dev"})
+
+        assert [f["id"] for f in g.facts_by_subject("Rust")] == ["f1"]
+        assert [f["id"] for f in g.facts_by_object("language")] == ["f1", "f2"]
+        assert [f["id"] for f in g.facts_by_source("https://go.dev")] == ["f2"]
+        assert [f["id"] for f in g.facts_by_ids(["f2", "missing", "f1"])] == ["f2", "f1"]
+
+
+class TestCorroboration:
+    """Unique-source counts per (subject, predicate) are maintained on write."""
+
+    def test_counts_follow_writes(self):
+        store = FactStore()
+        store.upsert(_fact(1, "earth", "shape", "round", "https://nasa.gov"))
+        store.upsert(_fact(2, "earth", "shape", "oblate spheroid", "https://esa.int"))
+        store.upsert(_fact(3, "earth", "shape", "round", "https://nasa.gov"))
+        assert store.corroboration_count("earth", "shape") == 2
+
+        store.upsert(_fact(2, "earth", "age", "4.5 billion years", "https://esa.int"))
+        assert store.corroboration_count("earth", "shape") == 1
+        assert store.corroboration_count("earth", "age") == 1
+        store.remove("f1")
+        assert store.corroboration_count("earth", "shape") == 1
+        store.remove("f3")
+        assert store.corroboration_count("earth", "shape") == 0
+        assert ("earth", "shape") not in store._claim_sources
+
+    def test_search_facts_reports_counts(self):
+        g = GraphClient()
+        g._use_memory = True
+        for i, src in enumerate(["https://a.org", "https://b.org", "https://c.org", "https://a.org"]):
+            g.upsert_fact(_fact(i, "vaccine", "prevents", f"measles {i}", src))
+        g.upsert_fact(_fact(9, "vaccine", "costs", "ten dollars", "https://a.org"))
+
+        by_id = {f["id"]: f for f in g.search_facts(["vaccine"], limit=10)}
+        assert by_id["f0"]["corroboration_count"] == 3
+        assert by_id["f9"]["corroboration_count"] == 1
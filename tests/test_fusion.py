@@ -0,0 +1,54 @@
+"""
+Tests for vectorized score fusion.
+"""
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from src.backend.api.schemas import AskRequest
+from src.backend.rag.fusion import fuse, normalize_scores, reciprocal_rank_fusion, top_k_indices, weighted_fusion
+
+
+class TestFusion:
+    """Normalization, weighted fusion, RRF and top-k selection."""
+
+    def test_normalize_scores(self):
+        assert normalize_scores(np.array([2.0, 4.0, 6.0])).tolist() == [0.0, 0.5, 1.0]
+        assert normalize_scores(np.array([0.8, 0.8])).tolist() == [0.0, 0.0]
+        assert normalize_scores(np.array([])).size == 0
+
+    def test_weighted_fusion_is_scale_invariant(self):
+        """Multiplying raw BM25 scores must not change the ranking."""
+        signals = {"prior": np.array([0.8, 0.8, 0.8]), "bm25": np.array([1.0, 3.0, 2.0]), "embedding": np.array([0.9, 0.1, 0.5])}
+        scaled = dict(signals, bm25=signals["bm25"] * 100)
+        np.testing.assert_allclose(weighted_fusion(signals), weighted_fusion(scaled))
+
+    def test_rrf(self):
+        signals = {"a": np.array([3.0, 2.0, 1.0]), "b": np.array([1.0, 3.0, 2.0])}
+        fused = reciprocal_rank_fusion(signals, rrf_k=60)
+        assert int(np.argmax(fused)) == 1
+        assert fused[1] == pytest.approx(1 / 62 + 1 / 61)
+
+    def test_fuse_rejects_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            fuse({"a": np.array([1.0])}, strategy="magic")
+
+    def test_top_k_indices(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+        assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+        assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0]
+        assert top_k_indices(np.array([]), 3).size == 0
+
+
+class TestAskRequestFusion:
+    """The API only accepts known fusion strategies."""
+
+    def test_known_values(self):
+        assert AskRequest(query="q").fusion is None
+        assert AskRequest(query="q", fusion="rrf").fusion == "rrf"
+
+    @pytest.mark.parametrize("value", ["RRF", "rfr", ""])
+    def test_unknown_values_rejected(self, value):
+        with pytest.raises(ValidationError):
+            AskRequest(query="q", fusion=value)
@@ -0,0 +1,88 @@
+"""
+Tests for Neo4j index management and full-text fact search.
+"""
+
+from src.backend.graph.client import FULLTEXT_INDEX, GraphClient, _fulltext_query
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, **params):
+        self.driver.queries.append((cypher, params))
+        if "queryNodes" in cypher and self.driver.fulltext_error:
+            raise self.driver.fulltext_error
+        return self.driver.rows
+
+
+class FakeDriver:
+    def __init__(self, rows=None, fulltext_error=None):
+        self.queries = []
+        self.rows = rows or []
+        self.fulltext_error = fulltext_error
+
+    def session(self):
+        return FakeSession(self)
+
+
+def _graph(driver):
+    g = GraphClient()
+    g._use_memory = False
+    g._driver = driver
+    return g
+
+
+ROW = {"f": {"id": "f1", "subject": "GPT-4", "predicate": "is_a", "object": "model", "truth_weight": 0.8}, "score": 2.1, "corroboration": 3}
+
+
+class TestEnsureIndexes:
+    """One statement per query, including the full-text index."""
+
+    def test_separate_statements(self):
+        driver = FakeDriver()
+        _graph(driver).ensure_indexes()
+        statements = [q for q, _ in driver.queries]
+        assert all(";" not in q for q in statements)
+        assert any(q.startswith(f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX}") for q in statements)
+        assert len(statements) == 6
+
+    def test_backfills_missing_claims(self):
+        driver = FakeDriver()
+        _graph(driver).ensure_indexes()
+        backfill = driver.queries[-1][0]
+        assert "NOT EXISTS { MATCH (:Claim" in backfill
+        assert "count(DISTINCT f.source_url)" in backfill and "SET c.source_count = n" in backfill
+
+
+class TestFulltextSearch:
+    """search_facts runs on the full-text index in Neo4j mode."""
+
+    def test_query_escaping(self):
+        assert _fulltext_query(["GPT-4", 'say "hi"', ""]) == '"GPT-4" OR "say \\"hi\\""'
+
+    def test_uses_query_nodes(self):
+        driver = FakeDriver(rows=[ROW])
+        out = _graph(driver).search_facts(["GPT-4", "model"], limit=5)
+
+        cypher, params = driver.queries[0]
+        assert "db.index.fulltext.queryNodes" in cypher and "CONTAINS" not in cypher
+        assert params["index"] == FULLTEXT_INDEX and params["limit"] == 5
+        assert params["query"] == '"GPT-4" OR "model"'
+        assert out[0]["id"] == "f1" and out[0]["score"] == 2.1 and out[0]["corroboration_count"] == 3
+
+    def test_falls_back_without_index(self):
+        driver = FakeDriver(rows=[ROW], fulltext_error=RuntimeError("There is no such fulltext schema index: fact_text"))
+        g = _graph(driver)
+        assert g.search_facts(["GPT-4"])[0]["id"] == "f1"
+        assert "CONTAINS" in driver.queries[-1][0]
+
+        driver.queries.clear()
+        g.search_facts(["GPT-4"])
+        assert len(driver.queries) == 1 and "CONTAINS" in driver.queries[0][0]
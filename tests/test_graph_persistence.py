@@ -0,0 +1,137 @@
+"""
+Tests for memory-mode graph persistence (WAL + snapshots).
+"""
+
+import os
+import time
+
+import numpy as np
+
+from src.backend.config import settings
+from src.backend.graph.client import GraphClient
+from src.backend.graph.fact_store import FactStore
+from src.backend.graph.persistence import FACTS, GraphPersistence, encode_record, iter_records
+from src.backend.graph.vector_index import FactVectorIndex
+
+
+def _memory_graph(directory):
+    g = GraphClient()
+    g._use_memory = True
+    g.enable_persistence(str(directory))
+    return g
+
+
+def _fact(i, subject="Rust", source="https://rust-lang.org"):
+    return {"id": f"f{i}", "subject": subject, "predicate": "is_a", "object": f"language {i}", "source_url": source}
+
+
+class TestRecords:
+    """Record framing."""
+
+    def test_round_trip(self):
+        buf = encode_record(FACTS, [{"id": "f1", "object": "naïve"}]) + encode_record(FACTS, [{"id": "f2"}])
+        records = list(iter_records(buf))
+        assert [items[0]["id"] for _, items, _ in records] == ["f1", "f2"]
+        assert records[-1][2] == len(buf)
+
+    def test_stops_at_corruption(self):
+        good = encode_record(FACTS, [{"id": "f1"}])
+        bad = bytearray(encode_record(FACTS, [{"id": "f2"}]))
+        bad[-2] ^= 0xFF
+        assert [items[0]["id"] for _, items, _ in iter_records(good + bytes(bad))] == ["f1"]
+        assert list(iter_records(good[:-3])) == []
+
+
+class TestGraphPersistence:
+    """GraphClient memory mode survives restarts."""
+
+    def test_restart_replays_wal(self, tmp_path):
+        g = _memory_graph(tmp_path)
+        g.add_aliases("Rust", ["rust-lang"])
+        g.upsert_fact(_fact(1, subject="rust-lang"))
+        g.upsert_facts([_fact(2), _fact(3, subject="Go", source="https://go.dev")])
+        g.upsert_fact(dict(_fact(2), object="systems language"))
+
+        restarted = _memory_graph(tmp_path)
+        assert [f["id"] for f in restarted.facts_by_subject("Rust")] == ["f1", "f2"]
+        assert restarted.facts_by_ids(["f2"])[0]["object"] == "systems language"
+        assert restarted._canonicalize_id("RUST-LANG") == "Rust"
+        assert [f["id"] for f in restarted.search_facts(["go"])] == ["f3"]
+
+    def test_snapshot_compacts_wal(self, tmp_path):
+        g = _memory_graph(tmp_path)
+        g.upsert_facts([_fact(i) for i in range(50)])
+        g.close()
+
+        p = g._persistence
+        assert p.wal_size() == 0 and os.path.getsize(p.snapshot_path) > 0
+        restarted = _memory_graph(tmp_path)
+        restarted.upsert_fact(_fact(99))
+        again = _memory_graph(tmp_path)
+        assert len(again._store) == 51
+
+    def test_compacts_when_wal_is_large(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "memory_graph_snapshot_mb", 1 / 1024)  # 1 KiB
+        g = _memory_graph(tmp_path)
+        for i in range(40):
+            g.upsert_fact(_fact(i))
+        assert g._persistence.wal_size() < 1024
+        assert len(_memory_graph(tmp_path)._store) == 40
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        g = _memory_graph(tmp_path)
+        g.upsert_fact(_fact(1))
+        g.upsert_fact(_fact(2))
+        g._persistence.close()
+        wal = g._persistence.wal_path
+        with open(wal, "r+b") as fh:
+            fh.truncate(os.path.getsize(wal) - 5)
+
+        restarted = _memory_graph(tmp_path)
+        assert [f["id"] for f in restarted._store] == ["f1"]
+        restarted.upsert_fact(_fact(3))
+        assert [f["id"] for f in _memory_graph(tmp_path)._store] == ["f1", "f3"]
+
+    def test_snapshot_then_stale_wal_is_idempotent(self, tmp_path):
+        store, aliases = FactStore(), {}
+        p = GraphPersistence(str(tmp_path), snapshot_bytes=0)
+        store.upsert(_fact(1))
+        p.log_facts([_fact(1)], store, aliases)
+        wal = open(p.wal_path, "rb").read()
+        p.snapshot(store, aliases)
+        with open(p.wal_path, "wb") as fh:  # crash between snapshot rename and WAL truncate
+            fh.write(wal)
+
+        restored = FactStore()
+        GraphPersistence(str(tmp_path)).load(restored, {})
+        assert len(restored) == 1 and restored.corroboration_count("Rust", "is_a") == 1
+
+
+def _encode(texts):
+    vocab = ["rust", "go", "python"]
+    return np.array([[float(w in t.lower().split()) for w in vocab] for t in texts], dtype=np.float32) + 1e-3
+
+
+class TestVectorIndexAfterRestart:
+    """Restored facts are visible to vector search."""
+
+    def test_index_attached_after_restart(self, tmp_path):
+        g = _memory_graph(tmp_path)
+        g.upsert_facts([_fact(1, subject="Rust"), _fact(2, subject="Go", source="https://go.dev")])
+
+        restarted = _memory_graph(tmp_path)
+        index = FactVectorIndex(_encode)
+        restarted.attach_vector_index(index)
+        deadline = time.time() + 5
+        while len(index) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert [f["id"] for f in restarted.vector_search(np.array([0.0, 1.0, 0.0]), k=1)] == ["f2"]
+
+    def test_index_attached_before_load(self, tmp_path):
+        _memory_graph(tmp_path).upsert_fact(_fact(1, subject="Python"))
+
+        g = GraphClient()
+        g._use_memory = True
+        g.attach_vector_index(FactVectorIndex(_encode), backfill=False)
+        g.enable_persistence(str(tmp_path))
+        assert [f["id"] for f in g.vector_search(np.array([0.0, 0.0, 1.0]), k=1)] == ["f1"]
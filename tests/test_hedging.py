@@ -0,0 +1,121 @@
+"""
+Tests for hedged multi-provider search.
+"""
+
+import time
+
+from src.backend.search import circuit_breaker, scheduler
+from src.backend.search.hedging import HedgedSearcher, LatencyTracker, merge_results, parse_providers
+from src.backend.search.result_cache import SearchResultCache
+from src.backend.search.scheduler import OutboundScheduler
+from src.backend.search.web_searcher import SearchResult, WebSearcher
+
+
+def results(prefix, n):
+    return [SearchResult(title=f"{prefix}{i}", url=f"https://{prefix}.example/{i}", snippet="", source=prefix) for i in range(n)]
+
+
+class FakeSearcher:
+    """Stand-in WebSearcher with a fixed latency and result count."""
+
+    def __init__(self, provider, delay, count):
+        self.provider = provider
+        self.delay = delay
+        self.count = count
+        self.calls = 0
+
+    def search(self, query, num_results=8):
+        return self.search_timed(query, num_results)[0]
+
+    def search_timed(self, query, num_results=8):
+        self.calls += 1
+        time.sleep(self.delay)
+        return results(self.provider, self.count), self.delay
+
+
+class TestHedgedSearcher:
+    """The backup is only asked when the primary is slow or inadequate."""
+
+    def test_fast_primary_not_hedged(self):
+        primary, backup = FakeSearcher("ddg", 0.01, 5), FakeSearcher("tavily", 0.01, 5)
+        hedged = HedgedSearcher([primary, backup], default_delay=0.2)
+
+        assert hedged.search("q")[0].source == "ddg"
+        assert backup.calls == 0
+
+    def test_slow_primary_loses(self):
+        primary, backup = FakeSearcher("ddg", 1.0, 5), FakeSearcher("tavily", 0.05, 5)
+        hedged = HedgedSearcher([primary, backup], default_delay=0.1)
+
+        start = time.time()
+        out = hedged.search("q")
+        assert out[0].source == "tavily"
+        assert time.time() - start < 0.5
+
+    def test_inadequate_primary_falls_through(self):
+        primary, backup = FakeSearcher("ddg", 0.01, 0), FakeSearcher("tavily", 0.01, 4)
+        hedged = HedgedSearcher([primary, backup], default_delay=5.0)
+
+        assert [r.source for r in hedged.search("q")] == ["tavily"] * 4
+
+    def test_merge_when_nothing_adequate(self):
+        primary, backup = FakeSearcher("ddg", 0.01, 1), FakeSearcher("tavily", 0.01, 1)
+        hedged = HedgedSearcher([primary, backup], default_delay=5.0, min_results=3)
+
+        assert [r.source for r in hedged.search("q")] == ["ddg", "tavily"]
+
+    def test_delay_tracks_p95(self):
+        hedged = HedgedSearcher([FakeSearcher("ddg", 0, 5)], default_delay=1.0, min_samples=10)
+        assert hedged.hedge_delay("ddg") == 1.0
+        for i in range(100):
+            hedged.latency["ddg"].record(0.1 if i < 95 else 2.0)
+        assert 0.1 <= hedged.hedge_delay("ddg") < 2.0
+
+    def test_cache_hits_do_not_lower_delay(self, monkeypatch):
+        monkeypatch.setattr(scheduler, "_scheduler", OutboundScheduler({}))
+        primary = WebSearcher("duckduckgo")
+        primary.cache = SearchResultCache()
+        monkeypatch.setattr(primary, "_send", lambda *a, **kw: time.sleep(0.05))
+        monkeypatch.setattr(primary, "_parse_duckduckgo", lambda response, n: results("ddg", 5))
+        hedged = HedgedSearcher([primary, FakeSearcher("tavily", 0, 5)], default_delay=1.0, min_samples=5)
+
+        for i in range(5):
+            hedged.search(f"q{i}")
+        for _ in range(200):
+            hedged.search("q0")
+        assert len(hedged.latency["duckduckgo"]) == 5
+        assert hedged.hedge_delay("duckduckgo") >= 0.05
+
+    def test_skipped_requests_not_sampled(self, monkeypatch):
+        """An open breaker or a rate-limit drop sends nothing, so there is no latency to learn."""
+        primary = WebSearcher("duckduckgo")
+        primary.cache = None
+        sent = []
+        monkeypatch.setattr(primary, "_send", lambda *a, **kw: sent.append(a))
+        hedged = HedgedSearcher([primary], default_delay=1.0)
+
+        monkeypatch.setattr(scheduler, "_scheduler", OutboundScheduler({"html.duckduckgo.com": (0.01, 1)}, queue_timeout=0.01))
+        scheduler.get_scheduler().acquire("https://html.duckduckgo.com/html/")
+        hedged.search("dropped")
+        breaker = circuit_breaker.get_breaker("duckduckgo")
+        monkeypatch.setattr(breaker, "allow", lambda: False)
+        hedged.search("breaker open")
+
+        assert sent == []
+        assert len(hedged.latency["duckduckgo"]) == 0
+
+
+class TestHelpers:
+    def test_parse_providers(self):
+        assert parse_providers(" duckduckgo, Tavily ,") == ["duckduckgo", "tavily"]
+
+    def test_merge_dedupes_by_url(self):
+        a = results("a", 2)
+        merged = merge_results([a, [a[0]] + results("b", 1)], 10)
+        assert [r.url for r in merged] == [a[0].url, a[1].url, "https://b.example/0"]
+
+    def test_latency_percentile(self):
+        tracker = LatencyTracker(window=3)
+        for v in (5.0, 1.0, 2.0, 3.0):
+            tracker.record(v)
+        assert tracker.percentile(100) == 3.0
@@ -0,0 +1,116 @@
+"""
+Tests for pooled HTTP sessions and the shared WebSearcher registry.
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.backend.search import http_pool
+from src.backend.search.circuit_breaker import reset_breakers
+from src.backend.search.web_searcher import WebSearcher, get_searcher
+
+RESULTS_HTML = """
+<div class="result">
+  <a class="result__a" href="https://example.org/a">Result A</a>
+  <a class="result__snippet">Snippet about A, Mar 3, 2025</a>
+  <span class="result__url">example.org</span>
+</div>
+<div class="result">
+  <a class="result__a" href="https://example.org/b">Result B</a>
+</div>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = RESULTS_HTML.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    connections = []
+
+    class Server(ThreadingHTTPServer):
+        def process_request(self, request, client_address):
+            connections.append(client_address)
+            super().process_request(request, client_address)
+
+    srv = Server(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/html/", connections
+    srv.shutdown()
+    srv.server_close()
+    http_pool.close_sessions()
+
+
+def _local_searcher(monkeypatch, url):
+    reset_breakers()
+    searcher = WebSearcher(provider="duckduckgo")
+    searcher.cache = None
+    monkeypatch.setattr(searcher, "_duckduckgo_request", lambda q, n: ("POST", url, {"data": {"q": q}}))
+    return searcher
+
+
+class TestPooledSearch:
+    """Connections are reused across searches."""
+
+    def test_connection_reused(self, monkeypatch, server):
+        url, connections = server
+        searcher = _local_searcher(monkeypatch, url)
+
+        for _ in range(3):
+            results = searcher.search("anything", 5)
+            assert [r.title for r in results] == ["Result A", "Result B"]
+        assert len(connections) == 1
+        assert results[0].timestamp == "2025-03-03"
+
+    def test_session_per_host(self):
+        a = http_pool.get_session("https://html.duckduckgo.com/html/")
+        b = http_pool.get_session("https://html.duckduckgo.com/other")
+        c = http_pool.get_session("https://api.tavily.com/search")
+        assert a is b and a is not c
+        http_pool.close_sessions()
+
+    def test_async_search(self, monkeypatch, server):
+        url, connections = server
+        searcher = _local_searcher(monkeypatch, url)
+
+        async def run():
+            try:
+                first = await searcher.asearch("anything", 5)
+                second = await searcher.asearch("anything", 5)
+            finally:
+                await http_pool.aclose_async_client()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert [r.url for r in first] == [r.url for r in second] == ["https://example.org/a", "https://example.org/b"]
+        assert len(connections) == 1
+
+    def test_failure_returns_empty(self, monkeypatch):
+        searcher = _local_searcher(monkeypatch, "http://127.0.0.1:9/html/")
+        searcher.timeout = 1
+        assert searcher.search("anything") == []
+
+
+class TestSearcherRegistry:
+    """get_searcher returns one instance per provider and key."""
+
+    def test_shared_instances(self):
+        assert get_searcher("duckduckgo", "") is get_searcher("duckduckgo", "")
+        assert get_searcher("tavily", "k1") is not get_searcher("tavily", "k2")
@@ -0,0 +1,105 @@
+"""
+Tests for the local conversational/search classifier.
+"""
+
+from src.backend.config import settings
+from src.backend.graph.client import GraphClient
+from src.backend.rag.intent_classifier import IntentClassifier, normalize_query, render_prompt_examples
+
+# Held out from training: real searches that contain chat words, and chat messages
+HELD_OUT_SEARCH = [
+    "what do you know about fusion energy", "good night sleep tips", "thanks giving day date",
+    "who are you voting polls 2024", "hello world program in java", "how are you supposed to file taxes",
+    "great barrier reef bleaching", "cool roof paint", "nice france weather", "bye election results",
+    "what can you do with a chemistry degree", "perfect square numbers", "amazing grace lyrics",
+    "hey jude chords", "ok google alternatives", "yo yo ma concerts",
+    "what are you doing step brother movie cast", "tell me about yourself interview answers",
+]
+HELD_OUT_CONVERSATIONAL = [
+    "hello!", "thank you very much", "hi", "thanks", "bye", "who are you", "see you later",
+    "thanks so much for your help", "hey there", "good morning", "how is it going",
+]
+from src.backend.rag.llm import LLM
+from src.backend.rag.pipeline import RAGPipeline
+
+
+class TestIntentClassifier:
+    """Confident decisions on typical queries, None when unsure."""
+
+    def test_confident_on_clear_queries(self):
+        clf = IntentClassifier(threshold=0.8)
+        for q in ["hello!", "thank you very much", "see you later", "who are you"]:
+            assert clf.classify(q) is True, q
+        for q in ["what is quantum entanglement", "latest news on openai", "who is elon musk", "best restaurants in paris"]:
+            assert clf.classify(q) is False, q
+
+    def test_held_out_searches_never_conversational(self):
+        clf = IntentClassifier()
+        for q in HELD_OUT_SEARCH:
+            assert clf.classify(q) is not True, q
+        for q in HELD_OUT_CONVERSATIONAL:
+            assert clf.classify(q) is not False, q
+
+    def test_unsure_returns_none(self):
+        clf = IntentClassifier(threshold=0.999)
+        assert clf.classify("python") is None
+
+    def test_memo_uses_normalized_query(self):
+        clf = IntentClassifier(memo_size=2)
+        clf.remember("What is Rust?", (False, "search"))
+        assert clf.recall("  what is   rust ") == (False, "search")
+        clf.remember("a", (True, "greeting"))
+        clf.remember("b", (True, "greeting"))
+        assert clf.recall("what is rust") is None
+
+    def test_prompt_examples_render(self):
+        block = render_prompt_examples()
+        assert '- "Hi" → CONVERSATIONAL (greeting)' in block
+        assert '- "Latest news on AI" → SEARCH' in block
+        assert normalize_query("Hi, there!") == "hi there"
+
+
+class CountingLLM(LLM):
+    """Records classification prompts."""
+
+    def __init__(self, reply):
+        super().__init__()
+        self.reply = reply
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+
+class TestPipelineClassification:
+    """The LLM is only asked when the local classifier is unsure."""
+
+    def _pipeline(self, monkeypatch, reply="SEARCH", threshold=0.8):
+        llm = CountingLLM(reply)
+        rag = RAGPipeline(GraphClient(), llm)
+        monkeypatch.setattr(settings, "llm_provider", "ollama")
+        rag._intent = IntentClassifier(threshold=threshold)
+        return rag, llm
+
+    def test_confident_query_skips_llm(self, monkeypatch):
+        rag, llm = self._pipeline(monkeypatch)
+        assert rag._is_conversational("what is quantum entanglement") == (False, "search")
+        assert rag._is_conversational("thank you very much") == (True, "appreciation")
+        assert llm.prompts == []
+
+    def test_classifier_guesses_not_memoized(self, monkeypatch):
+        rag, llm = self._pipeline(monkeypatch)
+        rag._is_conversational("what is quantum entanglement")
+        assert rag._intent.recall("what is quantum entanglement") is None
+
+    def test_search_with_chat_words_asks_llm(self, monkeypatch):
+        rag, llm = self._pipeline(monkeypatch, reply="SEARCH")
+        assert rag._is_conversational("what do you know about fusion energy") == (False, "search")
+        assert len(llm.prompts) == 1
+
+    def test_unsure_query_asks_llm_once(self, monkeypatch):
+        rag, llm = self._pipeline(monkeypatch, reply="CONVERSATIONAL", threshold=0.999)
+        assert rag._is_conversational("yo whats new")[0] is True
+        assert rag._is_conversational("Yo, whats new?")[0] is True
+        assert len(llm.prompts) == 1
@@ -0,0 +1,88 @@
+"""
+Tests for the incremental inverted index and its use in GraphClient.
+"""
+
+from src.backend.graph.client import GraphClient
+from src.backend.graph.inverted_index import InvertedIndex, tokenize
+
+
+class TestInvertedIndex:
+    """Postings, replacement and BM25 scoring."""
+
+    def test_tokenize(self):
+        assert tokenize("GPT-4 is a Large-Language model.") == ["gpt", "4", "is", "a", "large", "language", "model"]
+
+    def test_add_replace_remove(self):
+        idx = InvertedIndex()
+        idx.add("a", "neural networks learn")
+        idx.add("a", "graphs store facts")
+
+        assert "neural" not in idx.postings
+        assert idx.postings["graphs"] == {"a": 1}
+        idx.remove("a")
+        assert len(idx) == 0 and idx.postings == {}
+
+    def test_match_terms_counts_hits(self):
+        idx = InvertedIndex()
+        idx.add("a", "GPT-4 is a large language model")
+        idx.add("b", "language of birds")
+
+        assert idx.match_terms(["gpt-4", "language"]) == {"a": 2, "b": 1}
+        assert idx.match_terms(["gpt-5"]) == {}
+
+    def test_prefix_vocabulary(self):
+        idx = InvertedIndex()
+        idx.add("a", "learning learned")
+        idx.add("b", "learn")
+        assert idx.terms_with_prefix("learn") == ["learn", "learned", "learning"]
+        assert idx.docs_with("learn") == {"a", "b"}
+        idx.remove("a")
+        assert idx.terms_with_prefix("learn") == ["learn"]
+        assert idx._vocab == sorted(idx.postings)
+
+    def test_bm25_prefers_rare_terms_and_restricts(self):
+        idx = InvertedIndex()
+        idx.add("a", "transformer attention model")
+        idx.add("b", "model model model")
+        idx.add("c", "unrelated text")
+
+        scores = idx.bm25("transformer model")
+        assert scores["a"] > scores["b"] > 0
+        assert "c" not in scores
+        assert set(idx.bm25("transformer model", ["b"])) == {"b"}
+
+
+class TestGraphClientIndex:
+    """Memory-mode search goes through the index."""
+
+    def _graph(self):
+        g = GraphClient()
+        g._use_memory = True
+        return g
+
+    def test_search_uses_postings(self):
+        g = self._graph()
+        g.upsert_fact({"id": "f1", "subject": "GPT-4", "predicate": "is_a", "object": "language model", "source_url": "https://arxiv.org/abs/1"})
+        g.upsert_fact({"id": "f2", "subject": "Rust", "predicate": "is_a", "object": "programming language", "source_url": "https://rust-lang.org"})
+
+        ids = [f["id"] for f in g.search_facts(["gpt-4", "model"], limit=5)]
+        assert ids == ["f1"]
+
+    def test_upsert_replaces_postings(self):
+        g = self._graph()
+        g.upsert_fact({"id": "f1", "subject": "paper", "predicate": "title", "object": "old title", "source_url": "u"})
+        g.upsert_fact({"id": "f1", "subject": "paper", "predicate": "title", "object": "new title", "source_url": "u"})
+
+        assert g.search_facts(["old"]) == []
+        assert [f["object"] for f in g.search_facts(["new"])] == ["new title"]
+        assert g.bm25_scores("new title", ["f1", "missing"])[1] == 0.0
+
+    def test_partial_word_terms_match(self):
+        g = self._graph()
+        g.upsert_fact({"id": "f1", "subject": "Transformers", "predicate": "use", "object": "deep learning", "source_url": "u1"})
+        g.upsert_fact({"id": "f2", "subject": "CNN", "predicate": "is_a", "object": "neural-network architecture", "source_url": "u2"})
+
+        assert [f["id"] for f in g.search_facts(["learn"])] == ["f1"]
+        assert [f["id"] for f in g.search_facts(["transform"])] == ["f1"]
+        assert [f["id"] for f in g.search_facts(["neural net"])] == ["f2"]
+        assert [f["id"] for f in g.search_facts(["neural"])] == ["f2"]
@@ -0,0 +1,98 @@
+"""
+Tests for the offline "local" search provider.
+"""
+
+import json
+import os
+import time
+import zlib
+
+import numpy as np
+
+from src.backend.config import settings
+from src.backend.search import local_corpus
+from src.backend.search.local_corpus import LocalCorpus, record_from_json
+from src.backend.search.web_searcher import SearchResult, WebSearcher, search_web_realtime
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "local_corpus.jsonl")
+
+
+def _hash_encode(texts):
+    """Deterministic bag-of-words embedding for the vector path."""
+    out = np.zeros((len(texts), 64), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for token in text.lower().split():
+            out[i, zlib.crc32(token.encode()) % 64] += 1.0
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return out / norms
+
+
+class TestLocalCorpus:
+    """Building and searching the corpus."""
+
+    def test_jsonl_bm25(self):
+        corpus = LocalCorpus()
+        assert corpus.load(FIXTURE) == 10
+        results = corpus.search("python global interpreter lock", 3)
+        assert results and isinstance(results[0], SearchResult)
+        assert "GlobalInterpreterLock" in results[0].url or "pep-0703" in results[0].url
+        assert results[0].timestamp
+
+    def test_directory(self, tmp_path):
+        (tmp_path / "gil.md").write_text("# The GIL\nThe global interpreter lock serializes bytecode execution.\n")
+        (tmp_path / "page.html").write_text("<html><body><nav>menu</nav><h1>Tides</h1><p>Tides are caused by the moon.</p></body></html>")
+        (tmp_path / "past.jsonl").write_text(json.dumps({"subject": "Mars", "object": "Mars is red.", "source_url": "https://nasa.gov/mars"}) + "\n")
+        corpus = LocalCorpus()
+        assert corpus.load(str(tmp_path)) == 3
+        top = corpus.search("what causes tides", 1)[0]
+        assert top.title == "Tides" and top.url.startswith("file://")
+        assert corpus.search("mars", 1)[0].url == "https://nasa.gov/mars"
+
+    def test_record_from_fact(self):
+        record = record_from_json({"subject": "t", "object": "o", "source_url": "https://a.org/x", "ts": "2025-01-01"})
+        assert record["url"] == "https://a.org/x" and record["source"] == "a.org"
+        assert record_from_json({"object": "no url"}) is None
+
+    def test_vectors_and_saved_index(self, tmp_path):
+        corpus = LocalCorpus(encode=_hash_encode, index_dir=str(tmp_path / "idx"))
+        corpus.load(FIXTURE)
+        corpus.build_vectors()
+        assert corpus.vectors is not None and len(corpus.vectors) == 10
+        assert corpus.search("gene editing crispr", 1)[0].url.endswith("crispr-explained")
+
+        reloaded = LocalCorpus(encode=lambda texts: (_ for _ in ()).throw(AssertionError("re-embedded")), index_dir=str(tmp_path / "idx"))
+        reloaded.load(FIXTURE)
+        reloaded.build_vectors()
+        assert len(reloaded.vectors) == 10
+
+    def test_latency_is_seeded(self):
+        def timings(seed):
+            corpus = LocalCorpus(latency_ms=20, seed=seed)
+            corpus.load(FIXTURE)
+            out = []
+            for _ in range(3):
+                start = time.perf_counter()
+                corpus.search("python", 2)
+                out.append(time.perf_counter() - start)
+            return out
+
+        a = timings(1)
+        assert all(t >= 0.005 for t in a)
+        rng = local_corpus.random.Random(1)
+        expected = [20 * rng.lognormvariate(0.0, 0.5) / 1000.0 for _ in range(3)]
+        assert all(t >= e * 0.9 for t, e in zip(a, expected))
+
+
+class TestLocalProvider:
+    """The "local" provider behind WebSearcher / search_web_realtime."""
+
+    def test_search_web_realtime(self, monkeypatch):
+        monkeypatch.setattr(settings, "local_search_path", FIXTURE)
+        monkeypatch.setattr(settings, "local_search_latency_ms", 0.0)
+        monkeypatch.setattr(local_corpus, "_corpus", None)
+        assert WebSearcher(provider="local").cache is None
+
+        facts = search_web_realtime("photosynthesis and the calvin cycle", provider="local", num_results=2)
+        assert facts and facts[0]["source_url"].startswith("https://www.khanacademy.org")
+        assert facts[0]["id"].endswith("#snippet")
@@ -0,0 +1,105 @@
+"""
+Tests for the lazy, shared model registry.
+"""
+
+import threading
+import time
+
+from src.backend.graph.client import GraphClient
+from src.backend.rag.llm import LLM
+from src.backend.rag.models import FAILED, LOADED, LOADING, UNAVAILABLE, UNLOADED, ModelRegistry
+from src.backend.rag.pipeline import RAGPipeline
+
+
+class TestModelRegistry:
+    """Lazy loading, sharing, warmup and unloading."""
+
+    def test_lazy_and_shared(self):
+        loads = []
+        reg = ModelRegistry()
+        reg.register("embedder", "fake", lambda: loads.append(1) or object())
+
+        assert reg.state("embedder") == UNLOADED and loads == []
+        first = reg.get("embedder")
+        assert reg.get("embedder") is first
+        assert loads == [1]
+        assert reg.status()["embedder"]["loaded"] is True
+
+    def test_unavailable_and_failed(self):
+        reg = ModelRegistry()
+        reg.register("missing", "none", None)
+
+        def boom():
+            raise RuntimeError("no weights")
+
+        reg.register("broken", "broken", boom)
+        assert reg.get("missing") is None and reg.state("missing") == UNAVAILABLE
+        assert reg.get("broken") is None and reg.state("broken") == FAILED
+        assert reg.status()["broken"]["error"] == "no weights"
+
+    def test_failed_load_retried_after_backoff(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(time.time())
+            if len(attempts) < 3:
+                raise OSError("download interrupted")
+            return "model"
+
+        reg = ModelRegistry(retry_seconds=0.2, max_retry_seconds=0.3)
+        reg.register("embedder", "flaky", flaky)
+        assert reg.get("embedder") is None and len(attempts) == 1
+        assert reg.get("embedder") is None and len(attempts) == 1  # backing off
+        status = reg.status()["embedder"]
+        assert status["state"] == FAILED and status["failures"] == 1
+        assert 0.0 < status["retry_in_seconds"] <= 0.2
+        assert not reg.available("embedder")
+
+        time.sleep(0.22)
+        assert reg.available("embedder")
+        assert reg.get("embedder") is None and len(attempts) == 2
+        assert reg.status()["embedder"]["retry_in_seconds"] > 0.2  # doubled, capped at 0.3
+        time.sleep(0.32)
+        assert reg.get("embedder") == "model" and len(attempts) == 3
+        status = reg.status()["embedder"]
+        assert status["state"] == LOADED and status["failures"] == 0 and status["retry_in_seconds"] is None
+
+    def test_background_warmup_does_not_block_nonwaiting_callers(self):
+        release = threading.Event()
+        reg = ModelRegistry()
+        reg.register("slow", "slow", lambda: release.wait(2) and "model")
+
+        t = reg.warmup(background=True)
+        time.sleep(0.05)
+        assert reg.state("slow") == LOADING
+        assert reg.get("slow", wait=False) is None
+        release.set()
+        t.join()
+        assert reg.get("slow", wait=False) == "model"
+
+    def test_unload_idle(self):
+        reg = ModelRegistry()
+        reg.register("embedder", "fake", lambda: object())
+        reg.get("embedder")
+
+        assert reg.unload_idle(max_idle_seconds=60) == 0
+        assert reg.unload_idle(max_idle_seconds=0.0) == 1
+        assert reg.state("embedder") == UNLOADED
+        assert reg.get("embedder") is not None
+        assert reg.state("embedder") == LOADED
+
+
+class TestPipelineConstruction:
+    """Building a pipeline must not load models."""
+
+    def test_no_model_load_at_construction(self, monkeypatch):
+        from src.backend.rag import pipeline as pipeline_module
+
+        reg = ModelRegistry()
+        loads = []
+        reg.register("embedder", "fake", lambda: loads.append("embedder"))
+        reg.register("reranker", "fake", lambda: loads.append("reranker"))
+        monkeypatch.setattr(pipeline_module, "model_registry", reg)
+
+        RAGPipeline(GraphClient(), LLM())
+        assert loads == []
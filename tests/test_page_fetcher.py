@@ -0,0 +1,165 @@
+"""
+Tests for deep retrieval (page fetch + passage extraction).
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.backend.config import settings
+from src.backend.graph.client import GraphClient
+from src.backend.rag import pipeline as pipeline_module
+from src.backend.rag.llm import LLM
+from src.backend.rag.pipeline import RAGPipeline
+from src.backend.search import http_pool, page_fetcher
+from src.backend.search.page_fetcher import PageFetcher, extract_text, is_public_host, split_passages
+
+ARTICLE = """<html><head><title>Photosynthesis</title><script>var x = "ignore me";</script></head>
+<body><nav><a href="/">Home</a> <a href="/about">About</a></nav>
+<article><h1>How photosynthesis works</h1>
+<p>Photosynthesis converts light energy into chemical energy stored in glucose. It takes place in the chloroplasts of plant cells.</p>
+<p>The light-dependent reactions split water and release oxygen, while the Calvin cycle fixes carbon dioxide into sugars.</p>
+</article><footer>Copyright 2025</footer></body></html>"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.3)
+            if self.path.startswith("/redirect/"):
+                self.send_response(302)
+                self.send_header("Location", self.path[len("/redirect"):].replace("/metadata", "http://169.254.169.254/latest"))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.path.startswith("/big"):
+                body = ("<p>" + "word " * 2000 + "</p>") * 50
+            elif self.path.startswith("/pdf"):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", "4")
+                self.end_headers()
+                self.wfile.write(b"%PDF")
+                return
+            else:
+                body = ARTICLE
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    _Handler.active = _Handler.peak = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+    http_pool.close_sessions()
+
+
+class TestExtraction:
+    """Main text extraction and passage splitting."""
+
+    def test_boilerplate_removed(self):
+        text = extract_text(ARTICLE)
+        assert "chloroplasts" in text
+        assert "ignore me" not in text and "Home" not in text and "Copyright" not in text
+
+    def test_split_passages(self):
+        text = "\n".join(["Short menu item"] + ["This is a fairly long sentence about a topic."] * 40)
+        passages = split_passages(text, max_chars=200, min_chars=50)
+        assert passages and all(50 <= len(p) <= 200 for p in passages)
+
+
+class TestPageFetcher:
+    """Caps, per-host limits and caching."""
+
+    def test_fetch_and_cache(self, base_url):
+        fetcher = PageFetcher(allow_private=True)
+        url = f"{base_url}/article"
+        assert "Calvin cycle" in fetcher.fetch(url)
+        assert fetcher._cached(url) is not None
+
+    def test_byte_cap(self, base_url):
+        fetcher = PageFetcher(max_bytes=20000, allow_private=True)
+        text = fetcher.fetch(f"{base_url}/big")
+        assert 0 < len(text) < 40000
+
+    def test_non_html_skipped(self, base_url):
+        assert PageFetcher(allow_private=True).fetch(f"{base_url}/pdf") is None
+
+    def test_per_host_limit(self, base_url):
+        fetcher = PageFetcher(per_host=2, max_workers=6, timeout=3.0, allow_private=True)
+        pages = fetcher.fetch_many([f"{base_url}/slow/{i}" for i in range(6)])
+        assert len(pages) == 6
+        assert _Handler.peak <= 2
+
+    def test_passages_inherit_source(self, base_url):
+        fetcher = PageFetcher(allow_private=True)
+        facts = [{"id": "s1", "subject": "Photosynthesis", "source_url": f"{base_url}/article", "truth_weight": 0.9, "score": 0.8}]
+        passages = fetcher.passages_for(facts, top_n=1)
+        assert passages and passages[0]["predicate"] == "passage"
+        assert passages[0]["truth_weight"] == 0.9
+        assert passages[0]["id"].startswith(f"{base_url}/article#p")
+
+
+class TestAddressChecks:
+    """Only public hosts are fetched, on every redirect hop."""
+
+    def test_non_public_addresses(self):
+        for host in ("127.0.0.1", "10.1.2.3", "192.168.0.1", "169.254.169.254", "::1", "0.0.0.0", ""):
+            assert not is_public_host(host), host
+        assert is_public_host("93.184.216.34")
+
+    def test_private_target_refused(self, base_url):
+        assert PageFetcher().fetch(f"{base_url}/article") is None
+        assert _Handler.peak == 0
+
+    def test_redirects_checked_per_hop(self, base_url, monkeypatch):
+        monkeypatch.setattr(page_fetcher, "is_public_host", lambda host: host == "127.0.0.1")
+        fetcher = PageFetcher()
+        assert "Calvin cycle" in fetcher.fetch(f"{base_url}/redirect/article")
+        assert fetcher.fetch(f"{base_url}/redirect/metadata") is None
+
+    def test_redirect_limit(self, base_url):
+        fetcher = PageFetcher(allow_private=True, max_redirects=1)
+        assert fetcher.fetch(f"{base_url}/redirect/redirect/article") is None
+        assert "Calvin cycle" in PageFetcher(allow_private=True).fetch(f"{base_url}/redirect/redirect/article")
+
+
+class TestPipelineDeepRetrieval:
+    """retrieve() ranks passages alongside snippets."""
+
+    def test_passages_reach_ranking(self, monkeypatch, base_url):
+        monkeypatch.setattr(settings, "deep_retrieval", True)
+        url = f"{base_url}/article"
+        snippet = {"id": f"{url}#snippet", "subject": "Photosynthesis", "predicate": "content",
+                   "object": "A process in plants.", "source_url": url, "score": 0.8}
+        monkeypatch.setattr(pipeline_module, "search_web_realtime", lambda q, **kw: [dict(snippet)])
+        monkeypatch.setattr(pipeline_module, "get_page_fetcher", lambda: PageFetcher(allow_private=True))
+
+        rag = RAGPipeline(GraphClient(), LLM())
+        facts = rag.retrieve("where does the calvin cycle fix carbon dioxide", k=3)
+        assert any(f["predicate"] == "passage" for f in facts)
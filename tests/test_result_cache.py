@@ -0,0 +1,124 @@
+"""
+Tests for the search result cache.
+"""
+
+import time
+
+from src.backend.search.result_cache import FRESH, MISS, STALE, SearchResultCache, parse_ttls
+from src.backend.search.web_searcher import SearchResult, WebSearcher
+
+RESULTS = [
+    SearchResult(title="Rust", url="https://rust-lang.org", snippet="A language", source="rust-lang.org"),
+    SearchResult(title="Book", url="https://doc.rust-lang.org/book", snippet="The book", source="doc.rust-lang.org"),
+]
+
+
+def _rows(cache):
+    return cache._db.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+
+
+class TestSearchResultCache:
+    """Keys, TTLs and the SQLite tier."""
+
+    def test_key_normalizes_query(self):
+        cache = SearchResultCache()
+        cache.put("duckduckgo", "What is  Rust", 8, RESULTS)
+        assert cache.get("duckduckgo", "what is rust", 8) == (RESULTS, FRESH)
+        assert cache.get("duckduckgo", "what is rust", 5)[1] == MISS
+        assert cache.get("tavily", "what is rust", 8)[1] == MISS
+
+    def test_per_provider_ttl_and_stale_window(self):
+        cache = SearchResultCache(ttls={"duckduckgo": 0.0, "tavily": 60.0}, stale_seconds=60.0)
+        cache.put("duckduckgo", "q", 8, RESULTS)
+        cache.put("tavily", "q", 8, RESULTS)
+        time.sleep(0.01)
+        assert cache.get("duckduckgo", "q", 8)[1] == STALE
+        assert cache.get("tavily", "q", 8)[1] == FRESH
+
+        cache.stale_seconds = 0.0
+        assert cache.get("duckduckgo", "q", 8) == (None, MISS)
+
+    def test_empty_results_not_cached(self):
+        cache = SearchResultCache()
+        cache.put("duckduckgo", "q", 8, [])
+        assert cache.get("duckduckgo", "q", 8)[1] == MISS
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / "search.sqlite")
+        cache = SearchResultCache(db_path=path)
+        cache.put("serpapi", "rust", 8, RESULTS)
+        cache.close()
+
+        reopened = SearchResultCache(db_path=path)
+        results, state = reopened.get("serpapi", "rust", 8)
+        assert state == FRESH
+        assert [r.url for r in results] == [r.url for r in RESULTS]
+
+    def test_expired_rows_purged_after_puts(self, tmp_path):
+        path = str(tmp_path / "search.sqlite")
+        cache = SearchResultCache(db_path=path, ttls={"duckduckgo": 60.0}, stale_seconds=0.0, purge_every=3)
+        cache.put("duckduckgo", "old", 8, RESULTS)
+        cache._db.execute("UPDATE search_results SET stored_at = stored_at - 3600")
+        cache._db.commit()
+
+        cache.put("duckduckgo", "a", 8, RESULTS)
+        assert _rows(cache) == 2
+        cache.put("duckduckgo", "b", 8, RESULTS)
+        assert _rows(cache) == 2
+        assert cache.get("duckduckgo", "a", 8)[1] == FRESH
+
+    def test_expired_rows_purged_on_open(self, tmp_path):
+        path = str(tmp_path / "search.sqlite")
+        cache = SearchResultCache(db_path=path, ttls={"duckduckgo": 60.0}, stale_seconds=0.0, purge_every=0)
+        cache.put("duckduckgo", "old", 8, RESULTS)
+        cache._db.execute("UPDATE search_results SET stored_at = stored_at - 3600")
+        cache._db.commit()
+        cache.close()
+
+        assert _rows(SearchResultCache(db_path=path, ttls={"duckduckgo": 60.0}, stale_seconds=0.0)) == 0
+
+    def test_memory_tier_bounded(self):
+        cache = SearchResultCache(max_entries=2)
+        for q in ("a", "b", "c"):
+            cache.put("duckduckgo", q, 8, RESULTS)
+        assert cache.get("duckduckgo", "a", 8)[1] == MISS
+        assert cache.get("duckduckgo", "c", 8)[1] == FRESH
+
+    def test_parse_ttls(self):
+        ttls = parse_ttls("duckduckgo=60, tavily = 7200,bogus")
+        assert ttls["duckduckgo"] == 60.0 and ttls["tavily"] == 7200.0
+        assert ttls["serpapi"] == 3600.0
+
+
+class TestCachedSearch:
+    """WebSearcher.search serves from cache and refreshes stale entries."""
+
+    def _searcher(self, cache):
+        searcher = WebSearcher(provider="duckduckgo")
+        searcher.cache = cache
+        calls = []
+
+        def fake_uncached(query, num_results):
+            calls.append(query)
+            return list(RESULTS)
+
+        searcher._search_uncached = fake_uncached
+        return searcher, calls
+
+    def test_second_search_is_cached(self):
+        searcher, calls = self._searcher(SearchResultCache())
+        searcher.search("rust", 8)
+        assert searcher.search("Rust ", 8) == RESULTS
+        assert calls == ["rust"]
+
+    def test_stale_served_and_refreshed(self):
+        cache = SearchResultCache(ttls={"duckduckgo": 0.0}, stale_seconds=60.0)
+        searcher, calls = self._searcher(cache)
+        cache.put("duckduckgo", "rust", 8, RESULTS[:1])
+        time.sleep(0.01)
+
+        assert searcher.search("rust", 8) == RESULTS[:1]
+        deadline = time.time() + 2
+        while len(calls) < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        assert calls == ["rust"]
@@ -0,0 +1,59 @@
+"""
+Tests for search result page parsing.
+"""
+
+import os
+
+import pytest
+
+from src.backend.search.result_parser import extract_date, parse_duckduckgo, parse_google, trim_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as fh:
+        return fh.read()
+
+
+class TestResultParser:
+    """The strained parse must match a full-page parse (on synthetic provider-shaped pages)."""
+
+    @pytest.mark.parametrize("name,parse,n", [
+        ("synthetic_duckduckgo_results.html", parse_duckduckgo, 8),
+        ("synthetic_google_results.html", parse_google, 10),
+    ])
+    def test_matches_full_parse(self, name, parse, n):
+        html = fixture(name)
+        results = parse(html, n)
+        assert results == parse(html, n, strain=False)
+        assert results and all(r["url"].startswith("http") for r in results)
+
+    def test_duckduckgo_fields(self):
+        results = parse_duckduckgo(fixture("synthetic_duckduckgo_results.html"), 3)
+        first = results[1]
+        assert first["title"] == "Photosynthesis explained part 0"
+        assert first["source"] == "site0.example.org/photosynthesis/0"
+        assert len(results) == 3
+
+    def test_google_skips_non_http_links(self):
+        results = parse_google(fixture("synthetic_google_results.html"), 20)
+        assert len(results) == 10
+        assert all(r["source"].endswith(".example.com") for r in results)
+
+    def test_trim_page(self):
+        html = '<head><script>var a = "<div id=\\"links\\">";</script></head><div id="links"><style>p{}</style><p>x</p></div>'
+        assert trim_page(html, 'id="links"') == '<div id="links"><p>x</p></div>'
+
+
+class TestExtractDate:
+    @pytest.mark.parametrize("text,expected", [
+        ("Published Mar 3, 2025 by staff", "2025-03-03"),
+        ("on 12 January 2024", "2024-01-12"),
+        ("updated 2023-11-05", "2023-11-05"),
+        ("in 2026 we", "2026-01-01"),
+        ("no date here", ""),
+        ("", ""),
+    ])
+    def test_patterns(self, text, expected):
+        assert extract_date(text) == expected
@@ -0,0 +1,120 @@
+"""
+Tests for the per-host outbound search scheduler.
+"""
+
+import threading
+import time
+
+from src.backend.search import scheduler as scheduler_module
+from src.backend.search.scheduler import (
+    BACKGROUND, INTERACTIVE, OutboundScheduler, TokenBucket, background, current_priority, parse_host_rates,
+    search_deadline,
+)
+from src.backend.search.web_searcher import WebSearcher
+
+DDG = "https://html.duckduckgo.com/html/"
+
+
+class TestTokenBucket:
+    """Refill and burst."""
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10.0, burst=2)
+        now = bucket.updated
+        assert bucket.take(now) == 0.0
+        assert bucket.take(now) == 0.0
+        wait = bucket.take(now)
+        assert 0.09 <= wait <= 0.11
+        assert bucket.take(now + 0.11) == 0.0
+
+
+class TestHostRates:
+    """SEARCH_HOST_RATES parsing."""
+
+    def test_overrides_and_disable(self):
+        rates = parse_host_rates("api.example.com=5:10, www.google.com=0, bad")
+        assert rates["api.example.com"] == (5.0, 10)
+        assert "www.google.com" not in rates
+        assert "html.duckduckgo.com" in rates
+
+
+class TestOutboundScheduler:
+    """Rate limiting, priority and dropping."""
+
+    def test_unlimited_host(self):
+        sched = OutboundScheduler({})
+        assert all(sched.acquire("https://api.tavily.com/search") for _ in range(50))
+
+    def test_rate_limited(self):
+        sched = OutboundScheduler({"html.duckduckgo.com": (20.0, 1)})
+        start = time.monotonic()
+        for _ in range(5):
+            assert sched.acquire(DDG)
+        assert time.monotonic() - start >= 0.18
+
+    def test_interactive_before_background(self):
+        sched = OutboundScheduler({"html.duckduckgo.com": (10.0, 1)})
+        assert sched.acquire(DDG)  # drain the burst
+        order = []
+
+        def go(priority, label):
+            sched.acquire(DDG, priority=priority)
+            order.append(label)
+
+        threads = [threading.Thread(target=go, args=(BACKGROUND, f"bg{i}")) for i in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.02)
+        fg = threading.Thread(target=go, args=(INTERACTIVE, "fg"))
+        fg.start()
+        for t in threads + [fg]:
+            t.join(3)
+        assert order[0] == "fg"
+        assert sorted(order[1:]) == ["bg0", "bg1", "bg2"]
+
+    def test_queue_timeout_drops(self):
+        sched = OutboundScheduler({"html.duckduckgo.com": (0.5, 1)}, queue_timeout=0.1)
+        assert sched.acquire(DDG)
+        assert sched.acquire(DDG) is False
+        assert sched.status()["html.duckduckgo.com"]["queued"] == 0
+
+    def test_caller_deadline_caps_wait(self):
+        sched = OutboundScheduler({"html.duckduckgo.com": (0.5, 1)}, queue_timeout=5.0)
+        assert sched.acquire(DDG)
+        start = time.monotonic()
+        with search_deadline(start + 0.1):
+            assert sched.acquire(DDG) is False
+        assert time.monotonic() - start < 1.0
+        assert sched.acquire(DDG, timeout=0.05, deadline=start - 1) is False
+        assert sched.status()["html.duckduckgo.com"]["queued"] == 0
+
+    def test_expired_waiter_leaves_token(self):
+        sched = OutboundScheduler({"html.duckduckgo.com": (5.0, 1)}, queue_timeout=5.0)
+        assert sched.acquire(DDG)
+        with search_deadline(time.monotonic() + 0.05):
+            assert sched.acquire(DDG) is False
+        start = time.monotonic()
+        assert sched.acquire(DDG)
+        assert time.monotonic() - start < 0.25
+
+    def test_background_context(self):
+        assert current_priority() == INTERACTIVE
+        with background():
+            assert current_priority() == BACKGROUND
+        assert current_priority() == INTERACTIVE
+
+
+class TestSearcherIntegration:
+    """WebSearcher waits for the scheduler before sending."""
+
+    def test_dropped_request_not_sent(self, monkeypatch):
+        sched = OutboundScheduler({"html.duckduckgo.com": (0.5, 1)}, queue_timeout=0.05)
+        monkeypatch.setattr(scheduler_module, "_scheduler", sched)
+        sent = []
+        searcher = WebSearcher(provider="duckduckgo")
+        searcher.cache = None
+        monkeypatch.setattr(searcher, "_send", lambda *a, **kw: sent.append(a) or (_ for _ in ()).throw(IOError("offline")))
+
+        searcher.search("first", 3)
+        searcher.search("second", 3)
+        assert len(sent) == 1
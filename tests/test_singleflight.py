@@ -0,0 +1,186 @@
+"""
+Tests for request coalescing (single flight).
+"""
+
+import contextvars
+import threading
+import time
+
+import pytest
+
+from src.backend.config import settings
+from src.backend.graph.client import GraphClient
+from src.backend.rag.llm import LLM
+from src.backend.rag.pipeline import RAGPipeline
+from src.backend.search import web_searcher
+from src.backend.search.web_searcher import SearchResult
+from src.backend.singleflight import SingleFlight, StreamFlight
+
+
+def _run_concurrently(fn, n):
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results, errors
+
+
+class TestSingleFlight:
+    """Concurrent calls with one key run once."""
+
+    def test_calls_coalesce(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": [1, 2]}
+
+        results, _ = _run_concurrently(lambda i: flight.do("q", slow), 8)
+        assert len(calls) == 1
+        assert all(r == {"value": [1, 2]} for r in results)
+        # Followers get their own copy
+        assert len({id(r) for r in results}) == 8
+        assert flight.in_flight() == 0
+
+    def test_error_shared(self):
+        flight = SingleFlight()
+
+        def boom():
+            time.sleep(0.1)
+            raise ValueError("provider down")
+
+        _, errors = _run_concurrently(lambda i: flight.do("q", boom), 4)
+        assert all(isinstance(e, ValueError) for e in errors)
+
+    def test_not_cached_after_completion(self):
+        flight = SingleFlight()
+        calls = []
+        flight.do("q", lambda: calls.append(1))
+        flight.do("q", lambda: calls.append(1))
+        assert len(calls) == 2
+
+
+class TestStreamFlight:
+    """Subscribers share one generator."""
+
+    def test_late_subscriber_gets_full_stream(self):
+        flight = StreamFlight()
+        produced = []
+
+        def tokens():
+            for t in ["a", "b", "c", "d"]:
+                produced.append(t)
+                time.sleep(0.05)
+                yield t
+
+        first = flight.subscribe("q", tokens)
+        assert next(first) == "a"
+        second = flight.subscribe("q", tokens)
+        assert list(second) == ["a", "b", "c", "d"]
+        assert ["a"] + list(first) == ["a", "b", "c", "d"]
+        assert produced == ["a", "b", "c", "d"]
+
+    def test_error_reaches_subscribers(self):
+        flight = StreamFlight()
+
+        def broken():
+            yield "a"
+            raise RuntimeError("llm failed")
+
+        with pytest.raises(RuntimeError):
+            list(flight.subscribe("q", broken))
+
+    def test_subscribers_get_their_own_events(self):
+        flight = StreamFlight()
+        release = threading.Event()
+
+        def events():
+            release.wait(2)
+            yield {"type": "token", "sources": [{"url": "https://a.org"}]}
+
+        first = flight.subscribe("q", events)
+        second = flight.subscribe("q", events)
+        release.set()
+        a, b = next(first), next(second)
+        a["sources"].append({"url": "https://b.org"})
+        a["type"] = "done"
+        assert b == {"type": "token", "sources": [{"url": "https://a.org"}]}
+
+    def test_producer_sees_caller_context(self):
+        var = contextvars.ContextVar("request_id", default=None)
+        flight = StreamFlight()
+
+        def events():
+            yield var.get()
+
+        token = var.set("req-1")
+        try:
+            assert list(flight.subscribe("q", events)) == ["req-1"]
+        finally:
+            var.reset(token)
+
+
+class TestCoalescedCallers:
+    """search_web_realtime and RAGPipeline share in-flight work."""
+
+    def test_search_web_realtime(self, monkeypatch):
+        monkeypatch.setattr(settings, "singleflight_enabled", True)
+        calls = []
+
+        class SlowSearcher:
+            def search(self, query, num_results):
+                calls.append(query)
+                time.sleep(0.2)
+                return [SearchResult(title="t", url="https://example.org/a", snippet="s", source="example.org")]
+
+        monkeypatch.setattr(web_searcher, "get_searcher", lambda provider: SlowSearcher())
+        queries = ["Trending  Topic", "trending topic", "TRENDING topic"]
+        results, _ = _run_concurrently(lambda i: web_searcher.search_web_realtime(queries[i % 3]), 6)
+        assert len(calls) == 1
+        assert all(r[0]["source_url"] == "https://example.org/a" for r in results)
+
+    def _pipeline(self, monkeypatch):
+        monkeypatch.setattr(settings, "singleflight_enabled", True)
+        monkeypatch.setattr(settings, "answer_cache_enabled", False)
+        rag = RAGPipeline(GraphClient(), LLM())
+        calls = []
+
+        def slow_retrieve(query, k=None, **kwargs):
+            calls.append(query)
+            time.sleep(0.2)
+            return [{"id": "f1", "subject": "GIL", "predicate": "content", "object": "a lock", "idx": 1}]
+
+        monkeypatch.setattr(rag, "_quick_classification", lambda q: (False, "search"))
+        monkeypatch.setattr(rag, "retrieve", slow_retrieve)
+        return rag, calls
+
+    def test_answer(self, monkeypatch):
+        rag, calls = self._pipeline(monkeypatch)
+        results, _ = _run_concurrently(lambda i: rag.answer("explain the python GIL"), 5)
+        assert len(calls) == 1
+        assert len({r[0] for r in results}) == 1
+
+    def test_answer_stream(self, monkeypatch):
+        rag, calls = self._pipeline(monkeypatch)
+        results, _ = _run_concurrently(lambda i: list(rag.answer_stream("explain the python GIL")), 5)
+        assert len(calls) == 1
+        assert all(r == results[0] for r in results)
+        assert results[0][0]["type"] == "facts"
+
+    def test_disabled(self, monkeypatch):
+        rag, calls = self._pipeline(monkeypatch)
+        monkeypatch.setattr(settings, "singleflight_enabled", False)
+        _run_concurrently(lambda i: rag.answer("explain the python GIL"), 3)
+        assert len(calls) == 3
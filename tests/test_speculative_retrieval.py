@@ -0,0 +1,72 @@
+"""
+Tests for speculative retrieval during query classification.
+"""
+
+import threading
+import time
+
+from src.backend.config import settings
+from src.backend.graph.client import GraphClient
+from src.backend.rag.llm import LLM
+from src.backend.rag.pipeline import RAGPipeline
+
+FACTS = [{"id": "f1", "subject": "Python", "predicate": "content", "object": "a language", "idx": 1}]
+
+
+class TestSpeculativeRetrieval:
+    """retrieve() overlaps with LLM classification."""
+
+    def _pipeline(self, monkeypatch, conversational=False, delay=0.2):
+        monkeypatch.setattr(settings, "speculative_retrieval", True)
+        monkeypatch.setattr(settings, "answer_cache_enabled", False)
+        rag = RAGPipeline(GraphClient(), LLM())
+        started = threading.Event()
+        calls = []
+
+        def slow_classification(query):
+            time.sleep(delay)
+            return (True, "casual_chat") if conversational else (False, "search")
+
+        def slow_retrieve(query, k=None, **kwargs):
+            started.set()
+            calls.append(query)
+            time.sleep(delay)
+            return [dict(f) for f in FACTS]
+
+        monkeypatch.setattr(rag, "_quick_classification", lambda q: None)
+        monkeypatch.setattr(rag, "_llm_classification", slow_classification)
+        monkeypatch.setattr(rag, "retrieve", slow_retrieve)
+        return rag, calls, started
+
+    def test_retrieval_overlaps_classification(self, monkeypatch):
+        rag, calls, _ = self._pipeline(monkeypatch)
+        start = time.time()
+        _, facts = rag.answer("explain the python GIL")
+        elapsed = time.time() - start
+
+        assert calls == ["explain the python GIL"]
+        assert facts[0]["id"] == "f1"
+        assert elapsed < 0.35
+
+    def test_stream_uses_speculative_facts(self, monkeypatch):
+        rag, calls, _ = self._pipeline(monkeypatch)
+        events = list(rag.answer_stream("explain the python GIL"))
+
+        assert calls == ["explain the python GIL"]
+        assert events[0]["facts"][0]["id"] == "f1"
+
+    def test_conversational_discards_result(self, monkeypatch):
+        rag, _, started = self._pipeline(monkeypatch, conversational=True)
+        answer, facts = rag.answer("how is your day going")
+
+        assert started.wait(1.0)
+        assert facts == []
+        assert answer == rag._get_conversational_response("how is your day going", "casual_chat")
+
+    def test_disabled_runs_sequentially(self, monkeypatch):
+        rag, calls, _ = self._pipeline(monkeypatch, delay=0.1)
+        monkeypatch.setattr(settings, "speculative_retrieval", False)
+        start = time.time()
+        rag.answer("explain the python GIL")
+        assert time.time() - start >= 0.2
+        assert calls == ["explain the python GIL"]
@@ -0,0 +1,225 @@
+"""
+Tests for the IVF-flat vector index over stored facts.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.backend.graph import vector_index
+from src.backend.graph.client import GraphClient
+from src.backend.graph.vector_index import FactVectorIndex, IVFFlatIndex
+
+
+def clustered_data(n=2000, dim=16, clusters=20, seed=1):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    data = centers[labels] + 0.1 * rng.standard_normal((n, dim))
+    return data.astype(np.float32)
+
+
+def brute_force(data, q, k):
+    d = data / np.linalg.norm(data, axis=1, keepdims=True)
+    sims = d @ (q / np.linalg.norm(q))
+    return [str(i) for i in np.argsort(-sims)[:k]]
+
+
+class TestIVFFlatIndex:
+    """Recall, updates and persistence."""
+
+    def test_flat_mode_is_exact(self):
+        data = clustered_data(n=200)
+        index = IVFFlatIndex(train_threshold=10000)
+        index.add([str(i) for i in range(len(data))], data)
+
+        q = data[7]
+        assert [i for i, _ in index.search(q, 5)] == brute_force(data, q, 5)
+        assert not index.is_trained
+
+    def test_trained_recall(self):
+        data = clustered_data()
+        index = IVFFlatIndex(train_threshold=500, nprobe=6)
+        index.add([str(i) for i in range(len(data))], data)
+        assert index.wait_for_training(5)
+        assert index.is_trained
+
+        recalls = []
+        for qi in range(0, 2000, 97):
+            got = {i for i, _ in index.search(data[qi], 10)}
+            recalls.append(len(got & set(brute_force(data, data[qi], 10))) / 10)
+        assert np.mean(recalls) >= 0.9
+
+    def test_replace_and_remove(self):
+        index = IVFFlatIndex(train_threshold=3)
+        index.add(["a", "b", "c", "d"], np.eye(4, dtype=np.float32))
+        index.add(["a"], np.array([[0, 1, 0, 0]], dtype=np.float32))
+        sims = dict(index.search(np.array([0, 1, 0, 0]), 4))
+        assert sims["a"] > 0.99 and sims["b"] > 0.99
+
+        assert index.remove("b") is True
+        assert index.remove("b") is False
+        assert len(index) == 3
+        assert "b" not in [i for i, _ in index.search(np.array([0, 1, 0, 0]), 4)]
+        assert index.search(np.array([0, 0, 0, 1]), 1)[0][0] == "d"
+
+    def test_save_and_load(self, tmp_path):
+        data = clustered_data(n=600)
+        index = IVFFlatIndex(train_threshold=300)
+        index.add([str(i) for i in range(len(data))], data)
+        index.wait_for_training(5)
+        index.save(str(tmp_path))
+
+        loaded = IVFFlatIndex.load(str(tmp_path))
+        assert len(loaded) == 600 and loaded.is_trained
+        assert loaded.search(data[3], 5) == index.search(data[3], 5)
+
+    def test_training_does_not_block_readers(self, monkeypatch):
+        data = clustered_data(n=700)
+        ids = [str(i) for i in range(len(data))]
+        index = IVFFlatIndex(train_threshold=10000, nprobe=6)
+        index.add(ids[:500], data[:500])
+
+        entered, release = threading.Event(), threading.Event()
+        normalize = vector_index._l2_normalize
+
+        def slow_normalize(x):
+            if threading.current_thread().name == "trainer":
+                entered.set()
+                release.wait(5)
+            return normalize(x)
+
+        monkeypatch.setattr(vector_index, "_l2_normalize", slow_normalize)
+        trainer = threading.Thread(target=index.train, name="trainer")
+        trainer.start()
+        assert entered.wait(5)
+
+        start = time.time()
+        assert index.search(data[3], 1)[0][0] == "3"
+        index.add(ids[500:], data[500:])
+        index.add(["3"], data[[10]])
+        index.remove("7")
+        assert time.time() - start < 1.0
+        release.set()
+        trainer.join(5)
+
+        assert index.is_trained
+        rows = sorted(r for lst in index._lists for r in lst)
+        assert rows == list(range(len(index))) == list(range(699))
+        expected = index._nearest_centroid(index._vecs[:len(index)])
+        assert all(r in index._lists[a] for r, a in enumerate(expected))
+        assert index.search(data[650], 1)[0][0] == "650"
+        assert "7" not in {i for i, _ in index.search(data[7], 5)}
+
+    def test_add_retrains_in_background(self):
+        data = clustered_data(n=1200)
+        index = IVFFlatIndex(train_threshold=300)
+        index.add([str(i) for i in range(300)], data[:300])
+        index.wait_for_training(5)
+        assert index._trained_size == 300
+
+        index.add([str(i) for i in range(300, 1200)], data[300:])
+        assert index.wait_for_training(5)
+        assert index._trained_size == 1200 and len(index._lists) == int(np.sqrt(1200))
+
+
+class TestGraphVectorSearch:
+    """upsert_fact keeps the attached index in sync."""
+
+    def test_upsert_and_search(self):
+        vocab = ["quantum", "biology", "finance"]
+
+        def encode(texts):
+            return np.array([[float(w in t.lower()) for w in vocab] for t in texts], dtype=np.float32) + 1e-3
+
+        g = GraphClient()
+        g._use_memory = True
+        g.attach_vector_index(FactVectorIndex(encode))
+        g.upsert_fact({"id": "p1", "subject": "paper1", "predicate": "abstract", "object": "Quantum error correction", "source_url": "u1"})
+        g.upsert_fact({"id": "p2", "subject": "paper2", "predicate": "abstract", "object": "Cell biology", "source_url": "u2"})
+
+        hits = g.vector_search(np.array([1.0, 0.0, 0.0]), k=1)
+        assert [f["id"] for f in hits] == ["p1"]
+
+        g.upsert_fact({"id": "p1", "subject": "paper1", "predicate": "abstract", "object": "Market finance", "source_url": "u1"})
+        hits = g.vector_search(np.array([1.0, 0.0, 0.0]), k=2)
+        assert hits[0]["vector_score"] < 0.9
+
+    def test_backfills_existing_facts(self):
+        g = GraphClient()
+        g._use_memory = True
+        g.upsert_fact({"id": "p1", "subject": "paper1", "predicate": "abstract", "object": "Quantum error correction", "source_url": "u1"})
+        g.upsert_fact({"id": "p2", "subject": "paper2", "predicate": "abstract", "object": "Cell biology", "source_url": "u2"})
+
+        g.attach_vector_index(FactVectorIndex(_vocab_encode), backfill=False)
+        assert g.backfill_vector_index() == 2
+        assert g.backfill_vector_index() == 0
+        assert [f["id"] for f in g.vector_search(np.array([0.0, 1.0, 0.0]), k=1)] == ["p2"]
+
+    def test_attach_backfills_in_background(self):
+        g = GraphClient()
+        g._use_memory = True
+        g.upsert_fact({"id": "p1", "subject": "paper1", "predicate": "abstract", "object": "Cell biology", "source_url": "u1"})
+        index = FactVectorIndex(_vocab_encode)
+        g.attach_vector_index(index)
+
+        deadline = time.time() + 5
+        while "p1" not in index and time.time() < deadline:
+            time.sleep(0.01)
+        assert "p1" in index
+
+    def test_backfill_keeps_newer_vectors(self):
+        index = FactVectorIndex(_vocab_encode)
+        index.upsert([{"id": "p1", "subject": "paper1", "predicate": "abstract", "object": "Market finance"}])
+        stale = {"id": "p1", "subject": "paper1", "predicate": "abstract", "object": "Quantum error correction"}
+        assert index._add_missing([stale]) == 0
+        assert index.search(np.array([0.0, 0.0, 1.0]), 1)[0][1] > 0.99
+
+    def test_neo4j_facts_are_paged(self, monkeypatch):
+        g = GraphClient()
+        g._use_memory = False
+        facts = [{"id": f"f{i}"} for i in range(5)]
+
+        def run(cypher, after, limit):
+            rows = [f for f in facts if f["id"] > after][:limit]
+            return [{"f": f} for f in rows]
+
+        monkeypatch.setattr(g, "run", run)
+        assert [f["id"] for f in g.iter_facts(page_size=2)] == ["f0", "f1", "f2", "f3", "f4"]
+
+
+def _vocab_encode(texts):
+    vocab = ["quantum", "biology", "finance"]
+    return np.array([[float(w in t.lower()) for w in vocab] for t in texts], dtype=np.float32) + 1e-3
+
+
+class TestIndexEncoding:
+    """Index maintenance waits for the embedder instead of dropping facts."""
+
+    def test_index_encode_waits_during_warmup(self, monkeypatch):
+        from src.backend.config import settings
+        from src.backend.rag import pipeline as pipeline_module
+        from src.backend.rag.llm import LLM
+        from src.backend.rag.pipeline import RAGPipeline
+
+        class Embedder:
+            def encode(self, texts, normalize_embeddings=True):
+                return _vocab_encode(texts)
+
+        class WarmingRegistry:
+            def available(self, name):
+                return False
+
+            def get(self, name, wait=True):
+                return Embedder() if wait else None
+
+        monkeypatch.setattr(settings, "model_warmup", True)
+        monkeypatch.setattr(settings, "inference_batching", False)
+        rag = RAGPipeline(GraphClient(), LLM())
+        monkeypatch.setattr(pipeline_module, "model_registry", WarmingRegistry())
+
+        with pytest.raises(RuntimeError):
+            rag._encode(["quantum"])
+        assert rag._index_encode(["quantum"]).shape == (1, 3)